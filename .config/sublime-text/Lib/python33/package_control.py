@@ -1,12 +1,16 @@
 """
 Public Package Control API
 """
+import marshal
 import os
 import sys
+import time
 import zipfile
 
 import sublime_plugin
 
+__start = time.perf_counter()
+
 # python 3.13 may no longer provide __file__
 __data_path = os.path.dirname(os.path.dirname(os.path.dirname(
     __spec__.origin if hasattr(globals(), '__spec__') else __file__))
@@ -14,6 +18,89 @@ __data_path = os.path.dirname(os.path.dirname(os.path.dirname(
 __pkg_path = os.path.join(__data_path, 'Packages', 'Package Control', 'package_control')
 __zip_path = os.path.join(__data_path, 'Installed Packages', 'Package Control.sublime-package')
 __code = None
+__compiled = None
+
+
+def __cache_file():
+    """
+    Return path of the file to cache compiled code of `package_control/__init__.py` in.
+    """
+    try:
+        import sublime
+        return os.path.join(
+            sublime.cache_path(),
+            'Package Control',
+            'package_control.{}.marshal'.format(sys.implementation.cache_tag)
+        )
+    except Exception:
+        return None
+
+
+def __log_timing(message):
+    """
+    Write the time loading the API took to the startup timing log next to the cache file.
+
+    The log is replaced on every start of the plugin host.
+    """
+    cache_file = __cache_file()
+    if cache_file:
+        try:
+            with open(os.path.splitext(cache_file)[0] + '.log', 'w', encoding='utf-8') as f:
+                f.write('Package Control: {}\n'.format(message))
+        except OSError:
+            pass
+
+
+def __compile(key, read_source):
+    """
+    Compile `package_control/__init__.py` or load its code from cache.
+
+    Cached code is used only, if it was compiled from a source with same `key`,
+    which consists of path, size and mtime of the .sublime-package or source file.
+    """
+    global __compiled
+
+    cache_file = __cache_file()
+    if cache_file:
+        try:
+            with open(cache_file, 'rb') as f:
+                cached_key, compile_time, code = marshal.load(f)
+            if cached_key == key:
+                __compiled = 'used cached code, saved {:.1f} ms'.format(compile_time * 1000)
+                return code
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+    start = time.perf_counter()
+    code = compile(read_source(), '__init__.py', 'exec')
+    compile_time = time.perf_counter() - start
+    __compiled = 'compiled in {:.1f} ms'.format(compile_time * 1000)
+
+    if cache_file:
+        temp_file = '{}.{}'.format(cache_file, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(temp_file, 'wb') as f:
+                marshal.dump((key, compile_time, code), f)
+            os.replace(temp_file, cache_file)
+        except OSError:
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+
+    return code
+
+
+def __read_zip():
+    with zipfile.ZipFile(__zip_path, 'r') as f:
+        return f.read('package_control/__init__.py').decode('utf-8')
+
+
+def __read_file():
+    with open(__file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
 
 # We check the .sublime-package first, since the sublime_plugin.ZipLoader deals with overrides
 if os.path.exists(__zip_path):
@@ -22,12 +109,10 @@ if os.path.exists(__zip_path):
     __loader__ = sublime_plugin.ZipLoader(__zip_path)
 
     try:
-        with zipfile.ZipFile(__zip_path, 'r') as __f:
-            __code = compile(
-                __f.read('package_control/__init__.py').decode('utf-8'),
-                '__init__.py',
-                'exec'
-            )
+        __stat = os.stat(__zip_path)
+        __code = __compile(
+            (__zip_path, __stat.st_size, __stat.st_mtime, sys.hexversion), __read_zip
+        )
     except (OSError, KeyError):
         pass
 
@@ -46,8 +131,10 @@ elif os.path.exists(__pkg_path):
     __loader__ = SourceFileLoader('package_control', __file_path)
 
     try:
-        with open(__file_path, 'r', encoding='utf-8') as __f:
-            __code = compile(__f.read(), '__init__.py', 'exec')
+        __stat = os.stat(__file_path)
+        __code = __compile(
+            (__file_path, __stat.st_size, __stat.st_mtime, sys.hexversion), __read_file
+        )
     except (OSError):
         pass
 
@@ -71,16 +158,29 @@ __data = {}
 exec(__code, __data)
 globals().update(__data)
 
+__log_timing('loaded API in {:.1f} ms, {}'.format(
+    (time.perf_counter() - __start) * 1000, __compiled
+))
+
 # cleanup temporary globals
 del globals()['__cached__']
+del globals()['__cache_file']
 del globals()['__code']
+del globals()['__compile']
+del globals()['__compiled']
 del globals()['__data']
 del globals()['__data_path']
-del globals()['__f']
 del globals()['__file_path']
+del globals()['__log_timing']
 del globals()['__pkg_path']
+del globals()['__read_file']
+del globals()['__read_zip']
+del globals()['__start']
+del globals()['__stat']
 del globals()['__zip_path']
+del globals()['marshal']
 del globals()['os']
 del globals()['sublime_plugin']
 del globals()['sys']
+del globals()['time']
 del globals()['zipfile']
@@ -1,9 +1,12 @@
 """
 Public Package Control API
+
+`events` is loaded at import, anything else on first access.
 """
 import os
 import sys
-import zipfile
+import threading
+import time
 
 import sublime_plugin
 
@@ -13,23 +16,19 @@ __data_path = os.path.dirname(os.path.dirname(os.path.dirname(
 )
 __pkg_path = os.path.join(__data_path, 'Packages', 'Package Control', 'package_control')
 __zip_path = os.path.join(__data_path, 'Installed Packages', 'Package Control.sublime-package')
-__code = None
 
 # We check the .sublime-package first, since the sublime_plugin.ZipLoader deals with overrides
 if os.path.exists(__zip_path):
     __pkg_path = os.path.join(__zip_path, 'package_control')
     __file_path = os.path.join(__pkg_path, '__init__.py')
     __loader__ = sublime_plugin.ZipLoader(__zip_path)
+    __source_path = __zip_path
 
-    try:
-        with zipfile.ZipFile(__zip_path, 'r') as __f:
-            __code = compile(
-                __f.read('package_control/__init__.py').decode('utf-8'),
-                '__init__.py',
-                'exec'
-            )
-    except (OSError, KeyError):
-        pass
+    def __read_source():
+        import zipfile
+
+        with zipfile.ZipFile(__source_path, 'r') as f:
+            return f.read('package_control/__init__.py').decode('utf-8')
 
     # required for events to be available on plugin_host Package Control is not running on
     events = sys.modules.get('package_control.events')
@@ -44,12 +43,11 @@ elif os.path.exists(__pkg_path):
 
     __file_path = os.path.join(__pkg_path, '__init__.py')
     __loader__ = SourceFileLoader('package_control', __file_path)
+    __source_path = __file_path
 
-    try:
-        with open(__file_path, 'r', encoding='utf-8') as __f:
-            __code = compile(__f.read(), '__init__.py', 'exec')
-    except (OSError):
-        pass
+    def __read_source():
+        with open(__source_path, 'r', encoding='utf-8') as f:
+            return f.read()
 
     # required for events to be available on plugin_host Package Control is not running on
     events = sys.modules.get('package_control.events')
@@ -61,26 +59,161 @@ elif os.path.exists(__pkg_path):
 
     del globals()['SourceFileLoader']
 
-if __code is None:
+else:
     raise ModuleNotFoundError("No module named 'package_control'")
 
 __file__ = __file_path
 __package__ = 'package_control'
 __path__ = [__pkg_path]
-__data = {}
-exec(__code, __data)
-globals().update(__data)
+
+
+def __cache_file():
+    """
+    Return path of the file to cache compiled code of `package_control/__init__.py` in.
+    """
+    try:
+        import sublime
+        return os.path.join(
+            sublime.cache_path(),
+            'Package Control',
+            'package_control.{}.marshal'.format(sys.implementation.cache_tag)
+        )
+    except Exception:
+        return None
+
+
+def __log_timing(message):
+    """
+    Write the time loading the API took to the startup timing log next to the cache file.
+
+    The log is replaced on every start of the plugin host.
+    """
+    cache_file = __cache_file()
+    if cache_file:
+        try:
+            with open(os.path.splitext(cache_file)[0] + '.log', 'w', encoding='utf-8') as f:
+                f.write('Package Control: {}\n'.format(message))
+        except OSError:
+            pass
+
+
+def __compile():
+    """
+    Compile `package_control/__init__.py` or load its code from cache.
+
+    Cached code is used only, if it was compiled from a source with same path,
+    size and mtime of the .sublime-package or source file.
+
+    :returns: A tuple of code object and a description of how it was created.
+    """
+    import marshal
+
+    stat = os.stat(__source_path)
+    key = (__source_path, stat.st_size, stat.st_mtime, sys.hexversion)
+
+    cache_file = __cache_file()
+    if cache_file:
+        try:
+            with open(cache_file, 'rb') as f:
+                cached_key, compile_time, code = marshal.load(f)
+            if cached_key == key:
+                return code, 'used cached code, saved {:.1f} ms'.format(compile_time * 1000)
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+    start = time.perf_counter()
+    code = compile(__read_source(), '__init__.py', 'exec')
+    compile_time = time.perf_counter() - start
+
+    if cache_file:
+        temp_file = '{}.{}'.format(cache_file, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(temp_file, 'wb') as f:
+                marshal.dump((key, compile_time, code), f)
+            os.replace(temp_file, cache_file)
+        except OSError:
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+
+    return code, 'compiled in {:.1f} ms'.format(compile_time * 1000)
+
+
+# Compile at import, so a missing or unreadable API still fails the import.
+__start = time.perf_counter()
+try:
+    __code, __compiled = __compile()
+except (OSError, KeyError):
+    raise ModuleNotFoundError("No module named 'package_control'") from None
+__compile_time = time.perf_counter() - __start
+
+# Guards `__load`; reentrant, as the API may access this module while being executed.
+__lock = threading.RLock()
+# `None` until `__load` ran, then whether it succeeded.
+__loaded = None
+
+
+def __load():
+    """
+    Execute `package_control/__init__.py` once and replace lazy loading by its globals.
+
+    A failed execution is not retried.
+
+    :returns: `True` if the API was loaded.
+    """
+    global __loaded
+
+    with __lock:
+        if __loaded is not None:
+            return __loaded
+        __loaded = False
+
+        start = time.perf_counter()
+        data = {}
+        exec(__code, data)
+        __log_timing('loaded API in {:.1f} ms, {}'.format(
+            (__compile_time + time.perf_counter() - start) * 1000, __compiled
+        ))
+
+        # cleanup temporary globals, but keep `__load`, `__lock` and `__loaded`
+        # for threads, which may already be waiting in `__getattr__`
+        module = globals()
+        for name in (
+            '__cache_file', '__code', '__compile_time', '__compiled', '__dir__', '__getattr__',
+            '__log_timing', 'os', 'sys', 'time'
+        ):
+            module.pop(name, None)
+        module.update(data)
+
+        __loaded = True
+        return True
+
+
+def __getattr__(name):
+    if __load():
+        try:
+            return globals()[name]
+        except KeyError:
+            pass
+    raise AttributeError("module 'package_control' has no attribute '{}'".format(name))
+
+
+def __dir__():
+    __load()
+    return list(globals())
+
 
 # cleanup temporary globals
 del globals()['__cached__']
-del globals()['__code']
-del globals()['__data']
+del globals()['__compile']
 del globals()['__data_path']
-del globals()['__f']
 del globals()['__file_path']
 del globals()['__pkg_path']
+del globals()['__read_source']
+del globals()['__source_path']
+del globals()['__start']
 del globals()['__zip_path']
-del globals()['os']
 del globals()['sublime_plugin']
-del globals()['sys']
-del globals()['zipfile']
+del globals()['threading']
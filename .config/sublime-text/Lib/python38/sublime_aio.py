@@ -2,19 +2,33 @@ from __future__ import annotations
 
 import asyncio
 import atexit
+import logging
+import os
+import re
+import signal
+import subprocess
+import sys
 import traceback
+from abc import ABC, abstractmethod
+from codecs import getincrementaldecoder
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
 from inspect import iscoroutinefunction
 from threading import Lock, Thread
 from time import monotonic as now
 from typing import TYPE_CHECKING, overload
+from weakref import WeakValueDictionary
 
 import sublime
 import sublime_api
 import sublime_plugin
 
 if TYPE_CHECKING:
-    from collections.abc import Coroutine
-    from concurrent.futures import Future
+    from collections.abc import AsyncIterator, Coroutine, Hashable
+    from concurrent.futures import Executor, Future
     from typing import Any, Callable, List, Tuple, TypeVar, Union
 
     from typing_extensions import ParamSpec, TypeAlias
@@ -37,12 +51,31 @@ if TYPE_CHECKING:
 __all__ = [
     "__version__",
     "active_window",
+    "add_pool",
     "ApplicationCommand",
+    "BufferMirror",
+    "BufferSnapshot",
+    "cached",
+    "change_count",
+    "checkpoint",
     "debounced",
+    "disable_diagnostics",
+    "enable_diagnostics",
     "EventListener",
     "InputCancelledError",
+    "latest",
+    "on_ui",
+    "pool_stats",
     "run_coroutine",
+    "run_process",
+    "scope",
+    "Scope",
+    "set_process_limit",
+    "settings_changes",
+    "SublimeAioShowTasksCommand",
     "TextChangeListener",
+    "throttled",
+    "to_thread",
     "View",
     "ViewCommand",
     "ViewEventListener",
@@ -51,6 +84,7 @@ __all__ = [
     "windows",
 ]
 
+# This is a local fork of sublime_aio 0.1.6, extended in place, not an upstream release.
 __version__ = "0.1.6"
 
 # ---- [ internal ] -----------------------------------------------------------
@@ -58,138 +92,2087 @@ __version__ = "0.1.6"
 _loop: asyncio.AbstractEventLoop | None = None
 _thread: Thread | None = None
 
-if _loop is None:
-    _loop = asyncio.new_event_loop()
-    _thread = Thread(target=_loop.run_forever)
-    _thread.daemon = True
-    _thread.start()
+# The view's change count a `latest` event handler was started for.
+_change_count: ContextVar[int] = ContextVar("change_count", default=-1)
+# The priority lane of the running task, see `run_coroutine()`.
+_lane: ContextVar[str] = ContextVar("lane", default="normal")
+
+_lock = Lock()
+_closed = False
+
+
+def _get_loop() -> asyncio.AbstractEventLoop | None:
+    """
+    Get the event loop, which is created and started on first use.
+
+    :returns:
+        The event loop or `None`, if shut down already.
+    """
+    global _loop, _thread
+    loop = _loop
+    if loop is not None or _closed:
+        return loop
+
+    with _lock:
+        if _loop is None and not _closed:
+            loop = asyncio.new_event_loop()
+            _thread = Thread(target=loop.run_forever, name="sublime_aio", daemon=True)
+            _thread.start()
+            _loop = loop
+        return _loop
 
 
 @atexit.register
-def on_exit():
-    global _loop
-    if _loop is None or _thread is None:
+def on_exit(timeout: float = 1.0) -> None:
+    """
+    Shut down the event loop.
+
+    All tasks are cancelled and given a grace period to finish cleanup, before
+    async generators are closed. Returns after `timeout` seconds at the latest,
+    even if a task or callback blocks the loop, so it never hangs plugin_host exit.
+
+    :param timeout:
+        The maximum time in seconds to wait for the loop to stop.
+    """
+    global _closed, _loop
+    with _lock:
+        _closed = True
+        loop, thread = _loop, _thread
+        _loop = None
+
+    if loop is not None and thread is not None:
+        deadline = now() + timeout
+
+        async def shutdown() -> None:
+            try:
+                tasks = asyncio.all_tasks(loop) - {asyncio.current_task(loop)}
+                for task in tasks:
+                    task.cancel()
+                if tasks:
+                    await asyncio.wait(tasks, timeout=max(0.0, deadline - now()))
+                await asyncio.wait_for(loop.shutdown_asyncgens(), max(0.0, deadline - now()))
+            finally:
+                loop.stop()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), loop)
+        thread.join(max(0.0, deadline - now()))
+        # a still running loop can't be closed, the daemon thread dies with the process
+        if not thread.is_alive():
+            loop.close()
+
+    for pool in _pools.values():
+        pool.shutdown()
+
+
+class _RateLimiter(ABC):
+    """
+    Base class of per-view event rate limiters.
+
+    Events are handed over from UI thread without locking. The UI thread only
+    stores the most recent event of a view in `calls` and wakes up the loop for
+    the first event of a burst. Everything else is done on the loop thread,
+    using a single cancellable timer handle per view.
+    """
+
+    def __init__(self, coro_func: Callable[..., BlankCoro], delay_in_ms: int):
+        self.coro_func = coro_func
+        self.delay = delay_in_ms / 1000
+        # Maps a view id to the most recent (timestamp, view, listener, args) event.
+        # Written by UI thread, popped by loop thread.
+        self.calls: dict[int, tuple[float, sublime.View, object, tuple]] = {}
+        # Ids of views, a burst is being handled for.
+        self.armed: set[int] = set()
+        # Maps a view id to [timer handle, event, burst start, event was handled].
+        # Used by loop thread only.
+        self.state: dict[int, list] = {}
+        # Number of loop iterations, which were caused by this limiter.
+        self.wakeups = 0
+
+    def push(self, listener: EventListener | ViewEventListener, args: tuple) -> None:
+        """
+        Register an event. Called on UI thread.
+
+        :param listener:
+            The event listener instance for which to schedule event handler.
+        :param args:
+            The arguments passed to coroutine function by ST API.
+        """
+        loop = _get_loop()
+        if loop is None:
+            return
+
+        view = _event_view(listener, args)
+        vid = view.view_id
+        self.calls[vid] = (now(), view, listener, args)
+        if vid not in self.armed:
+            self.armed.add(vid)
+            loop.call_soon_threadsafe(self.arm, vid)
+
+    def arm(self, vid: int) -> None:
+        """
+        Start handling a burst of events.
+
+        :param vid:
+            The view id to handle events of.
+        """
+        self.wakeups += 1
+        if vid in self.state:
+            return
+        event = self.calls.pop(vid, None)
+        if event is None:
+            self.release(vid)
+            return
+        state = self.state[vid] = [None, event, event[0], False]
+        self.start(vid, state)
+
+    def release(self, vid: int) -> None:
+        """
+        Stop handling a burst of events.
+
+        Events, which arrived in the meanwhile, start a new burst.
+
+        :param vid:
+            The view id to stop handling events of.
+        """
+        self.state.pop(vid, None)
+        self.armed.discard(vid)
+        if vid in self.calls and vid not in self.armed:
+            self.armed.add(vid)
+            self.arm(vid)
+
+    def update(self, vid: int) -> list:
+        """
+        Pick up the most recent event of a view.
+
+        :param vid:
+            The view id to update state of.
+
+        :returns:
+            The view's state.
+        """
+        state = self.state[vid]
+        event = self.calls.pop(vid, None)
+        if event is not None:
+            state[1] = event
+            state[3] = False
+        return state
+
+    def schedule(self, vid: int, state: list, when: float) -> None:
+        """
+        (Re-)schedule the view's timer.
+
+        :param vid:
+            The view id to schedule timer for.
+        :param state:
+            The view's state.
+        :param when:
+            The monotonic time to fire at.
+        """
+        loop = asyncio.get_running_loop()
+        state[0] = loop.call_later(max(0.0, when - now()), self.fire, vid)
+
+    def call(self, state: list) -> bool:
+        """
+        Schedule coroutine with the view's most recent event.
+
+        :param state:
+            The view's state.
+
+        :returns:
+            `False` if the view is no longer valid.
+        """
+        _, view, listener, args = state[1]
+        state[3] = True
+        if not view.is_valid():
+            return False
+        scope(view).create_task(self.coro_func(listener, *args))
+        return True
+
+    @abstractmethod
+    def start(self, vid: int, state: list) -> None:
+        """
+        Handle the first event of a burst.
+
+        :param vid:
+            The view id to handle events of.
+        :param state:
+            The view's state.
+        """
+
+    @abstractmethod
+    def fire(self, vid: int) -> None:
+        """
+        Handle the view's timer.
+
+        :param vid:
+            The view id, whose timer fired.
+        """
+
+
+class _Debouncer(_RateLimiter):
+    def __init__(self, coro_func: Callable[..., BlankCoro], delay_in_ms: int, max_wait: int | None):
+        super().__init__(coro_func, delay_in_ms)
+        self.max_wait = None if max_wait is None else max_wait / 1000
+
+    def deadline(self, state: list) -> float:
+        when = state[1][0] + self.delay
+        if self.max_wait is not None:
+            when = min(when, state[2] + self.max_wait)
+        return when
+
+    def start(self, vid: int, state: list) -> None:
+        self.schedule(vid, state, self.deadline(state))
+
+    def fire(self, vid: int) -> None:
+        self.wakeups += 1
+        state = self.update(vid)
+        when = self.deadline(state)
+        # timers may fire up to a clock tick early
+        if when - now() > 0.001:
+            self.schedule(vid, state, when)
+            return
+        self.call(state)
+        self.release(vid)
+
+
+class _Throttler(_RateLimiter):
+    def __init__(
+        self, coro_func: Callable[..., BlankCoro], delay_in_ms: int, leading: bool, trailing: bool
+    ):
+        super().__init__(coro_func, delay_in_ms)
+        self.leading = leading
+        self.trailing = trailing
+
+    def start(self, vid: int, state: list) -> None:
+        if self.leading:
+            if not self.call(state):
+                self.release(vid)
+                return
+            self.schedule(vid, state, now() + self.delay)
+        else:
+            self.schedule(vid, state, state[2] + self.delay)
+
+    def fire(self, vid: int) -> None:
+        self.wakeups += 1
+        state = self.update(vid)
+        if self.trailing and not state[3] and self.call(state):
+            self.schedule(vid, state, now() + self.delay)
+            return
+        self.release(vid)
+
+
+def _rate_limited(limiter_type: type[_RateLimiter], delay_in_ms: int, *params):
+    """
+    Create a decorator, which passes events to a `limiter_type` instance.
+
+    :param limiter_type:
+        The `_RateLimiter` subclass to create per decorated coroutine function.
+    :param delay_in_ms:
+        The delay passed to limiter.
+    :param params:
+        Additional parameters passed to limiter.
+    """
+
+    @overload
+    def decorator(
+        coro_func: Callable[[EL, sublime.View], BlankCoro],
+    ) -> Callable[[EL, sublime.View], None]: ...
+
+    @overload
+    def decorator(coro_func: Callable[[VEL], BlankCoro]) -> Callable[[VEL], None]: ...
+
+    def decorator(
+        coro_func: Callable[[EL, sublime.View], BlankCoro] | Callable[[VEL], BlankCoro],
+    ) -> Callable[..., None]:
+        limiter = limiter_type(coro_func, delay_in_ms, *params)
+
+        def wrapper(self: EventListener | ViewEventListener, *args: sublime.View) -> None:
+            """
+            Wrapper function called on UI thread to schedule rate limited coroutine execution
+
+            :param self:
+                The event listener instance for which to schedule event handler.
+            :param args:
+                The arguments passed to coroutine function by ST API.
+            """
+            limiter.push(self, args)
+
+        wrapper.limiter = limiter  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+class _Completions:
+    """
+    Per listener class state of async `on_query_completions` handlers.
+
+    Tracks one in-flight task per `(listener, view id)`, so requests in one view
+    don't cancel requests in another view, and caches results in a small LRU,
+    which is keyed by `(view id, change count, locations, prefix)`.
+
+    A request for a prefix, which extends a cached one at the same word
+    position, is answered by filtering the cached superset, unless the cached
+    completions are flagged as `DYNAMIC_COMPLETIONS`.
+    """
+
+    def __init__(
+        self,
+        coro_func: Callable[..., Coroutine[object, object, CompletionsReturnVal]],
+        maxsize: int = 16,
+    ):
+        self.coro_func = coro_func
+        self.maxsize = maxsize
+        # Maps (listener, view id) to in-flight task.
+        self.tasks: dict[tuple[object, int], Future] = {}
+        # Maps (view id, change count, locations, prefix) to (completions, flags).
+        self.cache: OrderedDict[tuple, tuple[list, int]] = OrderedDict()
+
+    def __call__(
+        self, listener: EventListener | ViewEventListener, *args
+    ) -> sublime.CompletionList:
+        """
+        Handle `on_query_completions` on UI thread.
+
+        :param listener:
+            The event listener instance, which queries completions.
+        :param args:
+            The arguments passed to coroutine function by ST API.
+        """
+        if isinstance(listener, ViewEventListener):
+            view = listener.view
+            prefix, locations = args
+        else:
+            view, prefix, locations = args
+        key = (view.view_id, view.change_count(), tuple(locations), prefix)
+
+        task_key = (listener, view.view_id)
+        task = self.tasks.pop(task_key, None)
+        if task:
+            task.cancel()
+
+        cached = self.lookup(key)
+        if cached is not None:
+            return sublime.CompletionList(*cached)
+
+        clist = sublime.CompletionList()
+        task = self.tasks[task_key] = scope(view).run_coroutine(
+            self.query_completions(clist, key, self.coro_func(listener, *args)),
+            lane="interactive",
+        )
+
+        def done(fut: Future) -> None:
+            if self.tasks.get(task_key) is fut:
+                del self.tasks[task_key]
+
+        task.add_done_callback(done)
+        return clist
+
+    def lookup(self, key: tuple[int, int, tuple[int, ...], str]) -> tuple[list, int] | None:
+        """
+        Lookup cached completions.
+
+        :param key:
+            The `(view id, change count, locations, prefix)` tuple to look up.
+
+        :returns:
+            A `(completions, flags)` tuple or `None`.
+        """
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            return cached
+
+        view_id, change_count, locations, prefix = key
+        for (cview_id, cchange_count, clocations, cprefix), (completions, flags) in reversed(
+            self.cache.items()
+        ):
+            if (
+                cview_id != view_id
+                or not prefix.startswith(cprefix)
+                or flags & sublime.AutoCompleteFlags.DYNAMIC_COMPLETIONS
+            ):
+                continue
+            typed = len(prefix) - len(cprefix)
+            # each typed character must extend the word at the same position
+            # and must be the only modification since
+            if (
+                0 <= change_count - cchange_count <= typed
+                and len(locations) == len(clocations)
+                and all(loc - cloc == typed for loc, cloc in zip(locations, clocations))
+            ):
+                result = ([c for c in completions if _fuzzy_match(prefix, c)], flags)
+                self.store(key, result)
+                return result
+
+        return None
+
+    def store(self, key: tuple[int, int, tuple[int, ...], str], result: tuple[list, int]) -> None:
+        """
+        Add completions to cache, dropping the least recently used ones.
+
+        :param key:
+            The `(view id, change count, locations, prefix)` tuple to store completions for.
+        :param result:
+            The `(completions, flags)` tuple to store.
+        """
+        self.cache[key] = result
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+
+    async def query_completions(
+        self,
+        clist: sublime.CompletionList,
+        key: tuple[int, int, tuple[int, ...], str],
+        coro: Coroutine[object, object, CompletionsReturnVal],
+    ) -> None:
+        try:
+            completions = await coro
+            if isinstance(completions, sublime.CompletionList):
+                result = (completions.completions or [], completions.flags)
+            elif isinstance(completions, tuple):
+                result = (completions[0], completions[1])
+            else:
+                result = (completions or [], 0)
+            clist.set_completions(*result)
+            # cache is owned by UI thread
+            sublime.set_timeout(lambda: self.store(key, result))
+        except asyncio.CancelledError:
+            clist.set_completions([])
+        except BaseException:
+            clist.set_completions([])
+            traceback.print_exc()
+
+
+def _fuzzy_match(prefix: str, completion: sublime.CompletionValue) -> bool:
+    """
+    Check whether ST's fuzzy matching might show a completion for a prefix.
+
+    :param prefix:
+        The prefix to match.
+    :param completion:
+        The completion value, a `str`, a `[trigger, contents]` pair
+        or a `sublime.CompletionItem`.
+    """
+    if isinstance(completion, str):
+        trigger = completion
+    elif isinstance(completion, (list, tuple)):
+        trigger = completion[0]
+    else:
+        trigger = getattr(completion, "trigger", "")
+    trigger = trigger.lower()
+    pos = 0
+    for char in prefix.lower():
+        pos = trigger.find(char, pos) + 1
+        if pos == 0:
+            return False
+    return True
+
+
+def _event_view(listener: EventListener | ViewEventListener, args: tuple) -> sublime.View:
+    """
+    Get the view an event is emitted for.
+
+    :param listener:
+        The event listener instance handling the event.
+    :param args:
+        The arguments passed to event handler by ST API.
+
+    :returns:
+        The `view` of `ViewEventListener`s or the first argument of `EventListener`s.
+    """
+    return listener.view if isinstance(listener, ViewEventListener) else args[0]
+
+
+class _TextChangeQueue:
+    """
+    Serial event queue of a `TextChangeListener`, which is attached to a single buffer.
+
+    Events are handed over from UI thread without locking and are handled
+    on the loop thread one after another:
+
+    - consecutive change lists are merged into one `on_text_changed` call
+    - `on_revert` and `on_reload` drop all change lists queued before them
+    - if more than `high_water_mark` events are queued, they are replaced by
+      a single `on_revert` call, which is expected to resync with the buffer,
+      or by a single `on_text_changed(None)` call, if there's no async `on_revert`
+    """
+
+    def __init__(self, listener: TextChangeListener):
+        self.listener = listener
+        # (event name, coroutine function, args) tuples, appended by UI thread.
+        self.events: deque[tuple[str, Callable[..., BlankCoro], tuple]] = deque()
+        # Whether the loop has been asked to handle events. Set by UI thread.
+        self.armed = False
+        # Whether events are being handled. Used by loop thread only.
+        self.running = False
+
+    @staticmethod
+    def of(listener: TextChangeListener) -> _TextChangeQueue:
+        """
+        :returns: The queue of a listener, which is created on first use.
+        """
+        queue = listener.__dict__.get("_sublime_aio_queue")
+        if queue is None:
+            queue = listener.__dict__["_sublime_aio_queue"] = _TextChangeQueue(listener)
+        return queue
+
+    def push(self, event: str, coro_func: Callable[..., BlankCoro], args: tuple) -> None:
+        """
+        Queue an event. Called on UI thread.
+
+        :param event:
+            The name of the event handler.
+        :param coro_func:
+            The coroutine function (event listener method) to schedule.
+        :param args:
+            The arguments passed to coroutine function by ST API.
+        """
+        loop = _get_loop()
+        if loop is None:
+            return
+
+        if event == "on_text_changed" and self.events and self.events[-1][2] == (None,):
+            # covered by the queued resync, which reads the buffer when it's handled
+            return
+
+        hwm = self.listener.high_water_mark
+        if hwm and len(self.events) >= hwm:
+            on_revert = getattr(type(self.listener), "on_revert", None)
+            on_revert = getattr(on_revert, "__wrapped__", None)
+            if on_revert is not None:
+                self.events.clear()
+                self.events.append(("on_revert", on_revert, ()))
+            elif event == "on_text_changed":
+                self.events.clear()
+                args = (None,)
+
+        self.events.append((event, coro_func, args))
+        if not self.armed:
+            self.armed = True
+            loop.call_soon_threadsafe(self.start)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        asyncio.get_running_loop().create_task(self.run())
+
+    def take(self) -> list[list]:
+        """
+        Take all queued events, merging change lists.
+
+        :returns:
+            A list of [event name, coroutine function, args] to handle in order.
+        """
+        batch: list[list] = []
+        while True:
+            try:
+                event, coro_func, args = self.events.popleft()
+            except IndexError:
+                return batch
+
+            if event == "on_text_changed":
+                if args[0] is None:
+                    # resync replaces all change lists before it
+                    batch = [item for item in batch if item[0] != event]
+                    batch.append([event, coro_func, args])
+                elif batch and batch[-1][0] == event and batch[-1][2][0] is not None:
+                    batch[-1][2][0].extend(args[0])
+                else:
+                    batch.append([event, coro_func, (list(args[0]),)])
+            else:
+                batch = [item for item in batch if item[0] != "on_text_changed"]
+                if not batch or batch[-1][0] != event:
+                    batch.append([event, coro_func, args])
+
+    async def run(self) -> None:
+        try:
+            while True:
+                batch = self.take()
+                if not batch:
+                    break
+                for event, coro_func, args in batch:
+                    await self.handle(coro_func, args)
+        finally:
+            # Also re-arm if cancelled, so the next pushed event restarts the queue.
+            self.running = False
+            self.armed = False
+
+        if self.events and not self.armed:
+            self.armed = True
+            self.start()
+
+    async def handle(self, coro_func: Callable[..., BlankCoro], args: tuple) -> None:
+        """
+        Run a single event handler in its own task.
+
+        Errors are printed and a `CancelledError` raised by the handler itself is ignored,
+        so neither stops the queue. Only cancelling the queue's task cancels the handler
+        and propagates.
+        """
+        buffer = self.listener.buffer
+        if buffer is None:
+            task = asyncio.get_running_loop().create_task(coro_func(self.listener, *args))
+        else:
+            # cancelled with the buffer's primary view
+            task = scope(buffer.primary_view()).create_task(coro_func(self.listener, *args))
+        try:
+            await asyncio.wait((task,))
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            traceback.print_exception(type(exc), exc, exc.__traceback__)
+
+
+class _Pool:
+    """
+    A named, bounded executor for blocking work of coroutines.
+
+    At most `max_workers` calls run at once. Further calls wait on the loop,
+    so they can still be cancelled before they start and the executor's
+    own queue stays empty, which makes the measured wait time exact.
+
+    Counters are updated on loop thread only.
+    """
+
+    def __init__(self, name: str, max_workers: int, processes: bool = False):
+        self.name = name
+        self.max_workers = max_workers
+        self.processes = processes
+        self.executor: Executor | None = None
+        self.slots: asyncio.Semaphore | None = None
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_time = 0.0
+        self.wait_max = 0.0
+        self.run_time = 0.0
+        self.run_max = 0.0
+
+    async def run(self, fn: Callable[..., T], args: tuple, kwargs: dict) -> T:
+        """
+        Run `fn(*args, **kwargs)` in executor.
+
+        :returns: The function's result.
+        """
+        loop = asyncio.get_running_loop()
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.max_workers)
+        if self.executor is None:
+            if self.processes:
+                # multiprocessing is expensive to import
+                from concurrent.futures import ProcessPoolExecutor
+
+                self.executor = ProcessPoolExecutor(self.max_workers)
+            else:
+                self.executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="sublime_aio_" + self.name
+                )
+
+        queued_at = now()
+        self.queued += 1
+        try:
+            await self.slots.acquire()
+        finally:
+            self.queued -= 1
+
+        started_at = now()
+        wait = started_at - queued_at
+        self.wait_time += wait
+        self.wait_max = max(self.wait_max, wait)
+        self.running += 1
+
+        def finish(cfut: Future) -> None:
+            # release the slot only after the call returned, even if it has been
+            # cancelled meanwhile, so no more than `max_workers` calls run at once
+            self.running -= 1
+            self.slots.release()  # type: ignore[union-attr]
+            elapsed = now() - started_at
+            self.run_time += elapsed
+            self.run_max = max(self.run_max, elapsed)
+            if cfut.cancelled() or cfut.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+        try:
+            if self.processes:
+                cfut = self.executor.submit(fn, *args, **kwargs)
+            else:
+                cfut = self.executor.submit(copy_context().run, fn, *args, **kwargs)
+        except BaseException:
+            self.running -= 1
+            self.slots.release()
+            raise
+
+        def done(cfut: Future) -> None:
+            try:
+                loop.call_soon_threadsafe(finish, cfut)
+            except RuntimeError:
+                pass  # loop closed
+
+        cfut.add_done_callback(done)
+        return await asyncio.wrap_future(cfut)
+
+    def stats(self) -> dict[str, float]:
+        """
+        :returns: The pool's queue depth and latency metrics.
+        """
+        done = self.completed + self.failed
+        started = done + self.running
+        return {
+            "workers": self.max_workers,
+            "running": self.running,
+            "queued": self.queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "wait_avg_ms": self.wait_time / started * 1000 if started else 0.0,
+            "wait_max_ms": self.wait_max * 1000,
+            "run_avg_ms": self.run_time / done * 1000 if done else 0.0,
+            "run_max_ms": self.run_max * 1000,
+        }
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+
+_pools: dict[str, _Pool] = {
+    "io": _Pool("io", 8),
+    "cpu": _Pool("cpu", os.cpu_count() or 2),
+}
+
+
+class _Diagnostics(logging.Handler):
+    """
+    Event loop health instrumentation.
+
+    - reports callbacks, which block the loop for longer than
+      `slow_callback_duration`, attributed to the event handler (coroutine) name,
+      using asyncio's debug mode
+    - keeps a registry of running tasks with their start time
+    - measures loop lag by periodically comparing a timer's due and actual time
+    """
+
+    HANDLE_PATTERNS = (
+        re.compile(r"coro=<([^\s(]+)\("),
+        re.compile(r"<(?:Timer)?Handle ([^\s(]+)\("),
+    )
+
+    def __init__(self, slow_callback_duration: float, lag_interval: float):
+        super().__init__(logging.WARNING)
+        self.slow_callback_duration = slow_callback_duration
+        self.lag_interval = lag_interval
+        # Maps running task to (name, start time).
+        self.tasks: dict[asyncio.Task, tuple[str, float]] = {}
+        # Maps handler name to [count, total seconds, max seconds] of slow callbacks.
+        self.slow: dict[str, list] = {}
+        self.lags: deque[float] = deque(maxlen=1000)
+        # (task, scope key, closing time) of tasks, which survived closing their scope.
+        self.leaked: deque[tuple[asyncio.Task, tuple[str, int], float]] = deque(maxlen=100)
+        self.probe: asyncio.TimerHandle | None = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Start instrumentation. Called on loop thread.
+        """
+        loop.set_debug(True)
+        loop.slow_callback_duration = self.slow_callback_duration
+        loop.set_task_factory(self.create_task)
+        logging.getLogger("asyncio").addHandler(self)
+        self.schedule_probe(loop)
+
+    def stop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Stop instrumentation. Called on loop thread.
+        """
+        logging.getLogger("asyncio").removeHandler(self)
+        loop.set_task_factory(None)
+        loop.set_debug(False)
+        if self.probe:
+            self.probe.cancel()
+            self.probe = None
+
+    def create_task(
+        self, loop: asyncio.AbstractEventLoop, coro: BlankCoro, **kwargs
+    ) -> asyncio.Task:
+        task = asyncio.Task(coro, loop=loop, **kwargs)
+        self.tasks[task] = (getattr(coro, "__qualname__", repr(coro)), now())
+        task.add_done_callback(self.tasks.pop)
+        return task
+
+    def schedule_probe(self, loop: asyncio.AbstractEventLoop) -> None:
+        due = loop.time() + self.lag_interval
+
+        def probe():
+            self.lags.append(loop.time() - due)
+            self.schedule_probe(loop)
+
+        self.probe = loop.call_at(due, probe)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # asyncio logs: 'Executing %s took %.3f seconds'
+        if not record.msg.startswith("Executing ") or not isinstance(record.args, tuple):
+            return
+        handle, duration = record.args
+        for pattern in self.HANDLE_PATTERNS:
+            match = pattern.search(handle)
+            if match:
+                name = match.group(1)
+                break
+        else:
+            name = handle[:80]
+        stats = self.slow.setdefault(name, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += duration
+        stats[2] = max(stats[2], duration)
+
+    def report(self) -> str:
+        """
+        Create a report. Safe to call from any thread.
+
+        :returns: The report of loop lag, slowest handlers and running tasks.
+        """
+        # C-level copies don't release the GIL and therefore don't
+        # see concurrent modifications on loop thread
+        lags = sorted(self.lags)
+        slow = sorted(self.slow.items(), key=lambda item: item[1][1], reverse=True)
+        tasks = sorted(self.tasks.values(), key=lambda item: item[1])
+        leaked = list(self.leaked)
+
+        lines = ["sublime_aio diagnostics", ""]
+        if lags:
+            lines.append(
+                "loop lag ({} samples): p50 {:.1f} ms, p90 {:.1f} ms, "
+                "p99 {:.1f} ms, max {:.1f} ms".format(
+                    len(lags),
+                    lags[len(lags) // 2] * 1000,
+                    lags[len(lags) * 9 // 10] * 1000,
+                    lags[len(lags) * 99 // 100] * 1000,
+                    lags[-1] * 1000,
+                )
+            )
+        else:
+            lines.append("loop lag: no samples yet")
+
+        lines += [
+            "",
+            "slow callbacks (>= {:.0f} ms):".format(self.slow_callback_duration * 1000),
+            "  {:>6} {:>10} {:>10}  {}".format("count", "total ms", "max ms", "handler"),
+        ]
+        for name, (count, total, longest) in slow[:20]:
+            lines.append(
+                "  {:>6} {:>10.1f} {:>10.1f}  {}".format(count, total * 1000, longest * 1000, name)
+            )
+
+        lines += [
+            "",
+            "lanes: {} interactive running, background deferred {} times for {:.1f} ms".format(
+                len(_lanes.tasks), _lanes.deferred, _lanes.deferred_time * 1000
+            ),
+        ]
+
+        time = now()
+        lines += ["", "tasks ({}):".format(len(tasks)), "  {:>8}  {}".format("age s", "task")]
+        for name, started in tasks:
+            lines.append("  {:>8.1f}  {}".format(time - started, name))
+
+        lines += [
+            "",
+            "leaked tasks ({}), still running after their view or window was closed:".format(
+                sum(not task.done() for task, _, _ in leaked)
+            ),
+            "  {:>8}  {:<14}  {}".format("closed s", "scope", "task"),
+        ]
+        for task, (kind, id), closed in leaked:
+            if not task.done():
+                lines.append(
+                    "  {:>8.1f}  {:<14}  {}".format(
+                        time - closed,
+                        "{} {}".format(kind, id),
+                        getattr(task.get_coro(), "__qualname__", repr(task)),
+                    )
+                )
+
+        return "\n".join(lines) + "\n"
+
+
+_diagnostics: _Diagnostics | None = None
+
+
+class _UiQueue:
+    """
+    Batches UI thread calls of coroutines.
+
+    All calls queued during one loop iteration are dispatched to UI thread via a
+    single `sublime.set_timeout()` and run in order. Their results are passed
+    back to the loop in a single hop, too.
+    """
+
+    def __init__(self):
+        # (function, args, kwargs, future) tuples. Used by loop thread only.
+        self.calls: list[tuple[Callable, tuple, dict, asyncio.Future]] = []
+
+    def push(self, fn: Callable[..., T], args: tuple, kwargs: dict) -> asyncio.Future[T]:
+        """
+        Queue a call. Called on loop thread.
+
+        :returns: The future to receive the call's result.
+        """
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        if not self.calls:
+            # runs at next loop iteration, after all currently ready callbacks
+            loop.call_soon(self.flush, loop)
+        self.calls.append((fn, args, kwargs, fut))
+        return fut
+
+    def flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        calls, self.calls = self.calls, []
+        sublime.set_timeout(lambda: self.run(loop, calls))
+
+    @staticmethod
+    def run(
+        loop: asyncio.AbstractEventLoop, calls: list[tuple[Callable, tuple, dict, asyncio.Future]]
+    ) -> None:
+        """
+        Run calls on UI thread.
+        """
+        results = []
+        for fn, args, kwargs, fut in calls:
+            # don't do UI work for coroutines, which are no longer interested
+            if fut.cancelled():
+                continue
+            try:
+                results.append((fut, fn(*args, **kwargs), None))
+            except BaseException as e:
+                results.append((fut, None, e))
+
+        def resolve() -> None:
+            for fut, result, error in results:
+                if fut.done():
+                    continue
+                if error is None:
+                    fut.set_result(result)
+                else:
+                    fut.set_exception(error)
+
+        try:
+            loop.call_soon_threadsafe(resolve)
+        except RuntimeError:
+            pass  # loop closed
+
+
+_ui_queue = _UiQueue()
+
+
+class _Lanes:
+    """
+    Loop side state of priority lanes.
+
+    Tracks submitted and running interactive tasks, which background tasks
+    defer to at `checkpoint()`s. Used by loop thread only, except `pending`.
+    """
+
+    NAMES = ("interactive", "normal", "background")
+    # Maximum time in seconds a checkpoint defers background work to avoid starving it.
+    MAX_DEFER = 1.0
+
+    def __init__(self):
+        # Tokens of interactive coroutines submitted from any thread, but not yet started.
+        self.pending: set[object] = set()
+        # Running interactive tasks.
+        self.tasks: set[asyncio.Task] = set()
+        # Set, while no interactive task is running.
+        self.idle: asyncio.Event | None = None
+        self.deferred = 0
+        self.deferred_time = 0.0
+
+    async def run(
+        self, lane: str, coro: Coroutine[object, object, T], token: object = None
+    ) -> T:
+        """
+        Run a coroutine in a lane.
+        """
+        self.pending.discard(token)
+        # task runs in a copy of current context
+        _lane.set(lane)
+        if lane == "background":
+            await self.wait()
+            return await coro
+
+        if lane == "interactive":
+            task = asyncio.current_task()
+            assert task
+            self.enter(task)
+            try:
+                return await coro
+            finally:
+                self.leave(task)
+
+        return await coro
+
+    def enter(self, task: asyncio.Task) -> None:
+        self.tasks.add(task)
+        if self.idle is not None:
+            self.idle.clear()
+
+    def leave(self, task: asyncio.Task) -> None:
+        self.tasks.discard(task)
+        if not self.tasks and self.idle is not None:
+            self.idle.set()
+
+    async def wait(self) -> None:
+        """
+        Wait until no interactive task is pending, but at most `MAX_DEFER` seconds.
+        """
+        if not self.tasks and not self.pending:
+            return
+        start = now()
+        deadline = start + self.MAX_DEFER
+        while self.tasks or self.pending:
+            timeout = deadline - now()
+            if timeout <= 0:
+                break
+            if not self.tasks:
+                # let submitted interactive tasks start
+                await asyncio.sleep(0)
+                continue
+            if self.idle is None:
+                self.idle = asyncio.Event()
+            try:
+                await asyncio.wait_for(self.idle.wait(), timeout)
+            except asyncio.TimeoutError:
+                break
+        self.deferred += 1
+        self.deferred_time += now() - start
+
+    @contextmanager
+    def suspended(self):
+        """
+        Don't count the current interactive task as running, while waiting for user input.
+        """
+        task = asyncio.current_task()
+        if task not in self.tasks:
+            yield
+            return
+        assert task
+        self.leave(task)
+        try:
+            yield
+        finally:
+            self.enter(task)
+
+
+_lanes = _Lanes()
+
+
+class _SettingsWatch:
+    """
+    A single `add_on_change` observer of a settings file, shared by all
+    `settings_changes()` iterators watching it.
+
+    Bursts of change notifications on UI thread cause a single hop to the loop,
+    which restarts settle timers of all subscribers.
+    """
+
+    TAG = "sublime_aio.settings_changes"
+    # Maps settings file name to watch. Used by loop thread only.
+    watches: dict[str, _SettingsWatch] = {}
+
+    def __init__(self, name: str):
+        self.name = name
+        self.loop = asyncio.get_running_loop()
+        self.settings = sublime.load_settings(name)
+        # Used by loop thread only.
+        self.subscribers: set[_SettingsSubscriber] = set()
+        # Whether a `notify()` hop is pending. Set by UI thread in `on_change()` and
+        # cleared by loop thread in `notify()`, before subscribers are touched.
+        # Losing a race is harmless: a change skipped because `armed` was still set
+        # happened before the pending `notify()` touches subscribers, so their settle
+        # timers restart and they read settings after it. A change seeing it cleared
+        # just causes one more hop.
+        self.armed = False
+
+    @classmethod
+    async def subscribe(cls, name: str, subscriber: _SettingsSubscriber) -> _SettingsWatch:
+        watch = cls.watches.get(name)
+        if watch is None:
+            watch = cls.watches[name] = cls(name)
+            await on_ui(watch.settings.add_on_change, cls.TAG, watch.on_change)
+        watch.subscribers.add(subscriber)
+        return watch
+
+    def unsubscribe(self, subscriber: _SettingsSubscriber) -> None:
+        self.subscribers.discard(subscriber)
+        if self.subscribers or self.watches.get(self.name) is not self:
+            return
+        del self.watches[self.name]
+        sublime.set_timeout(lambda: self.settings.clear_on_change(self.TAG))
+
+    def on_change(self) -> None:
+        """
+        Called by ST on UI thread for each modification of settings.
+        """
+        if self.armed:
+            return
+        self.armed = True
+        try:
+            self.loop.call_soon_threadsafe(self.notify)
+        except RuntimeError:
+            pass  # loop closed
+
+    def notify(self) -> None:
+        self.armed = False
+        for subscriber in self.subscribers:
+            subscriber.touch()
+
+
+class _SettingsSubscriber:
+    """
+    State of a `settings_changes()` iterator. Used by loop thread only.
+    """
+
+    def __init__(self, keys: list[str] | None, settle: float):
+        self.keys = keys
+        self.settle = settle
+        self.watch: _SettingsWatch | None = None
+        self.snapshot: dict[str, Any] = {}
+        self.timer: asyncio.TimerHandle | None = None
+        self.changed = asyncio.Event()
+
+    def read(self) -> dict[str, Any]:
+        assert self.watch
+        settings = self.watch.settings
+        if self.keys is None:
+            return settings.to_dict()
+        return {key: settings.get(key) for key in self.keys}
+
+    def touch(self) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+        self.timer = asyncio.get_running_loop().call_later(self.settle, self.settled)
+
+    def settled(self) -> None:
+        self.timer = None
+        snapshot = self.read()
+        if snapshot != self.snapshot:
+            self.snapshot = snapshot
+            self.changed.set()
+
+    async def get(self) -> dict[str, Any]:
+        await self.changed.wait()
+        self.changed.clear()
+        return self.snapshot
+
+    def close(self) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if self.watch is not None:
+            self.watch.unsubscribe(self)
+            self.watch = None
+
+
+# Interned `View` and `Window` wrappers by id.
+_views: WeakValueDictionary[int, View] = WeakValueDictionary()
+_windows: WeakValueDictionary[int, Window] = WeakValueDictionary()
+
+
+class _Cache:
+    """
+    State of a `cached` coroutine function.
+
+    Results are kept in a LRU, which maps a key to `(result, change count, expiry)`.
+    Concurrent calls with the same key await a single in-flight task.
+    Used by loop thread only.
+    """
+
+    def __init__(
+        self,
+        coro_func: Callable[..., Coroutine[object, object, T]],
+        key: Callable[..., Hashable] | None,
+        ttl: int | None,
+        maxsize: int,
+    ):
+        self.coro_func = coro_func
+        self.key = key
+        self.ttl = ttl / 1000 if ttl is not None else None
+        self.maxsize = maxsize
+        # Maps key to (result, change count, expiry).
+        self.cache: OrderedDict[Hashable, tuple[Any, int, float | None]] = OrderedDict()
+        # Maps key to (in-flight task, change count).
+        self.tasks: dict[Hashable, tuple[asyncio.Task, int]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.invalidated = 0
+        self.evicted = 0
+
+    async def __call__(self, *args, **kwargs) -> T:
+        if self.key is not None:
+            key = self.key(*args, **kwargs)
+        else:
+            key = (tuple(map(_cache_key, args)), tuple(sorted(kwargs.items())))
+        view = _cache_view(args)
+        change_count = view.change_count() if view is not None else -1
+
+        entry = self.cache.get(key)
+        if entry is not None:
+            result, cached_change_count, expiry = entry
+            if cached_change_count == change_count and (expiry is None or expiry > now()):
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return result
+            del self.cache[key]
+            self.invalidated += 1
+
+        inflight = self.tasks.get(key)
+        if inflight is not None and inflight[1] == change_count:
+            self.shared += 1
+            task = inflight[0]
+        else:
+            self.misses += 1
+            coro = self.run(key, change_count, self.coro_func(*args, **kwargs))
+            if view is None:
+                task = asyncio.get_running_loop().create_task(coro)
+            else:
+                task = scope(view).create_task(coro)
+            self.tasks[key] = (task, change_count)
+            # a task cancelled by a closed scope before it started never runs `run()`
+            task.add_done_callback(lambda done: self.forget(key, done))
+
+        # a cancelled caller must not cancel the call others are waiting for
+        return await asyncio.shield(task)
+
+    async def run(
+        self, key: Hashable, change_count: int, coro: Coroutine[object, object, T]
+    ) -> T:
+        result = await coro
+        self.cache[key] = (result, change_count, now() + self.ttl if self.ttl else None)
+        self.cache.move_to_end(key)
+        if len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+            self.evicted += 1
+        return result
+
+    def forget(self, key: Hashable, task: asyncio.Task) -> None:
+        inflight = self.tasks.get(key)
+        if inflight is not None and inflight[0] is task:
+            del self.tasks[key]
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        :returns: The cache's hit and miss counters.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "invalidated": self.invalidated,
+            "evicted": self.evicted,
+            "size": len(self.cache),
+            "maxsize": self.maxsize,
+        }
+
+
+def _cache_key(arg: object) -> Hashable:
+    """
+    Replace views and windows by their ids to create stable cache keys.
+    """
+    if isinstance(arg, sublime.View):
+        return ("view", arg.view_id)
+    if isinstance(arg, sublime.Window):
+        return ("window", arg.window_id)
+    return arg
+
+
+def _cache_view(args: tuple) -> sublime.View | None:
+    """
+    Get the view, whose change count invalidates cached results.
+
+    :returns:
+        The view of a `ViewEventListener` passed as first argument,
+        the first view passed as argument or `None`.
+    """
+    if args and isinstance(args[0], sublime_plugin.ViewEventListener):
+        return args[0].view
+    for arg in args:
+        if isinstance(arg, sublime.View):
+            return arg
+    return None
+
+
+def _view(view_id: int) -> View:
+    """
+    :returns: The `View` wrapper of a view id, which is shared by all callers.
+    """
+    view = _views.get(view_id)
+    if view is None:
+        view = _views[view_id] = View(view_id)
+    return view
+
+
+def _window(window_id: int) -> Window:
+    """
+    :returns: The `Window` wrapper of a window id, which is shared by all callers.
+    """
+    window = _windows.get(window_id)
+    if window is None:
+        window = _windows[window_id] = Window(window_id)
+    return window
+
+
+class _CloseListener:
+    """
+    Invalidates interned wrappers and cancels owned tasks of closed views and windows.
+
+    It is registered with `sublime_plugin` directly, as ST doesn't load
+    listeners of library modules.
+    """
+
+    def on_close(self, view: sublime.View) -> None:
+        _views.pop(view.view_id, None)
+        Scope.close(("view", view.view_id))
+        BufferMirror.release_closed()
+
+    def on_pre_close_window(self, window: sublime.Window) -> None:
+        _windows.pop(window.window_id, None)
+        Scope.close(("window", window.window_id))
+
+
+_close_listener = _CloseListener()
+for _callback in ("on_close", "on_pre_close_window"):
+    if _callback in sublime_plugin.all_callbacks:
+        sublime_plugin.all_callbacks[_callback].append(_close_listener)
+
+
+# Limits concurrent processes of `run_process()`.
+_process_limit = os.cpu_count() or 4
+_process_slots: asyncio.Semaphore | None = None
+
+
+def _kill_process_group(proc: asyncio.subprocess.Process) -> None:
+    """
+    Kill a process started by `run_process()` including all its children.
+    """
+    if proc.returncode is not None:
+        return
+    try:
+        if sys.platform == "win32":
+            subprocess.Popen(
+                ["taskkill", "/T", "/F", "/PID", str(proc.pid)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                creationflags=subprocess.CREATE_NO_WINDOW,
+            )
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except OSError:
+        pass
+
+
+def _process_panel(owner: sublime.View | sublime.Window | None, name: str) -> sublime.View:
+    """
+    Create and show an output panel for `run_process()`. Called on UI thread.
+    """
+    if isinstance(owner, sublime.View):
+        window = owner.window() or sublime.active_window()
+    else:
+        window = owner or sublime.active_window()
+    panel = window.create_output_panel(name)
+    window.run_command("show_panel", {"panel": "output." + name})
+    return panel
+
+
+async def _communicate(
+    proc: asyncio.subprocess.Process,
+    stdin: bytes | None,
+    panel: sublime.View | None,
+    encoding: str,
+) -> tuple[str, str]:
+    """
+    Feed stdin and read stdout and stderr of a process until it exits.
+
+    :returns: The decoded `(stdout, stderr)` tuple.
+    """
+
+    async def feed() -> None:
+        if stdin is not None and proc.stdin is not None:
+            proc.stdin.write(stdin)
+            try:
+                await proc.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            proc.stdin.close()
+
+    async def pump(stream: asyncio.StreamReader | None) -> str:
+        if stream is None:
+            return ""
+        decoder = getincrementaldecoder(encoding)(errors="replace")
+        chunks = []
+        while True:
+            data = await stream.read(65536)
+            text = decoder.decode(data, final=not data)
+            if text:
+                chunks.append(text)
+                if panel is not None:
+                    await on_ui(
+                        panel.run_command,
+                        "append",
+                        {"characters": text, "force": True, "scroll_to_end": True},
+                    )
+            if not data:
+                return "".join(chunks)
+
+    _, stdout, stderr = await asyncio.gather(feed(), pump(proc.stdout), pump(proc.stderr))
+    await proc.wait()
+    return stdout, stderr
+
+
+# Events, which must not be cancelled by closing their view or window.
+_UNSCOPED_EVENTS = {"on_pre_close", "on_close", "on_pre_close_window"}
+# Events, the user waits for the result of, see `run_coroutine()`.
+_INTERACTIVE_EVENTS = {"on_hover"}
+
+
+def _event_owner(event: str, args: tuple) -> sublime.View | sublime.Window | None:
+    """
+    Get the view or window an event handler coroutine is started for.
+
+    :param event:
+        The name of the event handler.
+    :param args:
+        The arguments passed to event handler by ST API, including the listener.
+
+    :returns:
+        The view of `ViewEventListener`s, the view or window passed to
+        `EventListener`s or `None`.
+    """
+    if event in _UNSCOPED_EVENTS:
+        return None
+    if isinstance(args[0], sublime_plugin.ViewEventListener):
+        return args[0].view
+    if len(args) > 1 and isinstance(args[1], (sublime.View, sublime.Window)):
+        return args[1]
+    return None
+
+
+# ---- [ public ] -------------------------------------------------------------
+
+
+def cached(
+    key: Callable[..., Hashable] | None = None, ttl: int | None = None, maxsize: int = 128
+):
+    """Share results and in-flight calls of a coroutine function.
+
+    Concurrent calls with the same key await a single call of the coroutine
+    function, whose result is cached for subsequent calls. Failed calls are not cached.
+
+    A cached result is invalidated as soon as the change count of the view differs
+    from the one the result was computed for. The view is taken from the instance
+    of a `ViewEventListener` passed as first argument or is the first `sublime.View`
+    among the arguments.
+
+    Cancelling a caller doesn't cancel the shared call other callers wait for.
+
+    Example:
+
+    ```py
+    @sublime_aio.cached(key=lambda view: view.file_name(), maxsize=32)
+    async def index_symbols(view):
+        text = view.substr(sublime.Region(0, view.size()))
+        return await sublime_aio.to_thread(parse_symbols, text, pool="cpu")
+
+    class Listener(sublime_aio.EventListener):
+        async def on_hover(self, view, point, hover_zone):
+            symbols = await index_symbols(view)
+
+        async def on_query_completions(self, view, prefix, locations):
+            symbols = await index_symbols(view)
+    ```
+
+    The decorated function provides `stats()` to return hit and miss counters
+    and `clear()` to drop cached results.
+
+    :param key:
+        The function to create a hashable key from the arguments of a call.
+        By default arguments are used, with views and windows replaced by their ids.
+    :param ttl:
+        The time in milliseconds a result is cached for, or `None` to keep it
+        until it is invalidated or evicted.
+    :param maxsize:
+        The maximum number of results to cache, least recently used ones are evicted first.
+    """
+    if ttl is not None and ttl <= 0:
+        raise ValueError("ttl must be greater than 0!")
+    if maxsize < 1:
+        raise ValueError("maxsize must be greater than 0!")
+
+    def decorator(
+        coro_func: Callable[P, Coroutine[object, object, T]],
+    ) -> Callable[P, Coroutine[object, object, T]]:
+        cache = _Cache(coro_func, key, ttl, maxsize)
+
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            return await cache(*args, **kwargs)
+
+        wrapper.__name__ = coro_func.__name__
+        wrapper.__qualname__ = coro_func.__qualname__
+        wrapper.__doc__ = coro_func.__doc__
+        wrapper.stats = cache.stats  # type: ignore[attr-defined]
+        wrapper.clear = cache.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+# Using pyright's type inference to get this type right – for now.
+def debounced(delay_in_ms: int, max_wait: int | None = None):
+    """Call coroutine as soon as no more events arrive within specified delay.
+
+    Performs view-specific tracking and is best suited for the
+    `on_modified` and `on_selection_modified` methods.
+    The `view` is taken from the first argument for `EventListener`s
+    and from the instance for `ViewEventListener`s.
+
+    The coroutine is called with the arguments of the most recent event.
+
+    Calls are only made when the `view` is still "valid" according to ST's API,
+    so it's not necessary to check it in the wrapped function.
+
+    Examples:
+
+    ```py
+    class DebouncedListener(sublime_aio.EventListener):
+        @sublime_aio.debounced(500)
+        async def on_modified(self, view):
+            print("debounced EventListener.on_modified", view.id())
+
+    class DebouncedViewListener(sublime_aio.ViewEventListener):
+        @sublime_aio.debounced(1000, max_wait=3000)
+        async def on_modified(self):
+            print("debounced ViewEventListener.on_modified_async", self.view.id())
+    ```
+
+    :param delay_in_ms:
+        The time in milliseconds without further events to wait for.
+    :param max_wait:
+        The maximum time in milliseconds a burst of events may defer the call.
+        If set, the coroutine is called at least once per `max_wait`
+        while events keep arriving.
+    """
+    if max_wait is not None and max_wait < delay_in_ms:
+        raise ValueError("max_wait must not be less than delay_in_ms!")
+    return _rate_limited(_Debouncer, delay_in_ms, max_wait)
+
+
+def throttled(delay_in_ms: int, leading: bool = True, trailing: bool = True):
+    """Call coroutine at most once per specified delay.
+
+    Performs view-specific tracking and is best suited for event storms like
+    `on_selection_modified` or `on_hover`, which should be handled
+    while they last, but not for every single event.
+    The `view` is taken from the first argument for `EventListener`s
+    and from the instance for `ViewEventListener`s.
+
+    Calls are only made when the `view` is still "valid" according to ST's API,
+    so it's not necessary to check it in the wrapped function.
+
+    Example:
+
+    ```py
+    class ThrottledListener(sublime_aio.EventListener):
+        @sublime_aio.throttled(200)
+        async def on_selection_modified(self, view):
+            print("throttled EventListener.on_selection_modified", view.id())
+    ```
+
+    :param delay_in_ms:
+        The minimum time in milliseconds between two calls.
+    :param leading:
+        Call coroutine with the first event of a burst.
+    :param trailing:
+        Call coroutine with the most recent event at the end of each delay,
+        if events arrived since the last call.
+    """
+    if not leading and not trailing:
+        raise ValueError("At least one of leading or trailing must be True!")
+    return _rate_limited(_Throttler, delay_in_ms, leading, trailing)
+
+
+def latest(coro_func: Callable[..., BlankCoro]) -> Callable[..., None]:
+    """Cancel a view's still running event handler, when a new event arrives.
+
+    Performs view-specific tracking, so only the most recent event of a view
+    is handled to completion. The `view` is taken from the first argument
+    for `EventListener`s and from the instance for `ViewEventListener`s.
+
+    Cancellation takes effect at the handler's next `await`. Handlers can call
+    `change_count()` to get the view's change count they were started for.
+
+    Can't be combined with `debounced` or `throttled`.
+
+    Example:
+
+    ```py
+    class LintListener(sublime_aio.ViewEventListener):
+        @sublime_aio.latest
+        async def on_modified(self):
+            text = self.view.substr(sublime.Region(0, self.view.size()))
+            result = await lint(text)
+            if self.view.change_count() == sublime_aio.change_count():
+                show(result)
+    ```
+    """
+    # Maps (listener, view id) to in-flight task.
+    tasks: dict[tuple[object, int], Future] = {}
+
+    async def run(self: EventListener | ViewEventListener, args: tuple, change_count: int) -> None:
+        # task runs in a copy of current context
+        _change_count.set(change_count)
+        await coro_func(self, *args)
+
+    # attribute tasks to event handler in diagnostics
+    run.__qualname__ = coro_func.__qualname__
+
+    def wrapper(self: EventListener | ViewEventListener, *args: sublime.View) -> None:
+        """
+        Wrapper function called on UI thread to cancel the pending and schedule a new
+        coroutine execution.
+
+        :param self:
+            The event listener instance for which to schedule event handler.
+        :param args:
+            The arguments passed to coroutine function by ST API.
+        """
+        if _get_loop() is None:
+            return
+
+        view = _event_view(self, args)
+        task_key = (self, view.view_id)
+        task = tasks.pop(task_key, None)
+        if task:
+            task.cancel()
+
+        task = tasks[task_key] = scope(view).run_coroutine(run(self, args, view.change_count()))
+
+        def done(fut: Future) -> None:
+            if tasks.get(task_key) is fut:
+                del tasks[task_key]
+
+        task.add_done_callback(done)
+
+    return wrapper
+
+
+def change_count() -> int:
+    """
+    :returns:
+        The change count of the view, the running `latest` event handler was started for,
+        or ``-1`` if not called from within a `latest` event handler.
+    """
+    return _change_count.get()
+
+
+async def to_thread(fn: Callable[..., T], *args, pool: str = "io", **kwargs) -> T:
+    """
+    Run blocking function in a worker pool without blocking the event loop.
+
+    All coroutines of all plugins share a single event loop thread. Blocking file
+    or network I/O, `subprocess.run()` or heavy computation must therefore be
+    offloaded to not stall everyone else.
+
+    Pools are bounded. Calls, which exceed a pool's number of workers, wait on the
+    event loop. Threads run in a copy of the caller's context.
+
+    Example:
+
+    ```py
+    async def on_post_save(self, view):
+        text = await sublime_aio.to_thread(read_file, view.file_name())
+        proc = await sublime_aio.to_thread(subprocess.run, ["make"], pool="cpu")
+    ```
+
+    :param fn:
+        The function to call.
+    :param args:
+        The positional arguments to pass to `fn`.
+    :param pool:
+        The name of the pool to run `fn` in:
+
+        - ``"io"``: 8 threads for blocking I/O
+        - ``"cpu"``: one thread per CPU core for computation, which releases the GIL
+        - any pool created by `add_pool()`
+    :param kwargs:
+        The keyword arguments to pass to `fn`.
+
+    :returns:
+        The function's result.
+    """
+    return await _pools[pool].run(fn, args, kwargs)
+
+
+def add_pool(name: str, max_workers: int, processes: bool = False) -> None:
+    """
+    Create a named worker pool for `to_thread()`.
+
+    Process pools run CPU-heavy pure-Python work without holding the GIL of
+    ST's plugin host. Functions and arguments must be picklable. As the plugin host
+    can't be spawned as worker process, a python interpreter must be configured
+    via `multiprocessing.set_executable()` before first use.
+
+    :param name:
+        The name of the pool.
+    :param max_workers:
+        The maximum number of concurrent calls.
+    :param processes:
+        Whether to run calls in worker processes instead of threads.
+    """
+    existing = _pools.get(name)
+    if existing is not None and existing.executor is not None:
+        raise RuntimeError('Pool "{}" is already in use!'.format(name))
+    _pools[name] = _Pool(name, max_workers, processes)
+
+
+def pool_stats() -> dict[str, dict[str, float]]:
+    """
+    :returns:
+        The queue depth and latency metrics by pool name:
+
+        - ``workers``: the maximum number of concurrent calls
+        - ``running``: the number of running calls
+        - ``queued``: the number of calls waiting for a worker
+        - ``completed``, ``failed``: the number of finished calls
+        - ``wait_avg_ms``, ``wait_max_ms``: the time calls waited for a worker
+        - ``run_avg_ms``, ``run_max_ms``: the time calls took to run
+    """
+    return {name: pool.stats() for name, pool in _pools.items()}
+
+
+def enable_diagnostics(slow_callback_ms: int = 100, lag_interval_ms: int = 250) -> None:
+    """
+    Enable event loop health instrumentation.
+
+    This helps to find event handlers, which hog the event loop shared by all plugins.
+    Results are shown by `sublime_aio_show_tasks` command.
+
+    As it enables asyncio's debug mode, it is meant for diagnosis only.
+
+    :param slow_callback_ms:
+        The minimum time in milliseconds a callback needs to block the loop to be reported.
+    :param lag_interval_ms:
+        The interval in milliseconds to measure loop lag at.
+    """
+    global _diagnostics
+    loop = _get_loop()
+    if loop is None:
+        raise RuntimeError("No event loop running!")
+
+    disable_diagnostics()
+    _diagnostics = _Diagnostics(slow_callback_ms / 1000, lag_interval_ms / 1000)
+    loop.call_soon_threadsafe(_diagnostics.start, loop)
+
+
+def disable_diagnostics() -> None:
+    """
+    Disable event loop health instrumentation.
+    """
+    global _diagnostics
+    if _diagnostics is None:
         return
+    if _loop is not None:
+        _loop.call_soon_threadsafe(_diagnostics.stop, _loop)
+    _diagnostics = None
 
-    loop = _loop
-    _loop = None
 
-    def shutdown():
-        for task in asyncio.all_tasks(loop):
-            task.cancel()
-        loop.stop()
+async def on_ui(fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Call a function on UI thread and return its result.
 
-    loop.call_soon_threadsafe(shutdown)
-    _thread.join()
-    loop.run_until_complete(loop.shutdown_asyncgens())
-    loop.close()
+    Calls of all coroutines made during one loop iteration are batched into a single
+    cross-thread hop and run in order. So updating many regions or phantoms
+    concurrently costs one hop instead of one per call.
 
+    Example:
 
-# ---- [ public ] -------------------------------------------------------------
+    ```py
+    async def on_modified(self, view):
+        regions = await find_errors(view)
+        await asyncio.gather(
+            sublime_aio.on_ui(view.add_regions, "errors", regions, "invalid"),
+            sublime_aio.on_ui(view.set_status, "errors", str(len(regions))),
+        )
+    ```
 
+    :param fn:
+        The function to call.
+    :param args:
+        The positional arguments to pass to `fn`.
+    :param kwargs:
+        The keyword arguments to pass to `fn`.
 
-# Using pyright's type inference to get this type right – for now.
-def debounced(delay_in_ms: int):
-    """Call coroutine as soon as no more events arrive within specified delay.
+    :returns:
+        The function's result.
+    """
+    return await _ui_queue.push(fn, args, kwargs)
 
-    Performs view-specific tracking and is best suited for the
-    `on_modified` and `on_selection_modified` methods.
-    The `view` is taken from the first argument for `EventListener`s
-    and from the instance for `ViewEventListener`s.
 
-    Calls are only made when the `view` is still "valid" according to ST's API,
-    so it's not necessary to check it in the wrapped function.
+async def settings_changes(
+    name: str, keys: list[str] | None = None, settle_ms: int = 50
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Iterate over changes of a settings file.
 
-    Examples:
+    A burst of modifications results in a single snapshot, which is delivered
+    only if any watched key's value actually changed. If the consumer is busy,
+    it receives the latest snapshot only.
+
+    All iterators watching the same settings file share a single observer.
+
+    Example:
 
     ```py
-    class DebouncedListener(sublime_aio.EventListener):
-        @sublime_aio.debounced(500)
-        async def on_modified(self, view):
-            print("debounced EventListener.on_modified", view.id())
+    async def watch_theme():
+        async for snapshot in sublime_aio.settings_changes(
+            "Preferences", keys=["color_scheme", "theme"], settle_ms=100
+        ):
+            await update_theme(snapshot["color_scheme"], snapshot["theme"])
+    ```
 
-    class DebouncedViewListener(sublime_aio.ViewEventListener):
-        @sublime_aio.debounced(1000)
-        async def on_modified(self):
-            print("debounced ViewEventListener.on_modified_async", self.view.id())
+    :param name:
+        The base name of the settings file, with or without `.sublime-settings` extension.
+    :param keys:
+        The keys to watch and include in snapshots, or `None` to watch all settings.
+    :param settle_ms:
+        The time in milliseconds without further modifications to wait for.
+
+    :returns:
+        An asynchronous iterator of `{key: value}` snapshots.
+    """
+    if settle_ms < 0:
+        raise ValueError("settle_ms must not be negative!")
+    if not name.endswith(".sublime-settings"):
+        name += ".sublime-settings"
+
+    subscriber = _SettingsSubscriber(keys, settle_ms / 1000)
+    try:
+        subscriber.watch = await _SettingsWatch.subscribe(name, subscriber)
+        # read initial state after registering the observer to not miss changes
+        subscriber.snapshot = subscriber.read()
+        while True:
+            yield await subscriber.get()
+    finally:
+        subscriber.close()
+
+
+async def run_process(
+    args: str | list[str],
+    *,
+    stdin: str | bytes | None = None,
+    cwd: str | None = None,
+    env: dict[str, str] | None = None,
+    timeout: float | None = None,
+    owner: sublime.View | sublime.Window | None = None,
+    panel: str | None = None,
+    encoding: str = "utf-8",
+) -> subprocess.CompletedProcess:
+    """
+    Run a process on the event loop and return its output.
+
+    Unlike `subprocess.run()`, it doesn't block a thread while the process runs,
+    so many formatter or linter runs can share the event loop.
+
+    The process is started in a new process group, which is killed including all
+    child processes, if the calling task is cancelled, `timeout` expires or
+    the `owner` is closed.
+
+    The number of concurrent processes is limited, see `set_process_limit()`.
+    Further calls wait for a running process to finish.
+
+    Example:
+
+    ```py
+    async def on_pre_save(self, view):
+        text = view.substr(sublime.Region(0, view.size()))
+        proc = await sublime_aio.run_process(
+            ["black", "-q", "-"], stdin=text, timeout=10, owner=view
+        )
+        if proc.returncode == 0:
+            ...
     ```
+
+    :param args:
+        The program and its arguments, or a command line to run in a shell.
+    :param stdin:
+        The text or bytes to feed to the process' stdin.
+    :param cwd:
+        The working directory to run the process in.
+    :param env:
+        The environment variables of the process.
+    :param timeout:
+        The maximum time in seconds the process may run.
+    :param owner:
+        The view or window, whose closing kills the process, see `scope()`.
+    :param panel:
+        The name of an output panel to stream stdout and stderr into.
+        It is created in the owner's window or the active window.
+    :param encoding:
+        The encoding of stdin, stdout and stderr.
+
+    :returns:
+        A `subprocess.CompletedProcess` with decoded `stdout` and `stderr`.
+
+    :raises subprocess.TimeoutExpired:
+        If the process didn't finish within `timeout` seconds.
     """
+    global _process_slots
+    if _process_slots is None:
+        _process_slots = asyncio.Semaphore(_process_limit)
+    slots = _process_slots
+
+    kwargs: dict[str, Any] = {
+        "stdin": subprocess.PIPE if stdin is not None else subprocess.DEVNULL,
+        "stdout": subprocess.PIPE,
+        "stderr": subprocess.PIPE,
+        "cwd": cwd,
+        "env": env,
+    }
+    if sys.platform == "win32":
+        kwargs["creationflags"] = (
+            subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.CREATE_NO_WINDOW
+        )
+    else:
+        kwargs["start_new_session"] = True
+    if isinstance(stdin, str):
+        stdin = stdin.encode(encoding)
+
+    async with slots:
+        if isinstance(args, str):
+            proc = await asyncio.create_subprocess_shell(args, **kwargs)
+        else:
+            proc = await asyncio.create_subprocess_exec(*args, **kwargs)
 
-    @overload
-    def decorator(
-        coro_func: Callable[[EL, sublime.View], BlankCoro],
-    ) -> Callable[[EL, sublime.View], None]: ...
+        task = asyncio.current_task()
+        owned = scope(owner) if owner is not None else None
+        if owned is not None and task is not None:
+            owned.add(task)
+        try:
+            panel_view = await on_ui(_process_panel, owner, panel) if panel else None
+            stdout, stderr = await asyncio.wait_for(
+                _communicate(proc, stdin, panel_view, encoding), timeout
+            )
+        except asyncio.TimeoutError:
+            _kill_process_group(proc)
+            raise subprocess.TimeoutExpired(args, timeout or 0) from None
+        except BaseException:
+            _kill_process_group(proc)
+            raise
+        finally:
+            if owned is not None and task is not None:
+                owned.discard(task)
 
-    @overload
-    def decorator(coro_func: Callable[[VEL], BlankCoro]) -> Callable[[VEL], None]: ...
+    return subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
 
-    def decorator(
-        coro_func: Callable[[EL, sublime.View], BlankCoro] | Callable[[VEL], BlankCoro],
-    ) -> Callable[..., None]:
-        # Maps a view id to a timestamp of a monotic clock in fractional seconds.
-        call_at: dict[int, float] = {}
-        lock = Lock()
 
-        async def debounce(
-            view: sublime.View, coro_func: Callable, self: EventListener | ViewEventListener, *args
-        ):
-            """
-            Coroutine scheduling delayed event handler coroutine execution.
+def set_process_limit(limit: int) -> None:
+    """
+    Set the maximum number of processes `run_process()` runs at once.
 
-            Event handler is executed if no further event was received within specified delay.
+    Applies to processes started afterwards.
 
-            :param view:
-                The view handling the event for.
-            :param coro_func:
-                The coroutine function (event listener method) to schedule.
-            :param self:
-                The event listener instance for which to schedule event handler.
-            :param args:
-                The arguments passed to coroutine function by ST API.
-            """
-            while True:
-                with lock:
-                    time_to_wait = delay_in_ms / 1000 + call_at[view.view_id] - now()
-                    if time_to_wait <= 0:
-                        del call_at[view.view_id]
-                        break
+    :param limit:
+        The maximum number of concurrent processes. Defaults to number of CPU cores.
+    """
+    global _process_limit, _process_slots
+    _process_limit = limit
+    _process_slots = None
 
-                await asyncio.sleep(time_to_wait)
 
-            if view.is_valid():
-                await coro_func(self, *args)
+def scope(owner: sublime.View | sublime.Window) -> Scope:
+    """
+    Get the task scope of a view or window.
 
-        def wrapper(self: EventListener | ViewEventListener, *args: sublime.View) -> None:
-            """
-            Wrapper function called on UI thread to schedule debounced coroutine execution
+    All tasks of a scope are cancelled, when its view or window is closed.
 
-            :param self:
-                The event listener instance for which to schedule event handler.
-            :param args:
-                The arguments passed to coroutine function by ST API.
-            """
-            if _loop is None:
-                return
+    Event handler coroutines of `EventListener`s and `ViewEventListener`s are
+    started in the scope of the view or window they handle an event for,
+    including `debounced`, `throttled` and `latest` ones and `on_query_completions`.
+    Handlers of `TextChangeListener`s run in the scope of the buffer's primary view
+    and `cached` calls in the scope of the view they are passed.
 
-            view = self.view if isinstance(self, ViewEventListener) else args[0]
+    Example:
 
-            with lock:
-                if view.view_id in call_at:
-                    call_at[view.view_id] = now()
-                    return
-                call_at[view.view_id] = now()
+    ```py
+    class Indexer(sublime_aio.ViewEventListener):
+        async def on_activated(self):
+            # cancelled, if the view is closed
+            sublime_aio.scope(self.view).create_task(self.index_imports())
+
+            async with sublime_aio.scope(self.view.window()):
+                # cancelled, if the window is closed
+                await index_project()
+    ```
 
-            asyncio.run_coroutine_threadsafe(debounce(view, coro_func, self, *args), loop=_loop)
+    :param owner:
+        The view or window.
 
-        return wrapper
+    :returns:
+        The `Scope`.
+    """
+    if isinstance(owner, sublime.View):
+        key = ("view", owner.view_id)
+    else:
+        key = ("window", owner.window_id)
 
-    return decorator
+    owned = Scope.scopes.get(key)
+    if owned is not None:
+        return owned
+
+    if not owner.is_valid():
+        # not registered, as nothing would ever close it
+        return Scope(key, closed=True)
+
+    with _lock:
+        owned = Scope.scopes.get(key)
+        if owned is not None:
+            return owned
+        owned = Scope.scopes[key] = Scope(key)
 
+    # The view or window may have been closed after the check above, but before
+    # the scope was registered, so `_CloseListener` missed it.
+    if not owner.is_valid():
+        Scope.close(key)
+    return owned
 
-def run_coroutine(coro: Coroutine[object, object, T]) -> Future[T]:
+
+def run_coroutine(coro: Coroutine[object, object, T], lane: str = "normal") -> Future[T]:
     """
     Run coroutine from synchronous code.
 
+    Coroutines run in one of three priority lanes:
+
+    - `"interactive"` for work the user waits for, like completions, hover popups
+      and commands. Event handlers of `on_query_completions` and `on_hover`,
+      as well as commands run in this lane.
+    - `"normal"` for everything else.
+    - `"background"` for heavy work like project indexing. It starts and continues
+      at each `checkpoint()` only after interactive work is done.
+
+    Tasks created by a coroutine share its lane.
+
     Example:
 
     ```py
@@ -209,28 +2192,73 @@ def run_coroutine(coro: Coroutine[object, object, T]) -> Future[T]:
 
     :param coro:
         The coroutine object to run
+    :param lane:
+        The priority lane to run the coroutine in.
 
     :returns:
         An `concurrent.Future` object
     """
-    if _loop is None:
+    if lane not in _Lanes.NAMES:
+        raise ValueError("Unknown lane {!r}!".format(lane))
+
+    loop = _get_loop()
+    if loop is None:
         raise RuntimeError("No event loop running!")
 
-    return asyncio.run_coroutine_threadsafe(coro, loop=_loop)
+    if lane == "normal" and _lane.get() == "normal":
+        return asyncio.run_coroutine_threadsafe(coro, loop=loop)
+
+    token = None
+    if lane == "interactive":
+        # let background tasks defer, before the task is started
+        token = object()
+        _lanes.pending.add(token)
+    wrapper = _lanes.run(lane, coro, token)
+    # attribute tasks to the coroutine in diagnostics
+    wrapper.__qualname__ = getattr(coro, "__qualname__", wrapper.__qualname__)
+    future = asyncio.run_coroutine_threadsafe(wrapper, loop=loop)
+    if token is not None:
+        # a task cancelled before it started never runs `_lanes.run()`
+        future.add_done_callback(lambda _: _lanes.pending.discard(token))
+    return future
+
+
+async def checkpoint() -> None:
+    """
+    Yield to other tasks.
+
+    Long running background work should call it regularly. In the `"background"`
+    lane it defers, while interactive work is pending, so typing, completions and
+    commands stay responsive. See `run_coroutine()`.
+
+    Example:
+
+    ```py
+    async def index_project(files):
+        for file in files:
+            index(file)
+            await sublime_aio.checkpoint()
+
+    sublime_aio.run_coroutine(index_project(files), lane="background")
+    ```
+    """
+    if _lane.get() == "background":
+        await _lanes.wait()
+    await asyncio.sleep(0)
 
 
 def active_window() -> Window:
     """
     :returns: The most recently used `Window`.
     """
-    return Window(sublime_api.active_window())
+    return _window(sublime_api.active_window())
 
 
 def windows() -> list[Window]:
     """
     :returns: A list of all the open windows.
     """
-    return [Window(id) for id in sublime_api.windows()]
+    return [_window(id) for id in sublime_api.windows()]
 
 
 class ApplicationCommand(sublime_plugin.ApplicationCommand):
@@ -241,7 +2269,7 @@ class ApplicationCommand(sublime_plugin.ApplicationCommand):
     def run_(self, edit_token: int, args: dict[str, Any]) -> None:
         args = self.filter_args(args)
         try:
-            run_coroutine(self.run(**args) if args else self.run())
+            run_coroutine(self.run(**args) if args else self.run(), lane="interactive")
         except TypeError as e:
             if "required positional argument" in str(e):
                 if sublime_api.can_accept_input(self.name(), args):
@@ -269,13 +2297,13 @@ class WindowCommand(sublime_plugin.WindowCommand):
     def __init__(self, window: sublime.Window):
         """:meta private:"""
 
-        self.window: Window = Window(window.id())
+        self.window: Window = _window(window.id())
         """ The asyncio supporting `Window` this command is attached to. """
 
     def run_(self, edit_token: int, args: dict[str, Any]) -> None:
         args = self.filter_args(args)
         try:
-            run_coroutine(self.run(**args) if args else self.run())
+            run_coroutine(self.run(**args) if args else self.run(), lane="interactive")
         except TypeError as e:
             if "required positional argument" in str(e):
                 if sublime_api.window_can_accept_input(self.window.id(), self.name(), args):
@@ -315,7 +2343,7 @@ class ViewCommand(sublime_plugin.TextCommand):
     def run_(self, edit_token: int, args: dict[str, Any]) -> None:
         args = self.filter_args(args)
         try:
-            run_coroutine(self.run(**args) if args else self.run())
+            run_coroutine(self.run(**args) if args else self.run(), lane="interactive")
         except TypeError as e:
             if "required positional argument" in str(e):
                 if sublime_api.view_can_accept_input(self.view.id(), self.name(), args):
@@ -335,6 +2363,149 @@ class ViewCommand(sublime_plugin.TextCommand):
         raise NotImplementedError
 
 
+class Scope:
+    """
+    A set of tasks, which are cancelled, when a view or window is closed.
+
+    Use `scope()` to get the scope of a view or window.
+    """
+
+    # Maps ("view" | "window", id) to scope of open views and windows.
+    scopes: dict[tuple[str, int], Scope] = {}
+    # Time in seconds cancelled tasks have to finish, before they are reported as leaked.
+    LEAK_TIMEOUT = 1.0
+
+    def __init__(self, key: tuple[str, int], closed: bool = False):
+        self.key = key
+        self.closed = closed
+        # Used by loop thread only.
+        self.tasks: set[asyncio.Task] = set()
+
+    def __repr__(self) -> str:
+        return "<Scope {}={} tasks={}{}>".format(
+            self.key[0], self.key[1], len(self.tasks), " closed" if self.closed else ""
+        )
+
+    async def __aenter__(self) -> Scope:
+        task = asyncio.current_task()
+        if task is not None:
+            self.add(task)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self.discard(task)
+
+    def add(self, task: asyncio.Task) -> None:
+        """
+        Add a task to the scope. Called on loop thread.
+
+        A task added to a closed scope is cancelled.
+        """
+        if self.closed:
+            task.cancel()
+        else:
+            self.tasks.add(task)
+
+    def discard(self, task: asyncio.Task) -> None:
+        """
+        Remove a task from the scope. Called on loop thread.
+        """
+        self.tasks.discard(task)
+
+    def create_task(self, coro: Coroutine[object, object, T]) -> asyncio.Task[T]:
+        """
+        Start a coroutine in the scope. Called on loop thread.
+
+        :returns: The task.
+        """
+        task = asyncio.get_running_loop().create_task(coro)
+        self.add(task)
+        task.add_done_callback(self.discard)
+        return task
+
+    def run_coroutine(
+        self, coro: Coroutine[object, object, T], lane: str = "normal"
+    ) -> Future[T]:
+        """
+        Start a coroutine in the scope from any thread, like `run_coroutine()`.
+
+        :returns: An `concurrent.Future` object.
+        """
+
+        async def run() -> T:
+            task = asyncio.current_task()
+            assert task
+            self.add(task)
+            try:
+                return await coro
+            finally:
+                self.discard(task)
+
+        wrapper = run()
+        # attribute tasks to the coroutine in diagnostics
+        wrapper.__qualname__ = getattr(coro, "__qualname__", wrapper.__qualname__)
+        return run_coroutine(wrapper, lane)
+
+    def cancel(self) -> None:
+        """
+        Cancel all tasks of the scope. Called on loop thread.
+        """
+        tasks = list(self.tasks)
+        for task in tasks:
+            task.cancel()
+
+        if tasks and _diagnostics is not None:
+            diagnostics = _diagnostics
+            started = now()
+
+            def check() -> None:
+                for task in tasks:
+                    if not task.done():
+                        diagnostics.leaked.append((task, self.key, started))
+
+            asyncio.get_running_loop().call_later(self.LEAK_TIMEOUT, check)
+
+    @classmethod
+    def close(cls, key: tuple[str, int]) -> None:
+        """
+        Close the scope of a closed view or window and cancel its tasks.
+        Called on UI thread.
+        """
+        with _lock:
+            owned = cls.scopes.pop(key, None)
+        if owned is None:
+            return
+        owned.closed = True
+        loop = _loop
+        if loop is not None:
+            loop.call_soon_threadsafe(owned.cancel)
+
+
+class SublimeAioShowTasksCommand(sublime_plugin.WindowCommand):
+    """
+    Show running tasks, loop lag and slowest event handlers in an output panel.
+
+    It is a synchronous command, so it still works while the loop is blocked.
+
+    Plugins register it by importing it:
+
+    ```py
+    from sublime_aio import SublimeAioShowTasksCommand  # noqa: F401
+    ```
+    """
+
+    def run(self) -> None:
+        if _diagnostics is None:
+            text = "sublime_aio diagnostics are disabled, call sublime_aio.enable_diagnostics()\n"
+        else:
+            text = _diagnostics.report()
+        panel = self.window.create_output_panel("sublime_aio")
+        panel.run_command("append", {"characters": text})
+        self.window.run_command("show_panel", {"panel": "output.sublime_aio"})
+
+
 class AsyncEventListenerType(type):
     """
     This class describes an asynchronous event listener meta class.
@@ -345,6 +2516,8 @@ class AsyncEventListenerType(type):
 
     A `sublime.CompletionList()` is created and returned before async
     `on_query_completions` is scheduled for execution.
+    Requests are tracked per listener and view, so only a pending request
+    of the same view is cancelled, and results are cached, see `_Completions`.
     ```
     """
 
@@ -357,42 +2530,10 @@ class AsyncEventListenerType(type):
         for attr_name, attr_value in attrs.items():
             # wrap `async def on_query_completions()` in sync method of same name
             if attr_name == "on_query_completions" and iscoroutinefunction(attr_value):
-                _task = None
-                completions_coro_func: Callable[
-                    ..., Coroutine[object, object, CompletionsReturnVal]
-                ] = attr_value
-
-                async def query_completions(
-                    clist: sublime.CompletionList,
-                    coro: Coroutine[object, object, CompletionsReturnVal],
-                ) -> None:
-                    try:
-                        completions = await coro
-                        if isinstance(completions, sublime.CompletionList):
-                            clist.set_completions(completions.completions or [], completions.flags)
-                        elif isinstance(completions, tuple):
-                            clist.set_completions(completions[0], completions[1])
-                        else:
-                            clist.set_completions(completions or [])
-                    except asyncio.CancelledError:
-                        clist.set_completions([])
-                    except BaseException:
-                        clist.set_completions([])
-                        traceback.print_exc()
-
-                def on_query_completions(
-                    *args: P.args, **kwargs: P.kwargs
-                ) -> sublime.CompletionList:
-                    nonlocal _task
-
-                    if _task:
-                        _task.cancel()
-
-                    clist = sublime.CompletionList()
-                    _task = run_coroutine(
-                        query_completions(clist, completions_coro_func(*args, **kwargs))
-                    )
-                    return clist
+                completions = _Completions(attr_value)
+
+                def on_query_completions(*args: P.args) -> sublime.CompletionList:
+                    return completions(*args)
 
                 attrs[attr_name] = on_query_completions
 
@@ -402,10 +2543,23 @@ class AsyncEventListenerType(type):
                     raise ValueError(
                         'Invalid event handler name! Coroutines must not end with "_async"!'
                     )
-                coro_func: Callable[..., Coroutine[object, object, None]] = attr_value
 
-                def on_event(*args: P.args, **kwargs: P.kwargs) -> None:
-                    run_coroutine(coro_func(*args, **kwargs))
+                # note: `coro_func` must be part of on_event() signature to
+                #       create unique function object as otherwise all events
+                #       call last `on_...` coroutine defined by listener.
+                def on_event(
+                    *args: P.args,
+                    coro_func: Callable[
+                        ..., Coroutine[object, object, None]
+                    ] = attr_value,  # pyright: ignore
+                    event: str = attr_name,
+                ) -> None:
+                    owner = _event_owner(event, args)
+                    lane = "interactive" if event in _INTERACTIVE_EVENTS else "normal"
+                    if owner is None:
+                        run_coroutine(coro_func(*args), lane=lane)
+                    else:
+                        scope(owner).run_coroutine(coro_func(*args), lane=lane)
 
                 attrs[attr_name] = on_event
 
@@ -461,8 +2615,8 @@ class AsyncTextChangeListenerType(type):
     This class describes an asynchronous text change listener meta class.
 
     It wraps all coroutines which start with `on_` into synchronous methods
-    for ST to execute them. Wrapper methods schedule execution of coroutines
-    in global event loop.
+    for ST to execute them. Wrapper methods queue events of a buffer to be
+    handled one after another in global event loop, see `_TextChangeQueue`.
     """
 
     def __new__(
@@ -485,17 +2639,18 @@ class AsyncTextChangeListenerType(type):
                 #       create unique function object as otherwise all events
                 #       call last `on_...` coroutine defined by listener.
                 #       Handler is not called, when using `partial()`!
-                #       It's actually unclear, why it is working without in
-                #       `AsyncEventListenerType`.
                 def on_event(
+                    self: TextChangeListener,
                     *args: P.args,
                     coro_func: Callable[
                         ..., Coroutine[object, object, None]
                     ] = attr_value,  # pyright: ignore
-                    **kwargs: P.kwargs,
+                    event: str = attr_name,
                 ) -> None:
-                    run_coroutine(coro_func(*args, **kwargs))
+                    _TextChangeQueue.of(self).push(event, coro_func, args)
 
+                # used by `_TextChangeQueue` to resync via `on_revert`
+                on_event.__wrapped__ = attr_value  # type: ignore[attr-defined]
                 attrs[attr_name] = on_event
 
         return super().__new__(mcs, name, bases, attrs)
@@ -510,13 +2665,28 @@ class TextChangeListener(sublime_plugin.TextChangeListener, metaclass=AsyncTextC
     It extends `sublime_plugin.TextChangeListener` to support event handler coroutines
     which behave the same way as default methods.
 
+    Events of a buffer are handled in order, one at a time. Change lists,
+    which arrive while a handler is still running, are merged into a single list,
+    so the next `on_text_changed` call catches up at once.
+
     .. since:: 4081
 
-    .. method:: on_text_changed(changes: List[TextChange])
+    .. attribute:: high_water_mark
+
+        The maximum number of queued events. If exceeded, queued change lists
+        are dropped and an async `on_revert` is called instead, to resync with
+        the buffer. Without one, `on_text_changed` is called once with `None`.
+        ``0`` to disable.
+
+    .. method:: on_text_changed(changes: Optional[List[TextChange]])
 
         Called once after changes has been made to a buffer, with detailed
         information about what has changed.
 
+        `changes` is `None`, if changes were dropped due to `high_water_mark`.
+        The handler must then read the whole buffer via `View.substr`, which
+        includes all changes made until it is called.
+
     .. method:: on_revert()
 
         Called when the buffer is reverted.
@@ -532,7 +2702,300 @@ class TextChangeListener(sublime_plugin.TextChangeListener, metaclass=AsyncTextC
         are required here use `View.substr`.
     """
 
-    pass
+    high_water_mark: int = 1000
+
+
+class BufferSnapshot:
+    """
+    An immutable snapshot of a `BufferMirror`.
+
+    Snapshots share the mirror's text chunks, so taking one doesn't copy any text.
+    Only the requested range is copied when reading.
+    """
+
+    __slots__ = ("chunks", "starts", "change_count")
+
+    CHUNK_SIZE = 8192
+
+    def __init__(self, chunks: tuple[str, ...] = (), starts: tuple[int, ...] = (), change_count=-1):
+        self.chunks = chunks
+        """ The text in chunks of about `CHUNK_SIZE` characters. """
+        self.starts = starts
+        """ The offset of each chunk. """
+        self.change_count = change_count
+        """ The view's change count the snapshot reflects, ``-1`` if not yet synced. """
+
+    @classmethod
+    def from_text(cls, text: str, change_count: int) -> BufferSnapshot:
+        chunks = _split(text, cls.CHUNK_SIZE)
+        return cls(chunks, _offsets(chunks, 0), change_count)
+
+    def __len__(self) -> int:
+        return self.starts[-1] + len(self.chunks[-1]) if self.chunks else 0
+
+    def __str__(self) -> str:
+        return "".join(self.chunks)
+
+    def size(self) -> int:
+        """
+        :returns: The number of characters in the snapshot.
+        """
+        return len(self)
+
+    def substr(self, a: int | sublime.Region, b: int | None = None) -> str:
+        """
+        :param a:
+            The start offset or a `sublime.Region`.
+        :param b:
+            The end offset, if `a` is an offset. Defaults to ``a + 1``.
+
+        :returns:
+            The text of the given range.
+        """
+        if isinstance(a, sublime.Region):
+            a, b = a.begin(), a.end()
+        elif b is None:
+            b = a + 1
+        size = len(self)
+        a = max(0, min(a, size))
+        b = max(a, min(b, size))
+        if a == b:
+            return ""
+        i = bisect_right(self.starts, a) - 1
+        j = bisect_right(self.starts, b - 1) - 1
+        if i == j:
+            start = self.starts[i]
+            return self.chunks[i][a - start : b - start]
+        return "".join(
+            (
+                self.chunks[i][a - self.starts[i] :],
+                *self.chunks[i + 1 : j],
+                self.chunks[j][: b - self.starts[j]],
+            )
+        )
+
+    def replace(self, a: int, b: int, text: str, change_count: int) -> BufferSnapshot:
+        """
+        Create a new snapshot with the characters from `a` to `b` replaced by `text`.
+
+        Only the chunks at `a` and `b` are copied, all others are shared.
+        """
+        chunks, starts = self.chunks, self.starts
+        if not chunks:
+            return BufferSnapshot.from_text(text, change_count)
+
+        i = max(0, bisect_right(starts, a) - 1)
+        j = max(i, bisect_right(starts, b) - 1)
+        text = chunks[i][: a - starts[i]] + text + chunks[j][b - starts[j] :]
+        # merge small remainders of deletions into next chunk
+        if len(text) < self.CHUNK_SIZE // 4 and j + 1 < len(chunks):
+            j += 1
+            text += chunks[j]
+
+        new = _split(text, self.CHUNK_SIZE) if len(text) > 2 * self.CHUNK_SIZE else (text,)
+        if not text:
+            new = ()
+        delta = len(text) - sum(map(len, chunks[i : j + 1]))
+        return BufferSnapshot(
+            chunks[:i] + new + chunks[j + 1 :],
+            starts[:i]
+            + _offsets(new, starts[i])
+            + tuple(start + delta for start in starts[j + 1 :]),
+            change_count,
+        )
+
+
+def _split(text: str, size: int) -> tuple[str, ...]:
+    return tuple(text[pos : pos + size] for pos in range(0, len(text), size))
+
+
+def _offsets(chunks: tuple[str, ...], start: int) -> tuple[int, ...]:
+    offsets = []
+    for chunk in chunks:
+        offsets.append(start)
+        start += len(chunk)
+    return tuple(offsets)
+
+
+class BufferMirror(TextChangeListener):
+    """
+    A loop-side copy of a buffer's text, maintained from text change events.
+
+    Reading a mirror's snapshot doesn't cross into ST's process and doesn't
+    copy the whole buffer, which makes it cheap for analysis plugins to access
+    large files on every keystroke.
+
+    Mirrors are created on demand for selected buffers only and are dropped,
+    when the buffer's last view is closed. The mirror is verified against
+    the view's change count and size whenever it has caught up, and is resynced
+    via `View.substr` on revert, reload, mismatch or if it falls too far behind,
+    see `high_water_mark`.
+
+    Example:
+
+    ```py
+    class Linter(sublime_aio.ViewEventListener):
+        @sublime_aio.latest
+        async def on_modified(self):
+            mirror = sublime_aio.BufferMirror.get(self.view)
+            snapshot = await mirror.wait(sublime_aio.change_count())
+            await lint(str(snapshot))
+    ```
+    """
+
+    # Maps buffer id to mirror of open buffers.
+    mirrors: dict[int, BufferMirror] = {}
+
+    def __init__(self, buffer: sublime.Buffer | None = None):
+        super().__init__()
+        # The mirrored buffer, also before the mirror is attached to it.
+        self._buffer = buffer
+        self._snapshot = BufferSnapshot()
+        # (change count, future) tuples of `wait()` calls. Used by loop thread only.
+        self._waiters: list[tuple[int, asyncio.Future]] = []
+
+    @classmethod
+    def is_applicable(cls, buffer: sublime.Buffer) -> bool:
+        # mirrors are attached explicitly via `get()`
+        return False
+
+    @classmethod
+    def get(cls, view: sublime.View) -> BufferMirror:
+        """
+        Get the mirror of a view's buffer, creating a new one if required.
+        Called on any thread.
+
+        A new mirror is attached to the buffer on UI thread and syncs with it
+        in background. Use `wait()` to get a snapshot, which is in sync.
+
+        :param view:
+            The view whose buffer to mirror.
+
+        :returns:
+            The mirror.
+        """
+        buffer = view.buffer()
+        with _lock:
+            mirror = cls.mirrors.get(buffer.buffer_id)
+            if mirror is not None:
+                return mirror
+            mirror = cls.mirrors[buffer.buffer_id] = cls(buffer)
+        # `sublime_plugin`'s listener registries are owned by UI thread
+        sublime.set_timeout(mirror._attach)
+        return mirror
+
+    @classmethod
+    def release_closed(cls) -> None:
+        """
+        Release mirrors of buffers, whose last view has been closed. Called on UI thread.
+        """
+        with _lock:
+            mirrors = list(cls.mirrors.values())
+        for mirror in mirrors:
+            if not mirror._buffer.primary_view().is_valid():
+                mirror.release()
+
+    def release(self) -> None:
+        """
+        Stop mirroring the buffer. Called on any thread.
+        """
+        with _lock:
+            if self.mirrors.get(self._buffer.buffer_id) is self:
+                del self.mirrors[self._buffer.buffer_id]
+        sublime.set_timeout(self._detach)
+
+    def _attach(self) -> None:
+        # released before being attached
+        if self.mirrors.get(self._buffer.buffer_id) is not self:
+            return
+        self.attach(self._buffer)
+        # events queued after this one, but contained in synced text are skipped
+        _TextChangeQueue.of(self).push("on_revert", BufferMirror.on_revert.__wrapped__, ())
+
+    def _detach(self) -> None:
+        if self.is_attached():
+            self.detach()
+
+    def snapshot(self) -> BufferSnapshot:
+        """
+        :returns: The most recent snapshot. It may be behind the buffer.
+        """
+        return self._snapshot
+
+    async def wait(self, change_count: int | None = None) -> BufferSnapshot:
+        """
+        Wait for the mirror to reflect at least the given change count.
+
+        :param change_count:
+            The change count to wait for. Defaults to the view's current one.
+
+        :returns: The snapshot.
+        """
+        if change_count is None:
+            change_count = self._buffer.primary_view().change_count()
+        if self._snapshot.change_count >= change_count:
+            return self._snapshot
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append((change_count, fut))
+        return await fut
+
+    def on_text_changed(self, changes: list[sublime.TextChange]) -> None:
+        """:meta private:"""
+        # called on UI thread, when the view's change count matches `changes`
+        change_count = self._buffer.primary_view().change_count()
+        _TextChangeQueue.of(self).push(
+            "on_text_changed", BufferMirror._apply, ([(change_count, changes)],)
+        )
+
+    async def on_revert(self) -> None:
+        """:meta private:"""
+        self._sync()
+
+    async def on_reload(self) -> None:
+        """:meta private:"""
+        self._sync()
+
+    async def _apply(self, batches: list[tuple[int, list[sublime.TextChange]]]) -> None:
+        snapshot = self._snapshot
+        for change_count, changes in batches:
+            # already part of synced text
+            if change_count <= snapshot.change_count:
+                continue
+            for change in changes:
+                snapshot = snapshot.replace(change.a.pt, change.b.pt, change.str, change_count)
+        self._snapshot = snapshot
+
+        # verify, if there's nothing left to catch up with
+        view = self._buffer.primary_view()
+        if (
+            not _TextChangeQueue.of(self).events
+            and view.change_count() == snapshot.change_count
+            and view.size() != len(snapshot)
+        ):
+            self._sync()
+        else:
+            self._notify()
+
+    def _sync(self) -> None:
+        view = self._buffer.primary_view()
+        while True:
+            change_count = view.change_count()
+            text = view.substr(sublime.Region(0, view.size()))
+            if view.change_count() == change_count:
+                break
+        self._snapshot = BufferSnapshot.from_text(text, change_count)
+        self._notify()
+
+    def _notify(self) -> None:
+        change_count = self._snapshot.change_count
+        waiters = []
+        for waiter in self._waiters:
+            if waiter[0] <= change_count:
+                if not waiter[1].done():
+                    waiter[1].set_result(self._snapshot)
+            else:
+                waiters.append(waiter)
+        self._waiters = waiters
 
 
 class InputCancelledError(Exception):
@@ -550,6 +3013,9 @@ class Window(sublime.Window):
     This class describes an extended `sublime.Window`.
 
     It overrides some methods with coroutines.
+
+    Windows returned by this module are interned, so there's only one
+    instance per window.
     """
 
     def active_view(self) -> View | None:
@@ -560,7 +3026,7 @@ class Window(sublime.Window):
         if view_id == 0:
             return None
         else:
-            return View(view_id)
+            return _view(view_id)
 
     def new_file(self, flags=sublime.NewFileFlags.NONE, syntax="") -> View:
         """
@@ -570,7 +3036,7 @@ class Window(sublime.Window):
         :param syntax: The name of the syntax to apply to the file.
         :returns: The view for the file.
         """
-        return View(sublime_api.window_new_file(self.window_id, flags, syntax))
+        return _view(sublime_api.window_new_file(self.window_id, flags, syntax))
 
     def open_file(self, fname: str, flags=sublime.NewFileFlags.NONE, group=-1) -> View:
         """
@@ -583,7 +3049,7 @@ class Window(sublime.Window):
         :param flags: `NewFileFlags`
         :param group: The group to add the sheet to. ``-1`` for the active group.
         """
-        return View(sublime_api.window_open_file(self.window_id, fname, flags, group))
+        return _view(sublime_api.window_open_file(self.window_id, fname, flags, group))
 
     def find_open_file(self, fname: str, group=-1) -> View | None:
         """
@@ -598,7 +3064,7 @@ class Window(sublime.Window):
         if view_id == 0:
             return None
         else:
-            return View(view_id)
+            return _view(view_id)
 
     def views(self, *, include_transient: bool=False) -> list[View]:
         """
@@ -608,7 +3074,7 @@ class Window(sublime.Window):
         :returns: All open sheets in the window.
         """
         view_ids = sublime_api.window_views(self.window_id, include_transient)
-        return [View(x) for x in view_ids]
+        return [_view(x) for x in view_ids]
 
     def active_view_in_group(self, group: int) -> View | None:
         """
@@ -618,14 +3084,14 @@ class Window(sublime.Window):
         if view_id == 0:
             return None
         else:
-            return View(view_id)
+            return _view(view_id)
 
     def views_in_group(self, group: int) -> list[View]:
         """
         :returns: A list of all views in the specified group.
         """
         view_ids = sublime_api.window_views_in_group(self.window_id, group)
-        return [View(x) for x in view_ids]
+        return [_view(x) for x in view_ids]
 
     def transient_view_in_group(self, group: int) -> View | None:
         """
@@ -633,7 +3099,7 @@ class Window(sublime.Window):
         """
         view_id = sublime_api.window_transient_view_in_group(self.window_id, group)
         if view_id != 0:
-            return View(view_id)
+            return _view(view_id)
         else:
             return None
 
@@ -647,7 +3113,8 @@ class Window(sublime.Window):
         :param name: The name of the output panel.
         :param unlisted: Control if the output panel should be listed in the panel switcher.
         """
-        return View(sublime_api.window_create_output_panel(self.window_id, name, unlisted, None)[0])
+        view_id = sublime_api.window_create_output_panel(self.window_id, name, unlisted, None)[0]
+        return _view(view_id)
 
     def find_output_panel(self, name: str) -> View | None:
         """
@@ -656,7 +3123,7 @@ class Window(sublime.Window):
             the output panel does not exist.
         """
         view_id, _ = sublime_api.window_find_output_panel(self.window_id, name)
-        return View(view_id) if view_id else None
+        return _view(view_id) if view_id else None
 
     async def show_input_panel(
         self,
@@ -677,7 +3144,7 @@ class Window(sublime.Window):
 
         def change(text: str) -> None:
             if view is not None:
-                run_coroutine(on_change(view, text))
+                run_coroutine(on_change(view, text), lane="interactive")
 
         view = super().show_input_panel(
             caption=caption,
@@ -687,7 +3154,8 @@ class Window(sublime.Window):
             on_cancel=cancel,
         )
 
-        return await fut
+        with _lanes.suspended():
+            return await fut
 
     async def show_quick_panel(
         self,
@@ -700,7 +3168,7 @@ class Window(sublime.Window):
         fut = asyncio.Future()
 
         def highlight(index):
-            run_coroutine(on_highlight(index))
+            run_coroutine(on_highlight(index), lane="interactive")
 
         def select(index):
             if _loop:
@@ -718,10 +3186,17 @@ class Window(sublime.Window):
             on_select=select,
         )
 
-        return await fut
+        with _lanes.suspended():
+            return await fut
 
 
 class View(sublime.View):
+    """
+    This class describes an extended `sublime.View`.
+
+    Views returned by this module are interned, so there's only one
+    instance per view.
+    """
 
     def window(self) -> Window | None:
         """
@@ -731,8 +3206,8 @@ class View(sublime.View):
         if window_id == 0:
             return None
         else:
-            return Window(window_id)
+            return _window(window_id)
 
     def clones(self) -> list[View]:
         """ :returns: All the other views into the same `Buffer`. See `View`. """
-        return list(map(View, sublime_api.view_clones(self.view_id)))
+        return list(map(_view, sublime_api.view_clones(self.view_id)))
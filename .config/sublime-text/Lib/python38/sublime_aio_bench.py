@@ -0,0 +1,1207 @@
+"""
+Micro-benchmarks for `sublime_aio`.
+
+Runs inside ST's plugin host or stand-alone with a plain python 3.8+,
+in which case minimal fakes of ST's API modules are installed.
+
+Usage:
+
+```sh
+python3 sublime_aio_bench.py                    # run all benchmarks
+python3 sublime_aio_bench.py dispatch debounce  # run `bench_dispatch()` and `bench_debounce()`
+```
+"""
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+import types
+from threading import Lock
+
+
+# ---- [ fake ST API ] --------------------------------------------------------
+
+
+def install_fakes() -> None:
+    """
+    Install minimal `sublime`, `sublime_api` and `sublime_plugin` modules,
+    if not running within ST's plugin host.
+    """
+    try:
+        import sublime_api  # noqa: F401
+
+        return
+    except ImportError:
+        pass
+
+    sublime = types.ModuleType("sublime")
+    sublime_api = types.ModuleType("sublime_api")
+    sublime_plugin = types.ModuleType("sublime_plugin")
+
+    closed: set[int] = set()
+    closed_windows: set[int] = set()
+
+    class Region:
+        def __init__(self, a, b=None):
+            self.a = a
+            self.b = a if b is None else b
+
+        def begin(self):
+            return min(self.a, self.b)
+
+        def end(self):
+            return max(self.a, self.b)
+
+    class HistoricPosition:
+        def __init__(self, pt):
+            self.pt = pt
+
+    class TextChange:
+        def __init__(self, a, b, text):
+            self.a = HistoricPosition(a)
+            self.b = HistoricPosition(b)
+            self.str = text
+
+    class Buffer:
+        def __init__(self, view):
+            self.buffer_id = view.view_id
+            self.view = view
+            self.listeners = []
+
+        def primary_view(self):
+            return self.view
+
+    class Selection:
+        def __init__(self, id):
+            self.view_id = id
+
+    class View:
+        def __init__(self, id, text=""):
+            self.view_id = id
+            # like the real one
+            self.selection = Selection(id)
+            self.settings_object = None
+            self.changes = 0
+            self.text = text
+            self.buf = Buffer(self)
+
+        def id(self):
+            return self.view_id
+
+        def is_valid(self):
+            return self.view_id not in closed
+
+        def change_count(self):
+            return self.changes
+
+        def buffer(self):
+            return self.buf
+
+        def size(self):
+            return len(self.text)
+
+        def substr(self, region):
+            # text is serialized to cross into plugin host process
+            return self.text[region.begin() : region.end()].encode().decode()
+
+        def window(self):
+            return None
+
+        def run_command(self, cmd, args=None):
+            if cmd == "append":
+                self.text += args["characters"]
+
+        def edit(self, a, b, text):
+            """Replace text and notify text change listeners, like typing does."""
+            self.text = self.text[:a] + text + self.text[b:]
+            self.changes += 1
+            for listener in self.buf.listeners:
+                listener.on_text_changed([TextChange(a, b, text)])
+
+    class Window:
+        def __init__(self, id):
+            self.window_id = id
+            self.settings_object = None
+            self.template_settings_object = None
+            self.panels = {}
+
+        def id(self):
+            return self.window_id
+
+        def is_valid(self):
+            return self.window_id not in closed_windows
+
+        def create_output_panel(self, name, unlisted=False):
+            panel = self.panels[name] = View(-len(self.panels) - 1)
+            return panel
+
+        def run_command(self, cmd, args=None):
+            pass
+
+    class Settings:
+        def __init__(self):
+            self.values = {}
+            self.observers = {}
+            self.reads = 0
+
+        def get(self, key, default=None):
+            self.reads += 1
+            return self.values.get(key, default)
+
+        def set(self, key, value):
+            """Set a value and notify observers, like ST does for each write."""
+            self.values[key] = value
+            for callback in list(self.observers.values()):
+                callback()
+
+        def to_dict(self):
+            self.reads += 1
+            return dict(self.values)
+
+        def add_on_change(self, tag, callback):
+            self.observers[tag] = callback
+
+        def clear_on_change(self, tag):
+            self.observers.pop(tag, None)
+
+    settings_files: dict[str, Settings] = {}
+
+    class CompletionList:
+        def __init__(self, completions=None, flags=0):
+            self.completions = completions
+            self.flags = flags
+
+        def set_completions(self, completions, flags=0):
+            self.completions = completions
+            self.flags = flags
+
+    class Flags:
+        NONE = 0
+        DYNAMIC_COMPLETIONS = 32
+
+    sublime.Region = Region
+    sublime.View = View
+    sublime.Window = Window
+    sublime.CompletionList = CompletionList
+    sublime.NewFileFlags = Flags
+    sublime.QuickPanelFlags = Flags
+    sublime.AutoCompleteFlags = Flags
+    sublime.set_timeout = lambda callback, delay=0: callback()
+    sublime.load_settings = lambda name: settings_files.setdefault(name, Settings())
+    sublime.active_window = lambda: active_window
+    active_window = Window(1)
+    sublime.closed_views = closed
+    sublime.closed_windows = closed_windows
+
+    class Listener:
+        pass
+
+    class ViewEventListener:
+        def __init__(self, view):
+            self.view = view
+
+    sublime_plugin.EventListener = Listener
+    sublime_plugin.ViewEventListener = ViewEventListener
+    class TextChangeListener:
+        def __init__(self):
+            self.buffer = None
+
+        @classmethod
+        def is_applicable(cls, buffer):
+            return True
+
+        def attach(self, buffer):
+            self.buffer = buffer
+            buffer.listeners.append(self)
+
+        def detach(self):
+            self.buffer.listeners.remove(self)
+            self.buffer = None
+
+        def is_attached(self):
+            return self.buffer is not None
+
+    sublime_plugin.TextChangeListener = TextChangeListener
+    sublime_plugin.ApplicationCommand = Listener
+    sublime_plugin.WindowCommand = Listener
+    sublime_plugin.TextCommand = Listener
+    sublime_plugin.all_callbacks = {
+        "on_modified": [],
+        "on_selection_modified": [],
+        "on_hover": [],
+        "on_close": [],
+        "on_pre_close_window": [],
+        "on_query_completions": [],
+    }
+    sublime_plugin.text_change_listener_callbacks = {"on_text_changed", "on_revert", "on_reload"}
+
+    sublime_api.window_views = lambda window_id, include_transient: list(range(1, 501))
+    sublime_api.view_clones = lambda view_id: []
+
+    sys.modules["sublime"] = sublime
+    sys.modules["sublime_api"] = sublime_api
+    sys.modules["sublime_plugin"] = sublime_plugin
+
+
+install_fakes()
+
+import sublime  # noqa: E402
+import sublime_plugin  # noqa: E402
+
+IMPORT_START = time.perf_counter()
+import sublime_aio  # noqa: E402
+
+IMPORT_TIME = time.perf_counter() - IMPORT_START
+IMPORT_THREADS = threading.active_count()
+
+
+# ---- [ helpers ] ------------------------------------------------------------
+
+
+class WakeupCounter:
+    """
+    Count iterations of an event loop, which handled at least one callback.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.count = 0
+        self.run_once = loop._run_once  # type: ignore[attr-defined]
+
+    def __enter__(self) -> WakeupCounter:
+        def run_once():
+            self.run_once()
+            self.count += 1
+
+        # the loop thread looks up `_run_once` on every iteration
+        self.loop._run_once = run_once  # type: ignore[attr-defined]
+        return self
+
+    def __exit__(self, *exc) -> None:
+        del self.loop._run_once  # type: ignore[attr-defined]
+
+
+def percentiles(samples: list[float]) -> str:
+    """
+    :returns: The p50, p90, p99 and maximum of `samples` in milliseconds.
+    """
+    samples = sorted(samples)
+    return "p50 {:.2f} ms, p90 {:.2f} ms, p99 {:.2f} ms, max {:.2f} ms".format(
+        samples[len(samples) // 2] * 1000,
+        samples[len(samples) * 9 // 10] * 1000,
+        samples[len(samples) * 99 // 100] * 1000,
+        samples[-1] * 1000,
+    )
+
+
+def type_burst(handler, listener, view, keystrokes: int, interval: float) -> float:
+    """
+    Simulate typing by calling `handler` from this (UI) thread.
+
+    :returns: The time spent in `handler` in seconds.
+    """
+    spent = 0.0
+    for _ in range(keystrokes):
+        start = time.perf_counter()
+        handler(listener, view)
+        spent += time.perf_counter() - start
+        time.sleep(interval)
+    return spent
+
+
+def legacy_debounced(delay_in_ms: int):
+    """
+    The lock and `asyncio.sleep()` based debouncer of sublime_aio 0.1.6.
+    """
+
+    def decorator(coro_func):
+        call_at: dict[int, float] = {}
+        lock = Lock()
+
+        async def debounce(view, coro_func, self, *args):
+            while True:
+                with lock:
+                    time_to_wait = delay_in_ms / 1000 + call_at[view.view_id] - time.monotonic()
+                    if time_to_wait <= 0:
+                        del call_at[view.view_id]
+                        break
+
+                await asyncio.sleep(time_to_wait)
+
+            if view.is_valid():
+                await coro_func(self, *args)
+
+        def wrapper(self, *args):
+            view = args[0]
+            with lock:
+                if view.view_id in call_at:
+                    call_at[view.view_id] = time.monotonic()
+                    return
+                call_at[view.view_id] = time.monotonic()
+
+            asyncio.run_coroutine_threadsafe(
+                debounce(view, coro_func, self, *args), loop=sublime_aio._get_loop()
+            )
+
+        return wrapper
+
+    return decorator
+
+
+# ---- [ benchmarks ] ---------------------------------------------------------
+
+
+def bench_debounce(keystrokes: int = 100, interval: float = 0.02, delay_in_ms: int = 100) -> None:
+    """
+    Count event loop wakeups caused by debouncing a burst of keystrokes.
+    """
+    loop = sublime_aio._get_loop()
+    assert loop
+
+    print(
+        "wakeups per {} keystrokes ({:.0f} ms apart, {} ms delay):".format(
+            keystrokes, interval * 1000, delay_in_ms
+        )
+    )
+
+    variants = (
+        ("legacy debounced", legacy_debounced(delay_in_ms)),
+        ("debounced", sublime_aio.debounced(delay_in_ms)),
+        ("debounced max_wait", sublime_aio.debounced(delay_in_ms, max_wait=delay_in_ms * 5)),
+        ("throttled", sublime_aio.throttled(delay_in_ms)),
+    )
+    for view_id, (name, decorator) in enumerate(variants, 1):
+        calls = []
+
+        async def on_modified(self, view):
+            calls.append(view.view_id)
+
+        handler = decorator(on_modified)
+        view = sublime.View(view_id)
+
+        with WakeupCounter(loop) as counter:
+            spent = type_burst(handler, None, view, keystrokes, interval)
+            time.sleep(delay_in_ms / 1000 * 3)
+
+        print(
+            "  {:<20} {:>4} wakeups {:>4} calls {:>8.1f} us/event on UI thread".format(
+                name, counter.count, len(calls), spent / keystrokes * 1e6
+            )
+        )
+
+
+def bench_completions(queries: int = 200, query_time: float = 0.01) -> None:
+    """
+    Measure completion latency of two split views typing alternately.
+
+    Each view types a word character by character, so all but the first query
+    per word extend a previous prefix.
+    """
+
+    class Listener(sublime_aio.EventListener):
+        async def on_query_completions(self, view, prefix, locations):
+            await asyncio.sleep(query_time)
+            return ["{}_{}".format(word, i) for word in WORDS for i in range(20)]
+
+    listener = Listener()
+    views = (sublime.View(101), sublime.View(102))
+    latencies = []
+    for n in range(queries):
+        view = views[n % 2]
+        word = WORDS[n // 8 % len(WORDS)]
+        prefix = word[: n // 2 % 4 + 1]
+        view.changes += 1
+        start = time.perf_counter()
+        clist = listener.on_query_completions(view, prefix, [100 + len(prefix)])
+        while clist.completions is None:
+            time.sleep(0.0005)
+        latencies.append(time.perf_counter() - start)
+
+    print(
+        "completions in 2 split views, {} queries ({:.0f} ms per query):".format(
+            queries, query_time * 1000
+        )
+    )
+    print("  " + percentiles(latencies))
+
+
+def bench_latest(keystrokes: int = 10, interval: float = 0.005, steps: int = 20) -> None:
+    """
+    Measure work spent by an `on_modified` handler of 20 x 1 ms CPU bound steps
+    for a burst of keystrokes, which arrive faster than the handler completes.
+    """
+
+    async def handler(self, view):
+        for _ in range(steps):
+            end = time.perf_counter() + 0.001
+            while time.perf_counter() < end:
+                pass
+            stats["steps"] += 1
+            await asyncio.sleep(0)
+        stats["completed"] += 1
+
+    class PlainListener(sublime_aio.EventListener):
+        on_modified = handler
+
+    class LatestListener(sublime_aio.EventListener):
+        on_modified = sublime_aio.latest(handler)
+
+    print(
+        "on_modified of {} ms per {} keystrokes ({:.0f} ms apart):".format(
+            steps, keystrokes, interval * 1000
+        )
+    )
+    variants = (("plain", PlainListener()), ("latest", LatestListener()))
+    for view_id, (name, listener) in enumerate(variants, 201):
+        stats = {"steps": 0, "completed": 0}
+        view = sublime.View(view_id)
+        for _ in range(keystrokes):
+            view.changes += 1
+            listener.on_modified(view)
+            time.sleep(interval)
+        time.sleep(keystrokes * steps / 1000 + 0.1)
+        print(
+            "  {:<8} {:>4} ms CPU {:>3} completed".format(name, stats["steps"], stats["completed"])
+        )
+
+
+def bench_text_changes(
+    keystrokes: int = 200, interval: float = 0.001, handler_time: float = 0.005
+) -> None:
+    """
+    Count `on_text_changed` calls and peak number of loop tasks for fast typing
+    into a buffer, whose listener needs more time per call than typing takes,
+    and the backlog of a listener, which stalls.
+    """
+    stats = {"calls": 0, "tasks": 0}
+    seen = []
+
+    class Listener(sublime_aio.TextChangeListener):
+        async def on_text_changed(self, changes):
+            stats["calls"] += 1
+            seen.extend(changes)
+            await asyncio.sleep(handler_time)
+
+    loop = sublime_aio._get_loop()
+    assert loop
+    listener = Listener()
+    for n in range(keystrokes):
+        listener.on_text_changed([n])
+        if n % 10 == 0:
+            stats["tasks"] = max(stats["tasks"], len(asyncio.all_tasks(loop)))
+        time.sleep(interval)
+    time.sleep(handler_time * 10)
+
+    print(
+        "on_text_changed of {:.0f} ms per {} keystrokes ({:.0f} ms apart):".format(
+            handler_time * 1000, keystrokes, interval * 1000
+        )
+    )
+    print(
+        "  {} calls, {} changes {}, peak {} tasks".format(
+            stats["calls"],
+            len(seen),
+            "in order" if seen == list(range(keystrokes)) else "OUT OF ORDER",
+            stats["tasks"],
+        )
+    )
+
+    # A handler raising CancelledError itself must not stop the queue.
+    delivered = []
+
+    class CancellingListener(sublime_aio.TextChangeListener):
+        async def on_text_changed(self, changes):
+            delivered.extend(changes)
+            if changes == [0]:
+                raise asyncio.CancelledError
+
+    listener = CancellingListener()
+    listener.on_text_changed([0])
+    time.sleep(0.05)
+    for n in range(1, 4):
+        listener.on_text_changed([n])
+    time.sleep(0.05)
+    print("  {} of 4 changes delivered after a handler cancelled itself".format(len(delivered)))
+
+    # A stalled handler without `on_revert` gets a single resync instead of a backlog.
+    calls = []
+    peak = 0
+
+    class StalledListener(sublime_aio.TextChangeListener):
+        high_water_mark = 50
+
+        async def on_text_changed(self, changes):
+            calls.append(changes)
+            if len(calls) == 1:
+                await asyncio.sleep(0.2)
+
+    listener = StalledListener()
+    queue = sublime_aio._TextChangeQueue.of(listener)
+    listener.on_text_changed([0])
+    time.sleep(0.05)
+    for n in range(1, keystrokes * 10):
+        listener.on_text_changed([n])
+        peak = max(peak, len(queue.events))
+    time.sleep(0.3)
+    print(
+        "  {} changes while the handler stalls: peak {} queued, then {} calls, resynced: {}".format(
+            keystrokes * 10, peak, len(calls), calls == [[0], None]
+        )
+    )
+
+
+def bench_mirror(size: int = 5_000_000, keystrokes: int = 200) -> None:
+    """
+    Compare reading a large buffer per keystroke via `View.substr` with
+    reading a `BufferMirror` snapshot, including the time to update the mirror,
+    and count mirrors kept after the view is closed.
+    """
+    view = sublime.View(301, "0123456789abcdef\n" * (size // 17))
+    mirror = sublime_aio.BufferMirror.get(view)
+    sublime_aio.run_coroutine(mirror.wait()).result()
+
+    substr = snapshot = 0.0
+    for n in range(keystrokes):
+        view.edit(size // 2 + n, size // 2 + n, "x")
+
+        start = time.perf_counter()
+        text = view.substr(sublime.Region(0, view.size()))
+        substr += time.perf_counter() - start
+
+        start = time.perf_counter()
+        snap = sublime_aio.run_coroutine(mirror.wait(view.change_count())).result()
+        snap.substr(size // 2, size // 2 + 1000)
+        snapshot += time.perf_counter() - start
+
+    assert str(snap) == text
+
+    # the mirror is dropped with the buffer's last view
+    sublime.closed_views.add(view.view_id)
+    for listener in sublime_plugin.all_callbacks["on_close"]:
+        listener.on_close(view)
+    print("reading a {:.0f} MB buffer per keystroke:".format(size / 1e6))
+    print("  View.substr     {:>8.1f} us".format(substr / keystrokes * 1e6))
+    print("  BufferMirror    {:>8.1f} us".format(snapshot / keystrokes * 1e6))
+    print(
+        "  {} mirrors kept, {} listeners attached after closing the view".format(
+            len(sublime_aio.BufferMirror.mirrors), len(view.buf.listeners)
+        )
+    )
+
+
+def bench_to_thread(calls: int = 20, io_time: float = 0.02) -> None:
+    """
+    Measure event loop lag while another coroutine performs blocking I/O,
+    directly or via `to_thread()`.
+    """
+
+    async def probe(stop: asyncio.Event) -> float:
+        lag = 0.0
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lag = max(lag, time.perf_counter() - start - 0.001)
+        return lag
+
+    async def blocking_io(offload: bool) -> float:
+        stop = asyncio.Event()
+        lag = asyncio.ensure_future(probe(stop))
+        for _ in range(calls):
+            if offload:
+                await sublime_aio.to_thread(time.sleep, io_time)
+            else:
+                time.sleep(io_time)
+                await asyncio.sleep(0)
+        stop.set()
+        return await lag
+
+    print("loop lag during {} blocking calls of {:.0f} ms:".format(calls, io_time * 1000))
+    for name, offload in (("direct", False), ("to_thread", True)):
+        lag = sublime_aio.run_coroutine(blocking_io(offload)).result()
+        print("  {:<10} max lag {:>6.1f} ms".format(name, lag * 1000))
+    stats = sublime_aio.pool_stats()["io"]
+    print(
+        "  io pool: {completed} completed, wait avg {wait_avg_ms:.2f} ms, "
+        "run avg {run_avg_ms:.1f} ms".format(**stats)
+    )
+
+
+def bench_on_ui(events: int = 20, calls: int = 50) -> None:
+    """
+    Count UI thread hops of an event handler, which makes many UI calls concurrently,
+    each one dispatched via `sublime.set_timeout()` or via `on_ui()`.
+    """
+    hops = [0]
+    set_timeout = sublime.set_timeout
+
+    def counting_set_timeout(callback, delay=0):
+        hops[0] += 1
+        set_timeout(callback, delay)
+
+    async def naive_on_ui(fn, *args):
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+
+        def run():
+            result = fn(*args)
+            loop.call_soon_threadsafe(fut.set_result, result)
+
+        sublime.set_timeout(run)
+        return await fut
+
+    async def handler(call_on_ui):
+        await asyncio.gather(*(call_on_ui(pow, n, 2) for n in range(calls)))
+
+    print("UI thread hops for {} events with {} UI calls each:".format(events, calls))
+    sublime.set_timeout = counting_set_timeout
+    try:
+        for name, call_on_ui in (("set_timeout", naive_on_ui), ("on_ui", sublime_aio.on_ui)):
+            hops[0] = 0
+            start = time.perf_counter()
+            for _ in range(events):
+                sublime_aio.run_coroutine(handler(call_on_ui)).result()
+            elapsed = time.perf_counter() - start
+            print(
+                "  {:<12} {:>5} hops {:>8.1f} us/event".format(
+                    name, hops[0], elapsed / events * 1e6
+                )
+            )
+    finally:
+        sublime.set_timeout = set_timeout
+
+
+def lifecycle(scenario: str) -> None:
+    """
+    Measure startup and shutdown of a fresh `sublime_aio` in this process.
+
+    Scenarios:
+
+    - ``idle``: no coroutine is ever run
+    - ``cooperative``: 10 tasks, which need 50 ms to clean up when cancelled
+    - ``stubborn``: a task, which ignores cancellation
+    - ``blocked``: a callback, which blocks the loop for 5 s
+    """
+    print("  {:<12}".format(scenario), end="")
+    print(" import {:>6.2f} ms, {} thread(s)".format(IMPORT_TIME * 1000, IMPORT_THREADS), end="")
+    cleaned = []
+
+    async def cooperative():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.05)
+            cleaned.append(1)
+            raise
+
+    async def stubborn():
+        while True:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                pass
+
+    async def blocked():
+        time.sleep(5)
+
+    if scenario != "idle":
+        start = time.perf_counter()
+        sublime_aio.run_coroutine(asyncio.sleep(0)).result()
+        print(", first use {:>6.2f} ms".format((time.perf_counter() - start) * 1000), end="")
+        coro_func, count = {
+            "cooperative": (cooperative, 10),
+            "stubborn": (stubborn, 1),
+            "blocked": (blocked, 1),
+        }[scenario]
+        for _ in range(count):
+            sublime_aio.run_coroutine(coro_func())
+        time.sleep(0.05)
+
+    start = time.perf_counter()
+    sublime_aio.on_exit()
+    print(", exit {:>7.1f} ms".format((time.perf_counter() - start) * 1000), end="")
+    if scenario == "cooperative":
+        print(", {} cleaned up".format(len(cleaned)), end="")
+    print()
+
+
+def bench_lifecycle() -> None:
+    """
+    Run `lifecycle()` scenarios in child processes.
+    """
+    print("startup and shutdown (1 s timeout):")
+    for scenario in ("idle", "cooperative", "stubborn", "blocked"):
+        subprocess.run([sys.executable, __file__, "lifecycle", scenario], check=True)
+
+
+def bench_wrappers(views: int = 500, rounds: int = 200) -> None:
+    """
+    Measure `Window.views()` of a window with 500 views, creating a fresh
+    `View` per id or using interned wrappers.
+    """
+    import tracemalloc
+
+    window = sublime_aio._window(1)
+    view_ids = list(range(1, views + 1))
+    variants = (
+        ("fresh", lambda: [sublime_aio.View(x) for x in view_ids]),
+        ("interned", window.views),
+    )
+    print("Window.views() of {} views:".format(views))
+    for name, func in variants:
+        keep = func()
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        func()
+        allocated = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            "  {:<10} {:>8.1f} us/call {:>8} bytes peak/call, identical: {}".format(
+                name, elapsed / rounds * 1e6, allocated, func()[0] is keep[0]
+            )
+        )
+
+
+def bench_processes(runs: int = 40) -> None:
+    """
+    Compare formatter-like runs of `cat` via `subprocess.run()` in `to_thread()`
+    with `run_process()`, streaming into an output panel.
+    """
+    text = "x = 1\n" * 10000
+    sublime_aio.set_process_limit(8)
+
+    async def threaded():
+        return await sublime_aio.to_thread(
+            subprocess.run, ["cat"], input=text, capture_output=True, text=True
+        )
+
+    async def native():
+        return await sublime_aio.run_process(["cat"], stdin=text, panel="bench")
+
+    async def run_all(func):
+        results = await asyncio.gather(*(func() for _ in range(runs)))
+        assert all(result.stdout == text for result in results)
+
+    print("{} concurrent runs of `cat` with {} kB stdin:".format(runs, len(text) // 1000))
+    for name, func in (("to_thread", threaded), ("run_process", native)):
+        start = time.perf_counter()
+        sublime_aio.run_coroutine(run_all(func)).result()
+        print("  {:<12} {:>7.1f} ms".format(name, (time.perf_counter() - start) * 1000))
+    panel = sublime.active_window().panels["bench"]
+    assert panel.text == text, "panel got {} chars".format(len(panel.text))
+
+
+def bench_cached(events: int = 20, handlers: int = 3, index_time: float = 0.01) -> None:
+    """
+    Count symbol indexing runs of 3 handlers (hover, completions, highlighting)
+    needing the same index on each of 20 modifications, without and with `cached()`.
+    """
+    runs = {"plain": 0, "cached": 0}
+
+    async def plain(view):
+        runs["plain"] += 1
+        await asyncio.sleep(index_time)
+        return view.change_count()
+
+    @sublime_aio.cached(maxsize=8)
+    async def cached(view):
+        runs["cached"] += 1
+        await asyncio.sleep(index_time)
+        return view.change_count()
+
+    async def modify(view, index):
+        view.changes += 1
+        results = await asyncio.gather(*(index(view) for _ in range(handlers)))
+        assert results == [view.changes] * handlers
+        # an unmodified view is answered from cache
+        await asyncio.gather(*(index(view) for _ in range(handlers)))
+
+    print("{} modifications with {} handlers indexing each:".format(events, handlers))
+    for view_id, (name, index) in enumerate((("plain", plain), ("cached", cached)), 401):
+        view = sublime.View(view_id)
+        start = time.perf_counter()
+        for _ in range(events):
+            sublime_aio.run_coroutine(modify(view, index)).result()
+        print(
+            "  {:<7} {:>4} index runs {:>7.1f} ms".format(
+                name, runs[name], (time.perf_counter() - start) * 1000
+            )
+        )
+    print("  stats: {}".format(cached.stats()))  # type: ignore[attr-defined]
+
+
+def bench_lanes(requests: int = 30, interval: float = 0.02, jobs: int = 8) -> None:
+    """
+    Measure latency of completion requests of 5 steps while 8 indexing jobs
+    of 2 ms CPU bound chunks run in the normal or background lane.
+    """
+    stop = threading.Event()
+
+    async def index():
+        while not stop.is_set():
+            end = time.perf_counter() + 0.002
+            while time.perf_counter() < end:
+                pass
+            await sublime_aio.checkpoint()
+
+    async def complete():
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    print("completion latency with {} indexing jobs running:".format(jobs))
+    for lane in ("none", "normal", "background"):
+        stop.clear()
+        if lane != "none":
+            for _ in range(jobs):
+                sublime_aio.run_coroutine(index(), lane=lane)
+        latencies = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            sublime_aio.run_coroutine(complete(), lane="interactive").result()
+            latencies.append(time.perf_counter() - start)
+            time.sleep(interval)
+        stop.set()
+        time.sleep(0.05)
+        latencies.sort()
+        print(
+            "  {:<11} p50 {:>6.2f} ms  p99 {:>6.2f} ms".format(
+                lane, latencies[len(latencies) // 2] * 1000, latencies[-1] * 1000
+            )
+        )
+
+
+def bench_settings(plugins: int = 5, writes: int = 30, settle_ms: int = 50) -> None:
+    """
+    Count observer calls and settings reloads of 5 plugins watching "Preferences",
+    while a burst of 30 key writes arrives, like switching a color scheme does.
+    """
+    settings = sublime.load_settings("Preferences.sublime-settings")
+    settings.values.update(color_scheme="Mariana", theme="Default", font_size=10)
+
+    def burst():
+        for index in range(writes):
+            settings.set("font_size", 10 + index % 3)
+        settings.set("color_scheme", "Monokai")
+        settings.set("font_size", 10)
+
+    print("{} plugins observing a burst of {} settings writes:".format(plugins, writes + 2))
+
+    # every plugin registers an observer and reloads its keys on each call
+    calls = 0
+
+    def make_observer():
+        def on_change():
+            nonlocal calls
+            calls += 1
+            {key: settings.get(key) for key in ("color_scheme", "theme")}
+
+        return on_change
+
+    for index in range(plugins):
+        settings.add_on_change("plugin{}".format(index), make_observer())
+    settings.reads = 0
+    burst()
+    print(
+        "  add_on_change     {:>4} observer calls {:>4} loop hops {:>4} reads".format(
+            calls, calls, settings.reads
+        )
+    )
+    for index in range(plugins):
+        settings.clear_on_change("plugin{}".format(index))
+
+    settings.values["color_scheme"] = "Mariana"
+    snapshots = []
+
+    async def watch():
+        async for snapshot in sublime_aio.settings_changes(
+            "Preferences", keys=["color_scheme", "theme"], settle_ms=settle_ms
+        ):
+            snapshots.append(snapshot)
+
+    loop = sublime_aio._get_loop()
+    assert loop
+    tasks = [sublime_aio.run_coroutine(watch()) for _ in range(plugins)]
+    time.sleep(0.05)
+    watch = sublime_aio._SettingsWatch.watches["Preferences.sublime-settings"]
+    observer = settings.observers[watch.TAG]
+    notify = watch.notify
+    calls = hops = 0
+
+    def counted_observer():
+        nonlocal calls
+        calls += 1
+        observer()
+
+    def counted_notify():
+        nonlocal hops
+        hops += 1
+        notify()
+
+    settings.observers[watch.TAG] = counted_observer
+    watch.notify = counted_notify  # type: ignore[method-assign]
+    settings.reads = 0
+    burst()
+    time.sleep(settle_ms / 1000 * 3)
+    # unrelated writes don't deliver snapshots
+    settings.set("font_size", 12)
+    time.sleep(settle_ms / 1000 * 3)
+    print(
+        "  settings_changes  {:>4} observer calls {:>4} loop hops {:>4} reads, {} snapshots".format(
+            calls, hops, settings.reads, len(snapshots)
+        )
+    )
+    for task in tasks:
+        loop.call_soon_threadsafe(task.cancel)
+    time.sleep(0.05)
+    assert not settings.observers, "observer not removed"
+
+
+def bench_scopes(views: int = 50, handlers: int = 10) -> None:
+    """
+    Close a window with 50 views, each running 10 endless `on_modified` handlers,
+    and count tasks left running, without and with scopes, for plain and debounced
+    `on_modified` and `on_text_changed` handlers.
+    """
+    started = threading.Event()
+    running: set[asyncio.Task] = set()
+
+    async def forever(*args):
+        task = asyncio.current_task()
+        running.add(task)
+        try:
+            await asyncio.sleep(3600)
+        finally:
+            running.discard(task)
+
+    async def stubborn():
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            started.set()
+            await asyncio.sleep(3600)
+
+    class Listener(sublime_aio.ViewEventListener):
+        on_modified = forever
+
+    class DebouncedListener(sublime_aio.ViewEventListener):
+        on_modified = sublime_aio.debounced(10)(forever)
+
+    class ChangeListener(sublime_aio.TextChangeListener):
+        on_text_changed = forever
+
+    def edit(view):
+        if not view.buf.listeners:
+            ChangeListener().attach(view.buf)
+        view.edit(0, 0, "x")
+
+    window = sublime.Window(301)
+    close_listeners = sublime_plugin.all_callbacks["on_close"]
+    close_window_listeners = sublime_plugin.all_callbacks["on_pre_close_window"]
+
+    print("closing a window with {} views x {} handlers:".format(views, handlers))
+    for offset, (name, start) in enumerate(
+        (
+            ("unscoped", lambda view: sublime_aio.run_coroutine(forever(view))),
+            ("scoped", lambda view: Listener(view).on_modified()),
+            ("debounced", lambda view: DebouncedListener(view).on_modified()),
+            ("changes", edit),
+        )
+    ):
+        view_ids = range(3000 + offset * views, 3000 + (offset + 1) * views)
+        for view_id in view_ids:
+            for _ in range(handlers):
+                start(sublime.View(view_id))
+        time.sleep(0.1)
+        total = len(running)
+        begin = time.perf_counter()
+        for view_id in view_ids:
+            sublime.closed_views.add(view_id)
+            for listener in close_listeners:
+                listener.on_close(sublime.View(view_id))
+        sublime.closed_windows.add(window.window_id)
+        for listener in close_window_listeners:
+            listener.on_pre_close_window(window)
+        elapsed = time.perf_counter() - begin
+        time.sleep(0.1)
+        print(
+            "  {:<9} {:>4} of {:>4} tasks left running, close took {:.1f} ms".format(
+                name, len(running), total, elapsed * 1000
+            )
+        )
+        loop = sublime_aio._get_loop()
+        assert loop
+        for task in list(running):
+            loop.call_soon_threadsafe(task.cancel)
+        time.sleep(0.1)
+
+    # events of closed views must neither run nor leave scopes behind
+    for view_id in view_ids:
+        Listener(sublime.View(view_id)).on_modified()
+    time.sleep(0.1)
+    print(
+        "  {} tasks running, {} scopes kept after events of closed views".format(
+            len(running),
+            sum(view_id in sublime.closed_views for _, view_id in sublime_aio.Scope.scopes),
+        )
+    )
+
+    sublime_aio.Scope.LEAK_TIMEOUT = 0.1
+    sublime_aio.enable_diagnostics()
+    diagnostics = sublime_aio._diagnostics
+    assert diagnostics
+    window = sublime.Window(302)
+    sublime_aio.scope(window).run_coroutine(stubborn())
+    time.sleep(0.05)
+    sublime.closed_windows.add(window.window_id)
+    for listener in close_window_listeners:
+        listener.on_pre_close_window(window)
+    started.wait(1)
+    time.sleep(0.2)
+    report = diagnostics.report()
+    sublime_aio.disable_diagnostics()
+    print(
+        "  leaked task reported: {}".format(
+            any("window 302" in line and "stubborn" in line for line in report.splitlines())
+        )
+    )
+
+
+def bench_dispatch(events: int = 1000, interval: float = 0.001) -> None:
+    """
+    Fire synthetic event streams through real listener classes and measure
+    time spent on UI thread per event, latency from event to handler start
+    and event loop wakeups.
+
+    Streams are keystrokes 1 ms apart, selection storms and completion requests
+    without pause, and text changes of typing. Sync `sublime_plugin` handlers
+    and plain `run_coroutine()` calls are the baseline.
+    """
+    loop = sublime_aio._get_loop()
+    assert loop
+    started: list[float] = []
+
+    async def handler(*args):
+        started.append(time.perf_counter())
+
+    def sync_handler(*args):
+        started.append(time.perf_counter())
+
+    class SyncListener(sublime_plugin.EventListener):
+        on_modified = sync_handler
+
+    class RunCoroutineListener(sublime_plugin.EventListener):
+        def on_modified(self, view):
+            sublime_aio.run_coroutine(handler())
+
+    class Listener(sublime_aio.EventListener):
+        on_modified = handler
+        on_selection_modified = handler
+
+    class ViewListener(sublime_aio.ViewEventListener):
+        on_modified = handler
+
+    class DebouncedListener(sublime_aio.EventListener):
+        on_selection_modified = sublime_aio.debounced(20)(handler)
+
+    class LatestListener(sublime_aio.EventListener):
+        on_modified = sublime_aio.latest(handler)
+
+    class CompletionListener(sublime_aio.EventListener):
+        async def on_query_completions(self, view, prefix, locations):
+            started.append(time.perf_counter())
+            return ["{}_{}".format(word, i) for word in WORDS for i in range(20)]
+
+    class TextListener(sublime_aio.TextChangeListener):
+        on_text_changed = handler
+
+    def fire(name, event, stream_interval, view):
+        started.clear()
+        fired = []
+        with WakeupCounter(loop) as counter:
+            for _ in range(events):
+                view.changes += 1
+                fired.append(time.perf_counter())
+                result = event(view)
+                fired[-1] = (fired[-1], time.perf_counter())
+                # wait for completions to arrive before the next request
+                while isinstance(result, sublime.CompletionList) and result.completions is None:
+                    time.sleep(0.0001)
+                if stream_interval:
+                    time.sleep(stream_interval)
+            time.sleep(0.1)
+
+        spent = sum(end - start for start, end in fired) / events
+        # handlers of coalesced events start after the latest event before them
+        latencies = []
+        index = 0
+        for start in started:
+            while index + 1 < len(fired) and fired[index + 1][0] <= start:
+                index += 1
+            latencies.append(start - fired[index][0])
+        print(
+            "  {:<22} {:>6.1f} us/event {:>5} calls {:>5} wakeups  {}".format(
+                name,
+                spent * 1e6,
+                len(started),
+                counter.count,
+                percentiles(latencies) if latencies else "-",
+            )
+        )
+
+    completions = CompletionListener()
+    text_view = sublime.View(501, "x" * 100)
+    text_listener = TextListener()
+    text_listener.attach(text_view.buffer())
+
+    streams = (
+        ("sync EventListener", SyncListener().on_modified, interval),
+        ("run_coroutine", RunCoroutineListener().on_modified, interval),
+        ("EventListener", Listener().on_modified, interval),
+        ("ViewEventListener", lambda view: ViewListener(view).on_modified(), interval),
+        ("latest", LatestListener().on_modified, interval),
+        ("selection storm", Listener().on_selection_modified, 0),
+        ("debounced storm", DebouncedListener().on_selection_modified, 0),
+        ("completions", lambda view: completions.on_query_completions(view, "al", [100]), 0),
+        ("TextChangeListener", lambda view: view.edit(0, 1, "y"), interval),
+    )
+    print("dispatch of {} events per stream:".format(events))
+    for view_id, (name, event, stream_interval) in enumerate(streams, 510):
+        fire(name, event, stream_interval, text_view if "Text" in name else sublime.View(view_id))
+    text_listener.detach()
+
+
+WORDS = ("alpha", "beta", "gamma", "delta")
+
+
+def main() -> None:
+    bench_dispatch()
+    bench_debounce()
+    bench_completions()
+    bench_latest()
+    bench_text_changes()
+    bench_mirror()
+    bench_to_thread()
+    bench_on_ui()
+    bench_wrappers()
+    bench_processes()
+    bench_cached()
+    bench_lanes()
+    bench_settings()
+    bench_scopes()
+    bench_lifecycle()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["lifecycle"]:
+        lifecycle(sys.argv[2])
+    elif sys.argv[1:]:
+        for name in sys.argv[1:]:
+            globals()["bench_" + name]()
+    else:
+        main()
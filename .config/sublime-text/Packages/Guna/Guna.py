@@ -7,25 +7,48 @@
 # -----------------------------------------------------------------------------
 
 import sublime, sublime_plugin
-import sys, imp
+import sys, time
 import traceback
+from importlib import import_module
+try:
+    from importlib import reload
+except ImportError:
+    from imp import reload
 
 ##  sub-modules  ______________________________________________
 
+import_times = []
+
+def timed_import(name):
+    # reload if already imported (plugin reloading), otherwise import
+    tstart = time.perf_counter()
+    if name in sys.modules:
+        module = reload(sys.modules[name])
+    else:
+        module = import_module(name)
+    import_times.append((name, time.perf_counter() - tstart))
+    return module
+
+def import_report():
+    # like `python -X importtime` : cumulative time per sub-module in import order
+    print ('GUNA : import time ――――――――――――――――――――――――――――――――――――――――――――――――――')
+    total = 0
+    for name, secs in import_times:
+        total += secs
+        print ('  {:>8d} us | {}'.format(int(secs * 1e6), name))
+    print ('  {:>8d} us | total'.format(int(total * 1e6)))
+    print ('――――――――――――――――――――――――――――――――――――――――――――――――――――――――――――――――――――――')
+
 try:
-    # reload
-    mods = ['Guna.core.persist', 'Guna.core.api', 'Guna.core.engine']
-    for mod in mods:
-        if any(mod == m for m in list(sys.modules)):
-            imp.reload(sys.modules[mod])
-    # import
-    from .core import persist
-    from .core import api
+    # (re)import
+    persist = timed_import('Guna.core.persist')
+    api     = timed_import('Guna.core.api')
+    engine  = timed_import('Guna.core.engine')
+    util    = timed_import('Guna.core.util')
     from .core.api import GunaApi
-    from .core import engine
     from .core.engine import (GunaEventListener, GunaSwitchWidget, GunaSetTheme, GunaTweakTheme, GunaTweakWidget, GunaReadme,
         GunaIssue, GunaUpscaleIcon, GunaSwitchFont, GunaAuxCmds)
-    from .core.util import (GunaColorEdit)
+    from .core.util import (GunaColorEdit, GunaColorEditListener)
     import_ok = True
 except Exception:
     print ('GUNA : ERROR ―――――――――――――――――――――――――――――――――――――――――――――――――――――――――')
@@ -35,7 +58,9 @@ except Exception:
 
 # package control
 try:
+    tstart = time.perf_counter()
     from package_control import events
+    import_times.append(('package_control.events', time.perf_counter() - tstart))
     package_control_installed = True
 except Exception:
     package_control_installed = False
@@ -48,6 +73,9 @@ def plugin_loaded():
         sublime.status_message("* GUNA : Error in importing sub-modules. Please, see the trace-back message in Sublime console")
         return
 
+    if sublime.load_settings("Guna.sublime-settings").get('import_time_report', False):
+        import_report()
+
     if package_control_installed and (events.install('Guna') or events.post_upgrade('Guna')):
         def installed():
             # automatically set theme
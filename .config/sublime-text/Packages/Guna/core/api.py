@@ -11,22 +11,12 @@ import sublime_plugin
 import sys
 import time
 import datetime
+import heapq
 import threading
 import traceback
 
 from . import persist
 
-def check_thread(name, stop=False):
-    is_alive = False
-    for th in threading.enumerate():
-        if th.name == name:
-            is_alive = True
-            if stop:
-                th.stop()
-            else:
-                break
-    return is_alive
-
 def set_except():
     sys.excepthook = guna_except
 
@@ -45,11 +35,7 @@ class GunaApi():
     @staticmethod
     def alert_message(flag=0, message='', timeout=4, action=0):
         if flag != 0 and message != '' and timeout >= 1:
-            GunaApi.alert(flag, True)
-            check_thread('GunaAlertThread', stop=True)
-            athread = GunaAlertThread(message, timeout, action, alert=True)
-            athread.setDaemon(True)
-            athread.start()
+            GunaScheduler.post(GunaMessage(flag & 7, message, timeout, action, alert=True))
 
     @staticmethod
     def alert(flag=0, onoff=False):
@@ -63,11 +49,7 @@ class GunaApi():
     @staticmethod
     def info_message(flag=0, message='', timeout=4, action=0):
         if flag != 0 and message != '' and timeout >= 1:
-            GunaApi.info(flag, True)
-            check_thread('GunaAlertThread', stop=True)
-            athread = GunaAlertThread(message, timeout, action, alert=False)
-            athread.setDaemon(True)
-            athread.start()
+            GunaScheduler.post(GunaMessage(flag & 24, message, timeout, action, alert=False))
 
     @staticmethod
     def info(flag=0, onoff=False):
@@ -100,34 +82,135 @@ class GunaApi():
         if not sublime.active_window().is_sidebar_visible():
             sublime.active_window().run_command('toggle_side_bar')
 
-class GunaAlertThread(threading.Thread):
+# a status message and its flags, shown for `timeout` periods
+class GunaMessage():
 
-    def __init__(self, message, timeout, action, alert=True):
-        threading.Thread.__init__(self, name='GunaAlertThread')
+    def __init__(self, flag, message, timeout, action, alert=True):
+        self.flag    = flag
         self.message = message
         self.timeout = timeout
         self.action  = action
         self.alert   = alert
-        self.quit    = False
-
-    def run(self):
-        while self.timeout > 0:
-            if self.quit:
-                break
-            if self.action == GunaApi.FLICKER:
-                sublime.status_message(self.message)
-                time.sleep(0.4)
-                sublime.status_message(" ")
-                time.sleep(0.1)
-            else:
-                sublime.status_message(self.message)
-                time.sleep(0.5)
-            self.timeout = self.timeout - 1
-        sublime.status_message("")
-        if self.alert:
-            GunaApi.alert(7, False)
+        self.start   = 0
+
+    def key(self):
+        return (self.alert, self.flag, self.message, self.action)
+
+    def priority(self):
+        return 1 if self.alert else 0
+
+    def elapsed(self, now):
+        return int((now - self.start) / GunaScheduler.PERIOD)
+
+    def frame(self, now):
+        # (text, time of the next frame) on the timeline, (None, None) when it's over
+        index = self.elapsed(now)
+        if index >= self.timeout:
+            return None, None
+        fbase = self.start + index * GunaScheduler.PERIOD
+        if self.action == GunaApi.FLICKER:
+            if now - fbase < GunaScheduler.FLICKER_ON:
+                return self.message, fbase + GunaScheduler.FLICKER_ON
+            return " ", fbase + GunaScheduler.PERIOD
+        return self.message, fbase + GunaScheduler.PERIOD
+
+# shows queued messages one by one on the UI thread with `sublime.set_timeout`.
+# alerts go before infos, duplicates are merged and the preferences flags are
+# written only when they change (at the start and at the end of a burst)
+class GunaScheduler():
+    PERIOD     = 0.5
+    FLICKER_ON = 0.4
+    MAX_QUEUE  = 16
+    lock    = threading.Lock()
+    queue   = []
+    seq     = 0
+    token   = 0
+    current = None
+    flags   = 0
+
+    @staticmethod
+    def post(msg):
+        cls = GunaScheduler
+        with cls.lock:
+            now = time.time()
+            cur = cls.current
+            if cur is not None and cur.key() == msg.key():
+                cur.timeout = max(cur.timeout, cur.elapsed(now) + msg.timeout)
+                return
+            for entry in cls.queue:
+                if entry[2].key() == msg.key():
+                    entry[2].timeout = max(entry[2].timeout, msg.timeout)
+                    return
+            if cur is not None and msg.priority() > cur.priority():
+                # preempted, the rest of it is shown later
+                cur.timeout = cur.timeout - cur.elapsed(now)
+                cls.push(cur)
+                cls.current = None
+            cls.push(msg)
+            if len(cls.queue) > cls.MAX_QUEUE:
+                cls.queue.remove(max(cls.queue))
+                heapq.heapify(cls.queue)
+            token = cls.next_token()
+        sublime.set_timeout(lambda: cls.pump(token), 0)
+
+    @staticmethod
+    def push(msg):
+        cls = GunaScheduler
+        cls.seq += 1
+        heapq.heappush(cls.queue, (-msg.priority(), cls.seq, msg))
+
+    @staticmethod
+    def next_token():
+        GunaScheduler.token += 1
+        return GunaScheduler.token
+
+    @staticmethod
+    def pump(token):
+        cls = GunaScheduler
+        with cls.lock:
+            if token != cls.token:
+                return
+            now  = time.time()
+            text = None
+            while True:
+                if cls.current is None:
+                    if not cls.queue:
+                        break
+                    cls.current = heapq.heappop(cls.queue)[2]
+                    cls.current.start = now
+                text, wake = cls.current.frame(now)
+                if text is not None:
+                    break
+                cls.current = None
+            flags = 0 if cls.current is None else cls.current.flag
+            if text is not None:
+                token = cls.next_token()
+        cls.set_flags(flags)
+        if text is None:
+            sublime.status_message("")
         else:
-            GunaApi.info(24, False)
+            sublime.status_message(text)
+            delay = max(0, int((wake - now) * 1000) + 1)
+            sublime.set_timeout(lambda: cls.pump(token), delay)
 
-    def stop(self):
-        self.quit = True
+    @staticmethod
+    def set_flags(flags):
+        cls = GunaScheduler
+        on  = flags & ~cls.flags
+        off = cls.flags & ~flags
+        cls.flags = flags
+        if on:
+            GunaApi.alert(on, True)
+            GunaApi.info(on, True)
+        if off:
+            GunaApi.alert(off, False)
+            GunaApi.info(off, False)
+
+    @staticmethod
+    def stop():
+        cls = GunaScheduler
+        with cls.lock:
+            cls.queue   = []
+            cls.current = None
+            cls.next_token()
+        cls.set_flags(0)
@@ -14,14 +14,7 @@ import time
 import threading
 import traceback
 import os
-import shutil
 import re
-import webbrowser
-import plistlib
-import colorsys
-import urllib.request
-import json
-import hashlib
 
 from . import api
 from . import persist
@@ -48,9 +41,22 @@ last_wigon   = ''
 widget_index = 0
 font_index   = -1
 nok_cnt      = 0
+REGEXS       = {}
+palette      = {}
+palette_stat = None
+prefs_writes = 0
+prefs_lock   = threading.RLock()
+
+def with_prefs_lock(func):
+    # widget ticks run on the async thread, a Preferences write can't happen in the middle of one
+    def locked(*args, **kwargs):
+        with prefs_lock:
+            return func(*args, **kwargs)
+    return locked
 
 def start():
     api.set_except()
+    strip_transient()
     GunaMainThread.clean_gnis()
     check_gpu_window_buffer()
     observe_prefs()
@@ -63,6 +69,7 @@ def stop():
     check_thread('prproc', stop=True)
     check_thread('fkproc', stop=True)
     check_thread('mnproc', stop=True)
+    api.GunaScheduler.stop()
     GunaMainThread.clean_gnis()
     GunaMainThread.clean_prfs()
     GunaMainThread.clean_gnc()
@@ -111,19 +118,20 @@ def on_prefs_update():
 
 def engine_reload():
     observe_prefs(observer=on_prefs_update)
+    check_palette(render=False)
     tweak = False
     global last_theme, last_color, last_bgclr, last_gopts, last_wigon
     prefs, theme, is_guna = get_prefs()
     color = prefs.get('color_scheme', '')
     gunas = sublime.load_settings("Guna.sublime-settings")
-    fgclr = gunas.get('guna_fgcolor', '#E5E0D3')
-    bgclr = gunas.get('guna_bgcolor', '#161C23')
+    fgclr = guna_color(gunas, 'guna_fgcolor', '#E5E0D3')
+    bgclr = guna_color(gunas, 'guna_bgcolor', '#161C23')
     csopt = gunas.get('guna_color_saturation', 100)
     cbopt = gunas.get('guna_color_brightness', 100)
-    gdclr = gunas.get('guna_guide', '#20272E')
-    agclr = gunas.get('guna_active_guide', '#AAFF9954')
-    brclr = gunas.get('guna_brackets_color', '#FF0000')
-    tgclr = gunas.get('guna_tags_color', '#FF5242')
+    gdclr = guna_color(gunas, 'guna_guide', '#20272E')
+    agclr = guna_color(gunas, 'guna_active_guide', '#AAFF9954')
+    brclr = guna_color(gunas, 'guna_brackets_color', '#FF0000')
+    tgclr = guna_color(gunas, 'guna_tags_color', '#FF5242')
     bropt = gunas.get('guna_brackets_options', 'foreground')
     tgopt = gunas.get('guna_tags_options', 'foreground')
     ttbar = gunas.get('title_bar_color', True)
@@ -169,6 +177,45 @@ def get_gunas(widget='clock'):
     return gunas, widgt, wigon, wigtf
 vSicIYDw = os.path.getmtime
 
+def guna_color(gunas, key, default):
+    # a wallbash palette color, if mapped, goes before the settings
+    return palette.get(key) or gunas.get(key, default)
+
+def read_palette(fpath, cmap):
+    dcols = {}
+    with open(fpath, 'r', encoding='utf8') as f:
+        for line in f:
+            mtch = regex(DCLPAT).match(line)
+            if mtch:
+                dcols[mtch.group('name')] = '#' + mtch.group('color').upper()
+    return dict((k, dcols[v]) for k, v in cmap.items() if v in dcols)
+
+def check_palette(render=True):
+    # cheap mtime polling of the wallbash palette (from the engine loop and engine_reload)
+    global palette, palette_stat
+    wbset = sublime.load_settings("Guna.sublime-settings").get('wallbash', {})
+    fpath = os.path.expanduser(wbset.get('palette', ''))
+    try:
+        fstat = os.stat(fpath) if fpath != '' else None
+    except OSError:
+        # a deleted palette is an empty one, the guna_* colors come back
+        fstat = None
+    stamp = None if fstat is None else (fpath, fstat.st_mtime_ns, fstat.st_size)
+    if stamp == palette_stat:
+        return
+    try:
+        colors = {} if stamp is None else read_palette(fpath, wbset.get('map', {}))
+    except (OSError, UnicodeDecodeError):
+        # retried on the next poll, wallbash may still be writing it
+        return
+    palette_stat = stamp
+    changed = [k for k in set(colors) | set(palette) if colors.get(k) != palette.get(k)]
+    palette = colors
+    if changed and render:
+        # only the background takes part in the theme and the widget
+        outputs = PALETTE_OUTPUTS if 'guna_bgcolor' in changed else ['color_scheme']
+        sublime.set_timeout(lambda: sublime.active_window().run_command('guna_tweak_theme', {'outputs': outputs}), 0)
+
 def get_style():
     aview = sublime.active_window().active_view()
     prefs = sublime.load_settings("Preferences.sublime-settings")
@@ -204,6 +251,7 @@ def check_thread(name, stop=False):
                 break
     return is_alive
 
+@with_prefs_lock
 def check_status(prefs=None, view=None):
     global stopped
     if stopped:
@@ -245,7 +293,41 @@ def restore_theme():
     prefs = sublime.load_settings("Preferences.sublime-settings")
     prefs.set('color_scheme', DEFAULT_COLOR)
     prefs.set('theme', DEFAULT_THEME)
-    sublime.save_settings("Preferences.sublime-settings")
+    save_prefs()
+
+def save_prefs():
+    # every Preferences write of Guna goes through here, widget ticks never write
+    sublime.set_timeout(write_prefs, 0)
+
+def write_prefs():
+    # the widget state is taken out for the write and put back within one UI thread call, so it
+    # never reaches the file and no frame is drawn without it. ticks hold prefs_lock meanwhile
+    global prefs_writes
+    with prefs_lock:
+        prefs = sublime.load_settings("Preferences.sublime-settings")
+        prefs.clear_on_change('Guna-prefs')
+        stash = dict((k, prefs.get(k)) for k in transient_keys(prefs))
+        for k in stash:
+            prefs.erase(k)
+        sublime.save_settings("Preferences.sublime-settings")
+        prefs_writes += 1
+        for k, v in stash.items():
+            prefs.set(k, v)
+        observe_prefs()
+
+def transient_keys(prefs):
+    if hasattr(prefs, 'to_dict'):
+        return [k for k in prefs.to_dict() if k.startswith(persist.GUNA_TRANSIENT_PREFIX)]
+    return [k for k in persist.GUNA_TRANSIENT if prefs.has(k)]
+
+def strip_transient():
+    # one-time migration : the widget state saved by older versions is removed from the file
+    prefs = sublime.load_settings("Preferences.sublime-settings")
+    tkeys = transient_keys(prefs)
+    if tkeys:
+        for k in tkeys:
+            prefs.erase(k)
+        save_prefs()
 
 def check_gpu_window_buffer():
     if sublime.platform() == 'osx':
@@ -273,6 +355,13 @@ def disp_error():
     print ('――――――――――――――――――――――――――――――――――――――――――――――――――――――――――――――――――――――')
     api.GunaApi.alert_message(3, " GUNA : Error is occured. Please, see the trace-back message in Sublime console.", 10, 1)
 
+def regex(pattern):
+    # compile on first use, not at import
+    robj = REGEXS.get(pattern)
+    if robj is None:
+        robj = REGEXS[pattern] = re.compile(pattern)
+    return robj
+
 def timenow():
     return datetime.now()
 
@@ -335,7 +424,11 @@ class GunaMainThread(threading.Thread):
     def run(self):
         while True:
             try:
-                time.sleep(30)
+                for x in range(30):
+                    time.sleep(1)
+                    if self.quit:
+                        break
+                    check_palette()
                 self.tick = 0 if self.tick == 1000 else (self.tick + 1)
                 if self.quit:
                     break
@@ -355,13 +448,9 @@ class GunaMainThread(threading.Thread):
     @staticmethod
     def clean_gnis():
         prefs = sublime.load_settings("Preferences.sublime-settings")
-        change = False
         for k in persist.GUNA_GNIS:
             if prefs.has(k):
-                change = True
                 prefs.erase(k)
-        if change:
-            sublime.save_settings("Preferences.sublime-settings")
 
     @staticmethod
     def clean_prfs():
@@ -373,6 +462,7 @@ class GunaMainThread(threading.Thread):
     @staticmethod
     def clean_widget_other(is_guna):
         try:
+            import shutil
             if is_guna:
                 tpath = os.path.join(sublime.packages_path(), 'zzz Guna Widget zzz')
                 if os.path.exists(tpath):
@@ -452,7 +542,7 @@ class GunaMainThread(threading.Thread):
                     prefs.erase(k)
                     change = True
         if change:
-            sublime.save_settings("Preferences.sublime-settings")
+            save_prefs()
         return
 
     @staticmethod
@@ -488,11 +578,11 @@ class GunaMainThread(threading.Thread):
         for x in range(0,10):
             kstr = "gnc_m0{:d}".format(x)
             GunaMainThread.erase_prefs(prefs, kstr)
-        sublime.save_settings("Preferences.sublime-settings")
         if not stopped:
             sublime.set_timeout_async(GunaMainThread.set_time, 1000)
 
     @staticmethod
+    @with_prefs_lock
     def set_time():
         prefs, theme, is_guna  = get_prefs()
         gunas, widgt, wigon, is_clock = get_gunas('clock')
@@ -557,11 +647,11 @@ class GunaMainThread(threading.Thread):
         for x in range(0,10):
             kstr = "gnd_d0{:d}".format(x)
             GunaMainThread.erase_prefs(prefs, kstr)
-        sublime.save_settings("Preferences.sublime-settings")
         if not stopped:
             sublime.set_timeout_async(GunaMainThread.set_time, 1000)
 
     @staticmethod
+    @with_prefs_lock
     def set_date():
         prefs, theme, is_guna = get_prefs()
         gunas, widgt, wigon, is_date = get_gunas('date')
@@ -624,27 +714,28 @@ class GunaMainThread(threading.Thread):
             nok_cnt += 1
         else:
             nok_cnt  = 0
-        if not prefs.has(w0icn):
-            for x in persist.GUNA_WEATHERS:
-                kstr = 'gnw_0' + x
-                GunaMainThread.erase_prefs(prefs, kstr)
-                pass
-            if ok:
-                prefs.set(w0icn, True)
-        if not prefs.has(w3icn):
-            for x in persist.GUNA_WEATHERS:
-                kstr = 'gnw_3' + x
-                GunaMainThread.erase_prefs(prefs, kstr)
-                pass
-            if ok:
-                prefs.set(w3icn, True)
-        if not prefs.has(w6icn):
-            for x in persist.GUNA_WEATHERS:
-                kstr = 'gnw_6' + x
-                GunaMainThread.erase_prefs(prefs, kstr)
-                pass
-            if ok:
-                prefs.set(w6icn, True)
+        with prefs_lock:
+            if not prefs.has(w0icn):
+                for x in persist.GUNA_WEATHERS:
+                    kstr = 'gnw_0' + x
+                    GunaMainThread.erase_prefs(prefs, kstr)
+                    pass
+                if ok:
+                    prefs.set(w0icn, True)
+            if not prefs.has(w3icn):
+                for x in persist.GUNA_WEATHERS:
+                    kstr = 'gnw_3' + x
+                    GunaMainThread.erase_prefs(prefs, kstr)
+                    pass
+                if ok:
+                    prefs.set(w3icn, True)
+            if not prefs.has(w6icn):
+                for x in persist.GUNA_WEATHERS:
+                    kstr = 'gnw_6' + x
+                    GunaMainThread.erase_prefs(prefs, kstr)
+                    pass
+                if ok:
+                    prefs.set(w6icn, True)
         return
 
     @staticmethod
@@ -727,6 +818,7 @@ class GunaMainThread(threading.Thread):
         weathjs = {}
         fcastjs = {}
         try:
+            import json
             if os.path.exists(wpath):
                 with open(wpath, 'r', encoding="utf8") as dfile:
                     weathjs = json.load(dfile)
@@ -742,6 +834,8 @@ class GunaMainThread(threading.Thread):
     @staticmethod
     def update_weather(wpath, fpath, appid, cname, geogr, golat, golon, proxy):
         try:
+            import json
+            import urllib.request
             if appid != "" and (cname != "" or (geogr != None and golat != -1 and golon != -1)):
                 if cname != "":
                     wlink = 'http://api.openweathermap.org/data/2.5/weather?q=' + cname + '&APPID=' + appid
@@ -793,11 +887,11 @@ class GunaMainThread(threading.Thread):
             GunaMainThread.erase_prefs(prefs, kstr)
             kstr = "gnw_6" + x
             GunaMainThread.erase_prefs(prefs, kstr)
-        sublime.save_settings("Preferences.sublime-settings")
         if not stopped:
             sublime.set_timeout_async(GunaMainThread.set_weather, 1000)
 
     @staticmethod
+    @with_prefs_lock
     def switch_widget():
         prefs = sublime.load_settings("Preferences.sublime-settings")
         gunas = sublime.load_settings("Guna.sublime-settings")
@@ -847,7 +941,7 @@ class GunaMainThread(threading.Thread):
                         break
             prefs.set("font_face", fonts[font_index][0])
             prefs.set("font_size", fonts[font_index][1])
-            sublime.save_settings("Preferences.sublime-settings")
+            save_prefs()
             sublime.status_message(' Font : ' + fonts[font_index][0] + ' (' + str(fonts[font_index][1]) + ')')
         return
 
@@ -894,7 +988,7 @@ class GunaSetTheme(sublime_plugin.WindowCommand):
             prefs = sublime.load_settings("Preferences.sublime-settings")
             prefs.set('theme', 'Guna.sublime-theme')
             prefs.set('color_scheme', 'Packages/Guna/themes/Guna.sublime-color-scheme')
-            sublime.save_settings("Preferences.sublime-settings")
+            save_prefs()
         except Exception:
             disp_error()
 
@@ -924,6 +1018,7 @@ class GunaReadme(sublime_plugin.WindowCommand):
 
     def on_navigate(self, href):
         try:
+            import webbrowser
             webbrowser.open(href)
         except Exception:
             disp_error()
@@ -932,16 +1027,19 @@ class GunaIssue(sublime_plugin.WindowCommand):
 
     def run(self):
         try:
+            import webbrowser
             webbrowser.open_new_tab('https://github.com/poucotm/Guna/issues')
         except Exception:
             disp_error()
 
-SC1OBJ = re.compile(r'(?P<front>.*?)#scale1\s+(?:((?P<el00>[\d]+)-(?P<el01>[\d]+))|(?P<el0>[\d\-]+))(?P<back>.*)')
-SC2OBJ = re.compile(r'(?P<front>.*?)#scale2-(?P<eli>[\d]+)\s*\[(?P<el0>[\d]+)\s*,\s*(?P<el1>[\d]+)\](?P<back>.*)')
-SC4OBJ = re.compile(r'(?P<front>.*?)#scale4-(?P<eli>[\d]+)\s*\[(?P<el0>[\d]+)\s*,\s*(?P<el1>[\d]+)\s*,\s*(?P<el2>[\d]+)\s*,\s*(?P<el3>[\d]+)\](?P<back>.*)')
-SW2OBJ = re.compile(r'(?P<front>.*?)#switch-scale2-(?P<eli>[\d]+)\s*\[(?P<el0>[\d]+)\s*,\s*(?P<el1>[\d]+)\](?P<back>.*)')
-CMGOBJ = re.compile(r'"content_margin"\s*:\s*\[\s*\d+\s*,\s*\d+\s*\]')
-AFIOBJ = re.compile(r'"size"\s*:\s*\d+')
+SC1PAT = r'(?P<front>.*?)#scale1\s+(?:((?P<el00>[\d]+)-(?P<el01>[\d]+))|(?P<el0>[\d\-]+))(?P<back>.*)'
+SC2PAT = r'(?P<front>.*?)#scale2-(?P<eli>[\d]+)\s*\[(?P<el0>[\d]+)\s*,\s*(?P<el1>[\d]+)\](?P<back>.*)'
+SC4PAT = r'(?P<front>.*?)#scale4-(?P<eli>[\d]+)\s*\[(?P<el0>[\d]+)\s*,\s*(?P<el1>[\d]+)\s*,\s*(?P<el2>[\d]+)\s*,\s*(?P<el3>[\d]+)\](?P<back>.*)'
+SW2PAT = r'(?P<front>.*?)#switch-scale2-(?P<eli>[\d]+)\s*\[(?P<el0>[\d]+)\s*,\s*(?P<el1>[\d]+)\](?P<back>.*)'
+CMGPAT = r'"content_margin"\s*:\s*\[\s*\d+\s*,\s*\d+\s*\]'
+AFIPAT = r'"size"\s*:\s*\d+'
+DCLPAT = r'\s*(?:dcol_|wallbash_)?(?P<name>\w+?)\s*=\s*["\']?#?(?P<color>[0-9a-fA-F]{6}(?:[0-9a-fA-F]{2})?)["\']?\s*$'
+PALETTE_OUTPUTS = ['theme', 'widget', 'color_scheme']
 LSTPAT = ''
 
 class GunaTweakTheme(sublime_plugin.WindowCommand):
@@ -949,8 +1047,9 @@ class GunaTweakTheme(sublime_plugin.WindowCommand):
         'white', 'red', 'green', 'blue', 'yellow', 'orange', 'lBlue', 'rOrange', 'lOrange'
     ]
 
-    def run(self):
+    def run(self, outputs=PALETTE_OUTPUTS):
         try:
+            import colorsys
             prefs, theme, is_guna = get_prefs()
             if not is_guna:
                 return
@@ -965,18 +1064,19 @@ class GunaTweakTheme(sublime_plugin.WindowCommand):
                     bgclr = style.get('background')
                 else:
                     cschm = prefs.get('color_scheme')
+                    import plistlib
                     cstxt = str(sublime.load_resource(cschm))
                     treep = plistlib.readPlistFromBytes(cstxt.encode())
                     bgclr = treep['settings'][0]['settings']['background']
             else:
-                fgclr = gunas.get('guna_fgcolor', '#E5E0D3')
-                bgclr = gunas.get('guna_bgcolor', '#161C23')
+                fgclr = guna_color(gunas, 'guna_fgcolor', '#E5E0D3')
+                bgclr = guna_color(gunas, 'guna_bgcolor', '#161C23')
                 csopt = gunas.get('guna_color_saturation', 100)
                 cbopt = gunas.get('guna_color_brightness', 100)
-                gdclr = gunas.get('guna_guide', '#20272E')
-                agclr = gunas.get('guna_active_guide', '#AAFF9954')
-                brclr = gunas.get('guna_brackets_color', '#FF0000')
-                tgclr = gunas.get('guna_tags_color', '#FF5242')
+                gdclr = guna_color(gunas, 'guna_guide', '#20272E')
+                agclr = guna_color(gunas, 'guna_active_guide', '#AAFF9954')
+                brclr = guna_color(gunas, 'guna_brackets_color', '#FF0000')
+                tgclr = guna_color(gunas, 'guna_tags_color', '#FF5242')
                 bropt = gunas.get('guna_brackets_options', 'foreground')
                 tgopt = gunas.get('guna_tags_options', 'foreground')
                 gopts = str(csopt) + str(cbopt) + fgclr + gdclr + agclr + brclr + tgclr + bropt + tgopt + str(ttbar)
@@ -1041,7 +1141,7 @@ class GunaTweakTheme(sublime_plugin.WindowCommand):
                 if tgopt in ['foreground', 'underline', 'stippled_underline', 'squiggly_underline']:
                     ctxt  = ctxt.replace('#tag-option', tgopt)
                 regx = '"(?P<name>[\\w]+)"\\s*:\\s*"#(?P<color>[\\w]+)"'
-                objt = re.compile(regx)
+                objt = regex(regx)
                 for mtch in objt.finditer(ctxt):
                     if mtch.group('name') in GunaTweakTheme.GUNA_COLORS:
                         otext = mtch.group()
@@ -1201,11 +1301,11 @@ class GunaTweakTheme(sublime_plugin.WindowCommand):
                 stxt += self.scaling(line, scale, switch_scale) + '\n'
             nsize = str(int(8 * scale))
             fname = os.path.join(sublime.packages_path(), 'zzz A File Icon zzz','patches','general','multi','Guna.sublime-theme')
-            if os.path.exists(fname):
+            if os.path.exists(fname) and 'theme' in outputs:
                 with open(fname, 'r', encoding='utf8') as f:
                     patch = str(f.read())
                 cmtxt = '"content_margin": ['+nsize+', '+nsize+']'
-                patch = CMGOBJ.sub(cmtxt, patch)
+                patch = regex(CMGPAT).sub(cmtxt, patch)
                 with open(fname, 'w', newline='', encoding='utf8') as f:
                     f.write(patch)
             fname = os.path.join(sublime.packages_path(), 'User','A File Icon.sublime-settings')
@@ -1214,11 +1314,11 @@ class GunaTweakTheme(sublime_plugin.WindowCommand):
                 with open(fname, 'r', encoding='utf8') as f:
                     patch = str(f.read())
                 sztxt = '"size": '+nsize
-                patch = AFIOBJ.sub(sztxt, patch)
+                patch = regex(AFIPAT).sub(sztxt, patch)
             else:
                 patch = '{ "size": '+nsize+' }'
             global LSTPAT
-            if LSTPAT != patch:
+            if LSTPAT != patch and 'theme' in outputs:
                 LSTPAT = patch
                 with open(fname, 'w', newline='', encoding='utf8') as f:
                     f.write(patch)
@@ -1305,13 +1405,15 @@ class GunaTweakTheme(sublime_plugin.WindowCommand):
             for i in range(0,9):
                 wgtxt += '\t{{ "class": "sidebar_container", "layer3.inner_margin": {}, "settings" : ["gnw_{:03d}",   "gnwidg3"], "layer3.texture": "Guna/assets/simple/sidebar/weather/w{:03d}{}.png", "layer3.opacity": 1 }},\n'.format(sclm, ixwea[i], iwwea[i], sclx)
             stxt  = stxt.replace('#widget-weather', wgtxt)
-            fname = os.path.join(sublime.packages_path(), 'Guna/themes/Guna.sublime-theme')
-            with open(fname, "w", newline="", encoding='utf8') as f:
-                f.write(stxt)
-            fname = os.path.join(sublime.packages_path(), 'Guna/widgets/Widget - Guna.sublime-color-scheme')
-            with open(fname, "w", newline="", encoding='utf8') as f:
-                f.write(wtxt)
-            if gunac:
+            if 'theme' in outputs:
+                fname = os.path.join(sublime.packages_path(), 'Guna/themes/Guna.sublime-theme')
+                with open(fname, "w", newline="", encoding='utf8') as f:
+                    f.write(stxt)
+            if 'widget' in outputs:
+                fname = os.path.join(sublime.packages_path(), 'Guna/widgets/Widget - Guna.sublime-color-scheme')
+                with open(fname, "w", newline="", encoding='utf8') as f:
+                    f.write(wtxt)
+            if gunac and 'color_scheme' in outputs:
                 fname = os.path.join(sublime.packages_path(), 'Guna/themes/Guna.sublime-color-scheme')
                 with open(fname, "w", newline="", encoding='utf8') as f:
                     f.write(ctxt)
@@ -1332,7 +1434,7 @@ class GunaTweakTheme(sublime_plugin.WindowCommand):
             return
 
     def scaling(self, txt, scale, switch_scale):
-        mch = SC1OBJ.match(txt)
+        mch = regex(SC1PAT).match(txt)
         if mch:
             if mch.group('el00') and mch.group('el01'):
                 els = str( int((int(mch.group('el00'))-int(mch.group('el01'))) * scale + int(mch.group('el01'))) )
@@ -1341,7 +1443,7 @@ class GunaTweakTheme(sublime_plugin.WindowCommand):
                 els = str( int(int(mch.group('el0')) * scale) )
                 return (mch.group('front') + els + mch.group('back'))
         else:
-            mch = SC2OBJ.match(txt)
+            mch = regex(SC2PAT).match(txt)
             ele = []
             if mch:
                 eli = mch.group('eli')
@@ -1353,7 +1455,7 @@ class GunaTweakTheme(sublime_plugin.WindowCommand):
                 els = '['+', '.join(ele)+']'
                 return (mch.group('front') + els + mch.group('back'))
             else:
-                mch = SC4OBJ.match(txt)
+                mch = regex(SC4PAT).match(txt)
                 if mch:
                     eli = mch.group('eli')
                     ele.append(mch.group('el0'))
@@ -1366,7 +1468,7 @@ class GunaTweakTheme(sublime_plugin.WindowCommand):
                     els = '['+', '.join(ele)+']'
                     return (mch.group('front') + els + mch.group('back'))
                 else:
-                    mch = SW2OBJ.match(txt)
+                    mch = regex(SW2PAT).match(txt)
                     ele = []
                     if mch:
                         eli = mch.group('eli')
@@ -1383,6 +1485,7 @@ class GunaTweakWidget(sublime_plugin.WindowCommand):
 
     def run(self):
         try:
+            import colorsys
             prefs, theme, is_guna = get_prefs()
             gunas, widgt, wigon, is_clock = get_gunas('clock')
             if not wigon or theme == 'Guna.sublime-theme':
@@ -1393,6 +1496,7 @@ class GunaTweakWidget(sublime_plugin.WindowCommand):
                 bgclr = style.get('background')
             else:
                 cschm = prefs.get('color_scheme')
+                import plistlib
                 cstxt = str(sublime.load_resource(cschm))
                 treep = plistlib.readPlistFromBytes(cstxt.encode())
                 bgclr = treep['settings'][0]['settings']['background']
@@ -1501,16 +1605,17 @@ class GunaTweakWidget(sublime_plugin.WindowCommand):
             raise
             return
 
-FTYOBJ = re.compile(r'(?P<name>file_type_\w+[^\.\@]*)\.png')
+FTYPAT = r'(?P<name>file_type_\w+[^\.\@]*)\.png'
 
 class GunaUpscaleIcon(sublime_plugin.WindowCommand):
 
     def run(self):
         try:
+            import shutil
             afidir = os.path.join(sublime.packages_path(), 'zzz A File Icon zzz','patches','general','multi')
             if os.path.exists(afidir):
                 for file in os.listdir(afidir):
-                    mch = FTYOBJ.match(file)
+                    mch = regex(FTYPAT).match(file)
                     if mch:
                         file = mch.group('name')
                         file = os.path.join(afidir, file)
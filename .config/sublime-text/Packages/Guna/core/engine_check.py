@@ -0,0 +1,163 @@
+# -*- coding: utf8 -*-
+# -----------------------------------------------------------------------------
+# File   : engine_check.py
+# Editor : sublime text3, tab size (4)
+# -----------------------------------------------------------------------------
+#
+# Checks of the engine, runnable with a plain python 3.3+ and minimal fakes of
+# the sublime text API, from the Packages directory :
+#
+#   python3 -m Guna.core.engine_check              # run all checks
+#   python3 -m Guna.core.engine_check prefs_writes # run check_prefs_writes()
+
+import os
+import sys
+import tempfile
+import types
+from datetime import datetime, timedelta
+
+def install_fakes():
+    sublime = types.ModuleType('sublime')
+    sublime_plugin = types.ModuleType('sublime_plugin')
+
+    class Settings():
+        def __init__(self, values=None):
+            self.values = dict(values or {})
+            # (key, 'set' or 'erase') of every change
+            self.changes = []
+
+        def get(self, key, default=None):
+            return self.values.get(key, default)
+
+        def has(self, key):
+            return key in self.values
+
+        def set(self, key, value):
+            self.values[key] = value
+            self.changes.append((key, 'set'))
+
+        def erase(self, key):
+            self.values.pop(key, None)
+            self.changes.append((key, 'erase'))
+
+        def to_dict(self):
+            return dict(self.values)
+
+        def add_on_change(self, tag, callback):
+            pass
+
+        def clear_on_change(self, tag):
+            pass
+
+    class Window():
+        def active_view(self):
+            return None
+
+        def run_command(self, cmd, args=None):
+            sublime.commands.append((cmd, args))
+
+    settings = {
+        'Preferences.sublime-settings': Settings({'theme': 'Guna.sublime-theme'}),
+        'Guna.sublime-settings': Settings({'sidebar_widget': ['clock', 'date', 'weather']}),
+    }
+    sublime.settings = settings
+    # (name, contents) of every settings file write
+    sublime.saved = []
+    sublime.commands = []
+    sublime.version = lambda: '4126'
+    sublime.platform = lambda: 'linux'
+    sublime.load_settings = lambda name: settings.setdefault(name, Settings())
+    sublime.save_settings = lambda name: sublime.saved.append((name, settings[name].to_dict()))
+    sublime.set_timeout = lambda callback, delay=0: callback()
+    sublime.set_timeout_async = lambda callback, delay=0: None
+    sublime.active_window = lambda: Window()
+
+    class Command():
+        def __init__(self, window=None):
+            self.window = window
+
+    sublime_plugin.EventListener = object
+    sublime_plugin.WindowCommand = Command
+    sublime_plugin.TextCommand = Command
+
+    sys.modules['sublime'] = sublime
+    sys.modules['sublime_plugin'] = sublime_plugin
+    return sublime
+
+def written_transient(sublime, persist):
+    name, written = sublime.saved[-1]
+    return [k for k in written if k.startswith(persist.GUNA_TRANSIENT_PREFIX)]
+
+def check_prefs_writes(sublime, engine, persist):
+    # an hour of clock, date and weather ticks writes nothing, a theme save writes
+    # once, without the widget state in the file and with it kept in memory
+    prefs = sublime.load_settings('Preferences.sublime-settings')
+    prefs.values[persist.GNC_DIRTY] = True
+    prefs.values['gnc_h03'] = True
+    engine.strip_transient()
+    assert not engine.transient_keys(prefs), 'stale widget state is stripped on start'
+    assert not written_transient(sublime, persist), 'stale widget state is written'
+    writes = engine.prefs_writes
+
+    start = datetime(2026, 10, 19, 8, 0)
+    weather = (True, 'gnw_001', 'gnw_302', 'gnw_603')
+    engine.GunaMainThread.get_weather = staticmethod(lambda: weather)
+    for tick in range(120):
+        engine.timenow = lambda: start + timedelta(seconds=30 * tick)
+        engine.GunaMainThread.set_time()
+        engine.GunaMainThread.set_date()
+        engine.GunaMainThread.set_weather(tick)
+    assert engine.prefs_writes == writes, 'widget ticks write Preferences'
+    widgets = dict((k, prefs.get(k)) for k in engine.transient_keys(prefs))
+    assert widgets, 'widget ticks set their keys in memory'
+
+    prefs.set('theme', 'Guna.sublime-theme')
+    engine.save_prefs()
+    name, written = sublime.saved[-1]
+    assert engine.prefs_writes == writes + 1, 'a save writes Preferences once'
+    assert name == 'Preferences.sublime-settings' and written['theme'] == 'Guna.sublime-theme'
+    leaked = written_transient(sublime, persist)
+    assert not leaked, 'a save writes widget state : {}'.format(leaked)
+    kept = dict((k, prefs.get(k)) for k in engine.transient_keys(prefs))
+    assert kept == widgets, 'a save changes widget state in memory'
+    print('prefs_writes : {} per hour of widget ticks, 1 per save, {} widget keys kept out of it'.format(
+        engine.prefs_writes - writes - 1, len(widgets)))
+
+def check_palette(sublime, engine, persist):
+    # an unreadable palette is retried, a deleted one brings the guna_* colors back
+    gunas = sublime.load_settings('Guna.sublime-settings')
+    fpath = os.path.join(tempfile.mkdtemp(), 'guna.dcol')
+    gunas.set('wallbash', {'palette': fpath, 'map': {'guna_bgcolor': 'pry1'}})
+    engine.palette, engine.palette_stat = {}, None
+
+    # both writes have the same size and mtime, like a palette read while being written
+    with open(fpath, 'wb') as f:
+        f.write(b'dcol_pry1="#\xff\xfe\xff\xfe\xff\xfe"\n')
+    os.utime(fpath, (0, 0))
+    engine.check_palette(render=False)
+    assert engine.palette == {}, 'a malformed palette is not applied'
+    with open(fpath, 'wb') as f:
+        f.write(b'dcol_pry1="#1A2B3C"\n')
+    os.utime(fpath, (0, 0))
+    engine.check_palette(render=False)
+    assert engine.palette == {'guna_bgcolor': '#1A2B3C'}, 'an unreadable palette is retried'
+
+    os.remove(fpath)
+    os.rmdir(os.path.dirname(fpath))
+    del sublime.commands[:]
+    engine.check_palette()
+    assert engine.palette == {}, 'a deleted palette is dropped'
+    assert sublime.commands == [('guna_tweak_theme', {'outputs': engine.PALETTE_OUTPUTS})]
+    print('palette : retried after a failed read, dropped when deleted')
+
+CHECKS = ['prefs_writes', 'palette']
+
+def main():
+    sublime = install_fakes()
+    from . import engine
+    from . import persist
+    for name in sys.argv[1:] or CHECKS:
+        globals()['check_' + name](sublime, engine, persist)
+
+if __name__ == '__main__':
+    main()
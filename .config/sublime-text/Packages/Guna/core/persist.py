@@ -49,3 +49,16 @@ GUNA_GNIS = [
 GUNA_WEATHERS = [
   '01', '02', '03', '04', '09', '10', '11', '13', '50'
 ]
+# widget state (clock, date, weather, dirty/read-only, alert) lives only in memory
+GUNA_TRANSIENT_PREFIX = ('gnc_', 'gnd_', 'gnw_', 'gni_')
+GUNA_TRANSIENT = (
+    [GNC_DIRTY, GNC_READ_ONLY] +
+    ['gnc_h{:02d}'.format(x) for x in range(0, 24)] +
+    ['gnc_w{:d}m1{:d}'.format(w, x) for w in range(0, 7) for x in range(0, 6)] +
+    ['gnc_m0{:d}'.format(x) for x in range(0, 10)] +
+    ['gnd_m{:02d}'.format(x) for x in range(1, 13)] +
+    ['gnd_w{:d}d1{:d}'.format(w, x) for w in range(0, 7) for x in range(0, 4)] +
+    ['gnd_d0{:d}'.format(x) for x in range(0, 10)] +
+    ['gnw_' + h + x for h in ['0', '3', '6'] for x in GUNA_WEATHERS + ['xx']] +
+    GUNA_GNIS
+)
@@ -9,41 +9,130 @@
 import sublime
 import sublime_plugin
 import re
-import colorsys
+
+# args : cmd     - 'sat_up', 'sat_down', 'hue_up', 'hue_down', 'bri_up', 'bri_down'
+#        target  - 'selection' (default) or 'file'
+#        step    - overrides the step size of `color_edit_step` for this cmd
+#        preview - show the result in phantoms, apply/cancel from there
+# a selection of a '#' hex color (3, 6 or 8 digits), or of 6 or 8 hex digits in a string, is edited
+# as it is, any other selection (or the file) is edited for every '#' color in it, all in one undo step.
+# a 3 digit color stays 3 digits, if the result can be written so
 
 class GunaColorEdit(sublime_plugin.TextCommand):
-    FLTOBJ = re.compile(r'[^0-9a-fA-F]')
+    HEXPAT = r'#(?:[0-9a-fA-F]{8}|[0-9a-fA-F]{6}|[0-9a-fA-F]{3})$'
+    BARPAT = r'(?:[0-9a-fA-F]{8}|[0-9a-fA-F]{6})$'
+    CLRPAT = r'#(?:[0-9a-fA-F]{8}|[0-9a-fA-F]{6}|[0-9a-fA-F]{3})(?![0-9a-zA-Z_])'
+    STEPS  = {'hue': 0.01, 'saturation': 0.01, 'brightness_up': 1, 'brightness_down': 5}
+    phantoms = {}
 
     def run(self, edit, **args):
-        acmd = args['cmd']
-        selr = self.view.sel()[0]
-        stxt = self.view.substr(selr)
-        srch = self.FLTOBJ.search(stxt)
-        if srch or len(stxt) != 6:
+        acmd = args.get('cmd', '')
+        step = self.get_steps(acmd, args.get('step'))
+        clrs = self.find_colors(args.get('target', 'selection'))
+        conv = {}
+        chgs = []
+        for selr, stxt in clrs:
+            if stxt not in conv:
+                conv[stxt] = self.edit_color(stxt, acmd, step)
+            if conv[stxt] != stxt:
+                chgs.append((selr, stxt, conv[stxt]))
+        if args.get('preview', False):
+            self.show_preview(chgs, args)
             return
-        ccode = self.conv_hex_color(stxt)
+        self.hide_preview()
+        chgs.sort(key=lambda c: c[0].begin(), reverse=True)
+        for selr, stxt, ccode in chgs:
+            self.view.replace(edit, selr, ccode)
+
+    def get_steps(self, acmd, step=None):
+        steps = dict(self.STEPS)
+        steps.update(sublime.load_settings("Guna.sublime-settings").get('color_edit_step', {}))
+        if step is not None:
+            skey = {'sat': 'saturation', 'hue': 'hue', 'bri': 'brightness'}.get(acmd[:3], '')
+            if skey == 'brightness':
+                skey = 'brightness_up' if acmd == 'bri_up' else 'brightness_down'
+            steps[skey] = step
+        return steps
+
+    def find_colors(self, target):
+        if target == 'file':
+            regions = [sublime.Region(0, self.view.size())]
+        else:
+            regions = [r for r in self.view.sel() if not r.empty()]
+        clrs = []
+        for region in regions:
+            stxt = self.view.substr(region)
+            if re.match(self.HEXPAT, stxt) or self.is_bare_color(region, stxt):
+                clrs.append((region, stxt))
+                continue
+            base = region.begin()
+            for mtch in re.finditer(self.CLRPAT, stxt):
+                clrs.append((sublime.Region(base + mtch.start(), base + mtch.end()), mtch.group()))
+        return clrs
+
+    def is_bare_color(self, region, stxt):
+        # words like 'face' or 'deadbeef' in code aren't colors
+        return bool(re.match(self.BARPAT, stxt)) and self.view.match_selector(region.begin(), 'string')
+
+    def edit_color(self, stxt, acmd, steps):
+        import colorsys
+        pref = '#' if stxt.startswith('#') else ''
+        hexs = stxt[len(pref):]
+        if len(hexs) == 3:
+            hexs = ''.join(c * 2 for c in hexs)
+        ccode = self.conv_hex_color(hexs)
         (h, s, v) = colorsys.rgb_to_hsv(ccode[0], ccode[1], ccode[2])
         if acmd == 'sat_up':
-            s = s + 0.01
+            s = s + steps['saturation']
             s = 1.0 if s > 1.0 else s
         elif acmd == 'sat_down':
-            s = s - 0.01
+            s = s - steps['saturation']
             s = 0.0 if s < 0.0 else s
         elif acmd == 'hue_up':
-            h = h + 0.01
+            h = h + steps['hue']
             h = 1.0 if h > 1.0 else h
         elif acmd == 'hue_down':
-            h = h - 0.01
+            h = h - steps['hue']
             h = 0.0 if h < 0.0 else h
         elif acmd == 'bri_up':
-            v = v + 1
+            v = v + steps['brightness_up']
             v = 255 if v > 255 else v
         elif acmd == 'bri_down':
-            v = v - 5
+            v = v - steps['brightness_down']
             v = 0 if v < 0 else v
+        else:
+            return stxt
         r, g, b = colorsys.hsv_to_rgb(h, s, v)
-        ccode = '{:02x}{:02x}{:02x}'.format(int(r), int(g), int(b))
-        self.view.replace(edit, selr, ccode)
+        ccode = '{:02x}{:02x}{:02x}'.format(int(r), int(g), int(b)) + hexs[6:]
+        if len(stxt) - len(pref) == 3 and all(ccode[i] == ccode[i + 1] for i in (0, 2, 4)):
+            ccode = ccode[0::2]
+        if hexs != hexs.lower():
+            ccode = ccode.upper()
+        return pref + ccode
+
+    def show_preview(self, chgs, args):
+        pset = GunaColorEdit.phantoms.get(self.view.id())
+        if pset is None:
+            pset = GunaColorEdit.phantoms[self.view.id()] = sublime.PhantomSet(self.view, 'guna_color_edit')
+        html = ('<body id="guna-color-edit">'
+                '<span style="background-color: #{0}">&nbsp;&nbsp;&nbsp;</span>&nbsp;→&nbsp;'
+                '<span style="background-color: #{1}">&nbsp;&nbsp;&nbsp;</span>&nbsp;'
+                '<a href="apply">apply</a>&nbsp;<a href="cancel">cancel</a></body>')
+        args = dict(args, preview=False)
+
+        def on_navigate(href):
+            if href == 'apply':
+                self.view.run_command('guna_color_edit', args)
+            else:
+                self.hide_preview()
+
+        pset.update([sublime.Phantom(sublime.Region(selr.end()), html.format(stxt.lstrip('#'), ccode.lstrip('#')),
+                                     sublime.LAYOUT_INLINE, on_navigate) for selr, stxt, ccode in chgs])
+
+    def hide_preview(self):
+        pset = GunaColorEdit.phantoms.pop(self.view.id(), None)
+        if pset is not None:
+            pset.update([])
 
     def conv_hex_color(self, hc):
         if len(hc) == 6:
@@ -52,3 +141,8 @@ class GunaColorEdit(sublime_plugin.TextCommand):
             return [int(hc[0:2], 16), int(hc[2:4], 16), int(hc[4:6], 16), int(hc[6:8], 16)]
         else:
             return
+
+class GunaColorEditListener(sublime_plugin.EventListener):
+
+    def on_close(self, view):
+        GunaColorEdit.phantoms.pop(view.id(), None)
@@ -11,8 +11,13 @@ sys.path.insert(0, dirname(__file__))
 from src.py.commands import *
 from src.py.event_listeners import *
 from src.py.main import *
+from src.py.utils.worker_utils import stop_worker
 
 
 class HtmlprettifyCommand(TextCommand):
     def run(self, edit):
         main(self.view, edit)
+
+
+def plugin_unloaded():
+    stop_worker()
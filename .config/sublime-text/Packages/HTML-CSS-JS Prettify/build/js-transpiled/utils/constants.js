@@ -3,7 +3,7 @@
 Object.defineProperty(exports, "__esModule", {
   value: true
 });
-exports.CONFIG_EXTRA_LOOKUP_PATHS = exports.ORIGINAL_FILE_PATH = exports.EDITOR_TEXT_TEMP_FILE_PATH = exports.EDITOR_TEXT_TEMP_FILE_CONTENTS = exports.EDITOR_INDENT_WITH_TABS = exports.EDITOR_INDENT_SIZE = exports.EDITOR_FILE_SYNTAX = exports.RESPECT_EDITORCONFIG_FILES = exports.GLOBAL_FILE_RULES_JSON = exports.USING_EDITOR_TEXT_TEMP_FILE = exports.PRETTIFIED_CODE_MARKER_END = exports.PRETTIFIED_CODE_MARKER_BEGIN = exports.DIAGNOSTICS_MARKER_END = exports.DIAGNOSTICS_MARKER_BEGIN = void 0;
+exports.CONFIG_EXTRA_LOOKUP_PATHS = exports.ORIGINAL_FILE_PATH = exports.EDITOR_TEXT_TEMP_FILE_PATH = exports.EDITOR_TEXT_TEMP_FILE_CONTENTS = exports.EDITOR_INDENT_WITH_TABS = exports.EDITOR_INDENT_SIZE = exports.EDITOR_FILE_SYNTAX = exports.RESPECT_EDITORCONFIG_FILES = exports.GLOBAL_FILE_RULES_JSON = exports.USING_EDITOR_TEXT_STDIN = exports.USING_EDITOR_TEXT_TEMP_FILE = exports.PRETTIFIED_CODE_MARKER_END = exports.PRETTIFIED_CODE_MARKER_BEGIN = exports.DIAGNOSTICS_MARKER_END = exports.DIAGNOSTICS_MARKER_BEGIN = void 0;
 
 /* This Source Code Form is subject to the terms of the Mozilla Public
  * License, v. 2.0. If a copy of the MPL was not distributed with this
@@ -15,10 +15,13 @@ exports.DIAGNOSTICS_MARKER_END = DIAGNOSTICS_MARKER_END;
 var PRETTIFIED_CODE_MARKER_BEGIN = '### HTMLPrettify prettified code begin ###';
 exports.PRETTIFIED_CODE_MARKER_BEGIN = PRETTIFIED_CODE_MARKER_BEGIN;
 var PRETTIFIED_CODE_MARKER_END = '### HTMLPrettify prettified code end ###'; // The source file to be prettified, original source's path and some options.
+// The editor text is passed in a temp file ('True'), as argument ('False') or through stdin ('Stdin').
 
 exports.PRETTIFIED_CODE_MARKER_END = PRETTIFIED_CODE_MARKER_END;
 var USING_EDITOR_TEXT_TEMP_FILE = process.argv[2];
 exports.USING_EDITOR_TEXT_TEMP_FILE = USING_EDITOR_TEXT_TEMP_FILE;
+var USING_EDITOR_TEXT_STDIN = USING_EDITOR_TEXT_TEMP_FILE === 'Stdin';
+exports.USING_EDITOR_TEXT_STDIN = USING_EDITOR_TEXT_STDIN;
 var GLOBAL_FILE_RULES_JSON = process.argv[3];
 exports.GLOBAL_FILE_RULES_JSON = GLOBAL_FILE_RULES_JSON;
 var RESPECT_EDITORCONFIG_FILES = process.argv[4];
@@ -37,4 +40,3 @@ var ORIGINAL_FILE_PATH = process.argv[9];
 exports.ORIGINAL_FILE_PATH = ORIGINAL_FILE_PATH;
 var CONFIG_EXTRA_LOOKUP_PATHS = [process.argv[10], process.argv[11]];
 exports.CONFIG_EXTRA_LOOKUP_PATHS = CONFIG_EXTRA_LOOKUP_PATHS;
-//# sourceMappingURL=data:application/json;charset=utf8;base64,eyJ2ZXJzaW9uIjozLCJzb3VyY2VzIjpbInV0aWxzL2NvbnN0YW50cy5qcyJdLCJuYW1lcyI6WyJESUFHTk9TVElDU19NQVJLRVJfQkVHSU4iLCJESUFHTk9TVElDU19NQVJLRVJfRU5EIiwiUFJFVFRJRklFRF9DT0RFX01BUktFUl9CRUdJTiIsIlBSRVRUSUZJRURfQ09ERV9NQVJLRVJfRU5EIiwiVVNJTkdfRURJVE9SX1RFWFRfVEVNUF9GSUxFIiwicHJvY2VzcyIsImFyZ3YiLCJHTE9CQUxfRklMRV9SVUxFU19KU09OIiwiUkVTUEVDVF9FRElUT1JDT05GSUdfRklMRVMiLCJFRElUT1JfRklMRV9TWU5UQVgiLCJFRElUT1JfSU5ERU5UX1NJWkUiLCJFRElUT1JfSU5ERU5UX1dJVEhfVEFCUyIsIkVESVRPUl9URVhUX1RFTVBfRklMRV9DT05URU5UUyIsIkVESVRPUl9URVhUX1RFTVBfRklMRV9QQVRIIiwiT1JJR0lOQUxfRklMRV9QQVRIIiwiQ09ORklHX0VYVFJBX0xPT0tVUF9QQVRIUyJdLCJtYXBwaW5ncyI6Ijs7Ozs7OztBQUFBOzs7QUFJTyxJQUFNQSx3QkFBd0IsR0FBRyx3Q0FBakM7O0FBQ0EsSUFBTUMsc0JBQXNCLEdBQUcsc0NBQS9COztBQUNBLElBQU1DLDRCQUE0QixHQUFHLDRDQUFyQzs7QUFDQSxJQUFNQywwQkFBMEIsR0FBRywwQ0FBbkMsQyxDQUVQOzs7QUFDTyxJQUFNQywyQkFBMkIsR0FBR0MsT0FBTyxDQUFDQyxJQUFSLENBQWEsQ0FBYixDQUFwQzs7QUFFQSxJQUFNQyxzQkFBc0IsR0FBR0YsT0FBTyxDQUFDQyxJQUFSLENBQWEsQ0FBYixDQUEvQjs7QUFDQSxJQUFNRSwwQkFBMEIsR0FBR0gsT0FBTyxDQUFDQyxJQUFSLENBQWEsQ0FBYixDQUFuQzs7QUFFQSxJQUFNRyxrQkFBa0IsR0FBR0osT0FBTyxDQUFDQyxJQUFSLENBQWEsQ0FBYixDQUEzQjs7QUFDQSxJQUFNSSxrQkFBa0IsR0FBR0wsT0FBTyxDQUFDQyxJQUFSLENBQWEsQ0FBYixDQUEzQjs7QUFDQSxJQUFNSyx1QkFBdUIsR0FBR04sT0FBTyxDQUFDQyxJQUFSLENBQWEsQ0FBYixDQUFoQzs7QUFFQSxJQUFNTSw4QkFBOEIsR0FBR1IsMkJBQTJCLEtBQUssT0FBaEMsR0FBMENDLE9BQU8sQ0FBQ0MsSUFBUixDQUFhLENBQWIsQ0FBMUMsR0FBNEQsSUFBbkc7O0FBQ0EsSUFBTU8sMEJBQTBCLEdBQUdULDJCQUEyQixLQUFLLE1BQWhDLEdBQXlDQyxPQUFPLENBQUNDLElBQVIsQ0FBYSxDQUFiLENBQXpDLEdBQTJELElBQTlGOztBQUVBLElBQU1RLGtCQUFrQixHQUFHVCxPQUFPLENBQUNDLElBQVIsQ0FBYSxDQUFiLENBQTNCOztBQUVBLElBQU1TLHlCQUF5QixHQUFHLENBQUNWLE9BQU8sQ0FBQ0MsSUFBUixDQUFhLEVBQWIsQ0FBRCxFQUFtQkQsT0FBTyxDQUFDQyxJQUFSLENBQWEsRUFBYixDQUFuQixDQUFsQyIsInNvdXJjZXNDb250ZW50IjpbIi8qIFRoaXMgU291cmNlIENvZGUgRm9ybSBpcyBzdWJqZWN0IHRvIHRoZSB0ZXJtcyBvZiB0aGUgTW96aWxsYSBQdWJsaWNcbiAqIExpY2Vuc2UsIHYuIDIuMC4gSWYgYSBjb3B5IG9mIHRoZSBNUEwgd2FzIG5vdCBkaXN0cmlidXRlZCB3aXRoIHRoaXNcbiAqIGZpbGUsIFlvdSBjYW4gb2J0YWluIG9uZSBhdCBodHRwOi8vbW96aWxsYS5vcmcvTVBMLzIuMC8uICovXG5cbmV4cG9ydCBjb25zdCBESUFHTk9TVElDU19NQVJLRVJfQkVHSU4gPSAnIyMjIEhUTUxQcmV0dGlmeSBkaWFnbm9zdGljcyBiZWdpbiAjIyMnO1xuZXhwb3J0IGNvbnN0IERJQUdOT1NUSUNTX01BUktFUl9FTkQgPSAnIyMjIEhUTUxQcmV0dGlmeSBkaWFnbm9zdGljcyBlbmQgIyMjJztcbmV4cG9ydCBjb25zdCBQUkVUVElGSUVEX0NPREVfTUFSS0VSX0JFR0lOID0gJyMjIyBIVE1MUHJldHRpZnkgcHJldHRpZmllZCBjb2RlIGJlZ2luICMjIyc7XG5leHBvcnQgY29uc3QgUFJFVFRJRklFRF9DT0RFX01BUktFUl9FTkQgPSAnIyMjIEhUTUxQcmV0dGlmeSBwcmV0dGlmaWVkIGNvZGUgZW5kICMjIyc7XG5cbi8vIFRoZSBzb3VyY2UgZmlsZSB0byBiZSBwcmV0dGlmaWVkLCBvcmlnaW5hbCBzb3VyY2UncyBwYXRoIGFuZCBzb21lIG9wdGlvbnMuXG5leHBvcnQgY29uc3QgVVNJTkdfRURJVE9SX1RFWFRfVEVNUF9GSUxFID0gcHJvY2Vzcy5hcmd2WzJdO1xuXG5leHBvcnQgY29uc3QgR0xPQkFMX0ZJTEVfUlVMRVNfSlNPTiA9IHByb2Nlc3MuYXJndlszXTtcbmV4cG9ydCBjb25zdCBSRVNQRUNUX0VESVRPUkNPTkZJR19GSUxFUyA9IHByb2Nlc3MuYXJndls0XTtcblxuZXhwb3J0IGNvbnN0IEVESVRPUl9GSUxFX1NZTlRBWCA9IHByb2Nlc3MuYXJndls1XTtcbmV4cG9ydCBjb25zdCBFRElUT1JfSU5ERU5UX1NJWkUgPSBwcm9jZXNzLmFyZ3ZbNl07XG5leHBvcnQgY29uc3QgRURJVE9SX0lOREVOVF9XSVRIX1RBQlMgPSBwcm9jZXNzLmFyZ3ZbN107XG5cbmV4cG9ydCBjb25zdCBFRElUT1JfVEVYVF9URU1QX0ZJTEVfQ09OVEVOVFMgPSBVU0lOR19FRElUT1JfVEVYVF9URU1QX0ZJTEUgPT09ICdGYWxzZScgPyBwcm9jZXNzLmFyZ3ZbOF0gOiBudWxsO1xuZXhwb3J0IGNvbnN0IEVESVRPUl9URVhUX1RFTVBfRklMRV9QQVRIID0gVVNJTkdfRURJVE9SX1RFWFRfVEVNUF9GSUxFID09PSAnVHJ1ZScgPyBwcm9jZXNzLmFyZ3ZbOF0gOiBudWxsO1xuXG5leHBvcnQgY29uc3QgT1JJR0lOQUxfRklMRV9QQVRIID0gcHJvY2Vzcy5hcmd2WzldO1xuXG5leHBvcnQgY29uc3QgQ09ORklHX0VYVFJBX0xPT0tVUF9QQVRIUyA9IFtwcm9jZXNzLmFyZ3ZbMTBdLCBwcm9jZXNzLmFyZ3ZbMTFdXTtcbiJdLCJmaWxlIjoidXRpbHMvY29uc3RhbnRzLmpzIn0=
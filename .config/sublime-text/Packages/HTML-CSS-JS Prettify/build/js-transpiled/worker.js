@@ -0,0 +1,146 @@
+"use strict";
+
+var _interopRequireDefault = require("@babel/runtime/helpers/interopRequireDefault");
+
+var _toConsumableArray2 = _interopRequireDefault(require("@babel/runtime/helpers/toConsumableArray"));
+
+require("core-js/modules/es6.promise");
+
+require("core-js/modules/es6.string.starts-with");
+
+require("core-js/modules/web.dom.iterable");
+
+require("core-js/modules/es6.array.iterator");
+
+require("core-js/modules/es6.object.keys");
+
+var _path = _interopRequireDefault(require("path"));
+
+var _util = _interopRequireDefault(require("util"));
+
+/* This Source Code Form is subject to the terms of the Mozilla Public
+ * License, v. 2.0. If a copy of the MPL was not distributed with this
+ * file, You can obtain one at http://mozilla.org/MPL/2.0/. */
+// A long-lived process running the prettifier for requests of the plugin.
+//
+// Requests and responses are JSON objects sent over stdin and stdout, each
+// prefixed by its length in bytes as 32 bit big endian unsigned integer:
+//
+//   request:  { "id": 1, "args": [...arguments of main.js], "stdin": "editor text" }
+//   response: { "id": 1, "stdout": "...", "stderr": "..." }
+//
+// The process exits once stdin is closed.
+var MAIN_JS_FILE = _path.default.join(__dirname, 'main.js');
+
+var NODE_MODULES_DIR = _path.default.join(__dirname, 'node_modules'); // Output captured for the request being handled.
+
+
+var capturedStdout = null;
+var capturedStderr = null;
+process.on('uncaughtException', function (err) {
+  console.error('Uncaught exception', err);
+});
+process.on('unhandledRejection', function (err) {
+  console.error('Unhandled promise rejection', err);
+}); // Drops this plugin's modules from the require cache, as they read the options
+// of a request from `process.argv` when loaded. Dependencies stay loaded.
+
+var unloadPluginModules = function unloadPluginModules() {
+  var _arr = Object.keys(require.cache);
+
+  for (var _i = 0; _i < _arr.length; _i++) {
+    var file = _arr[_i];
+
+    if (file.startsWith(__dirname) && !file.startsWith(NODE_MODULES_DIR) && file !== __filename) {
+      delete require.cache[file];
+    }
+  }
+};
+
+var captureConsole = function captureConsole() {
+  var _console = console,
+      log = _console.log,
+      error = _console.error;
+  capturedStdout = [];
+  capturedStderr = [];
+
+  console.log = function () {
+    return capturedStdout.push("".concat(_util.default.format.apply(_util.default, arguments), "\n"));
+  };
+
+  console.error = function () {
+    return capturedStderr.push("".concat(_util.default.format.apply(_util.default, arguments), "\n"));
+  };
+
+  return function () {
+    var output = {
+      stdout: capturedStdout.join(''),
+      stderr: capturedStderr.join('')
+    };
+    console.log = log;
+    console.error = error;
+    capturedStdout = null;
+    capturedStderr = null;
+    return output;
+  };
+}; // Runs main.js with the given arguments and resolves with its output.
+
+
+var prettify = function prettify(args, stdinContents) {
+  var release = captureConsole();
+  return Promise.resolve().then(function () {
+    process.argv = [process.argv[0], MAIN_JS_FILE].concat((0, _toConsumableArray2.default)(args));
+    unloadPluginModules(); // eslint-disable-next-line global-require, import/no-dynamic-require
+
+    return require(MAIN_JS_FILE).default(stdinContents);
+  }).catch(function (err) {
+    console.error('Uncaught exception', err);
+  }).then(release);
+};
+
+var send = function send(message) {
+  var body = Buffer.from(JSON.stringify(message), 'utf8');
+  var header = Buffer.alloc(4);
+  header.writeUInt32BE(body.length, 0);
+  process.stdout.write(Buffer.concat([header, body]));
+}; // Requests are handled one after another, as the console is captured per request.
+
+
+var pending = Promise.resolve();
+var received = Buffer.alloc(0);
+process.stdin.on('data', function (chunk) {
+  received = Buffer.concat([received, chunk]);
+
+  var _loop = function _loop() {
+    var length = received.readUInt32BE(0);
+
+    if (received.length < 4 + length) {
+      return "break";
+    }
+
+    var request = JSON.parse(received.slice(4, 4 + length).toString('utf8'));
+    received = received.slice(4 + length);
+    pending = pending.then(function () {
+      return prettify(request.args, request.stdin);
+    }).then(function (_ref) {
+      var stdout = _ref.stdout,
+          stderr = _ref.stderr;
+      return send({
+        id: request.id,
+        stdout: stdout,
+        stderr: stderr
+      });
+    });
+  };
+
+  while (received.length >= 4) {
+    var _ret = _loop();
+
+    if (_ret === "break") break;
+  }
+});
+process.stdin.on('end', function () {
+  pending.then(function () {
+    return process.exit(0);
+  });
+});
@@ -11,15 +11,19 @@ import * as cutils from './utils/configUtils';
 import * as putils from './utils/pathUtils';
 import * as futils from './utils/fileUtils';
 
-process.on('uncaughtException', (err) => {
-  stdio.err('Uncaught exception', err);
-});
-
-process.on('unhandledRejection', (err) => {
-  stdio.err('Unhandled promise rejection', err);
-});
+// Reads the editor text from where the plugin passed it. The persistent worker
+// hands over the text the plugin would otherwise have written to stdin.
+const readEditorText = (stdinContents) => {
+  if (constants.USING_EDITOR_TEXT_TEMP_FILE === 'True') {
+    return fs.readFile(constants.EDITOR_TEXT_TEMP_FILE_PATH, { encoding: 'utf8' });
+  }
+  if (constants.USING_EDITOR_TEXT_STDIN) {
+    return stdinContents != null ? Promise.resolve(stdinContents) : stdio.readIn();
+  }
+  return Promise.resolve(constants.EDITOR_TEXT_TEMP_FILE_CONTENTS);
+};
 
-async function main() {
+async function main(stdinContents) {
   stdio.beginDiagnostics();
 
   // Dump some diagnostics messages, parsed out by the plugin.
@@ -51,9 +55,7 @@ async function main() {
 
   stdio.info(`Computed prettify options: ${JSON.stringify(finalConfig)}`);
 
-  const bufferContents = constants.USING_EDITOR_TEXT_TEMP_FILE === 'True'
-    ? await fs.readFile(constants.EDITOR_TEXT_TEMP_FILE_PATH, { encoding: 'utf8' })
-    : constants.EDITOR_TEXT_TEMP_FILE_CONTENTS;
+  const bufferContents = await readEditorText(stdinContents);
 
   if (futils.isCSS()) {
     stdio.info('Attempting to prettify what seems to be a CSS file.');
@@ -88,4 +90,17 @@ async function main() {
   }
 }
 
-main();
+export default main;
+
+// When not loaded by the persistent worker, prettify the code passed as arguments.
+if (require.main === module) {
+  process.on('uncaughtException', (err) => {
+    stdio.err('Uncaught exception', err);
+  });
+
+  process.on('unhandledRejection', (err) => {
+    stdio.err('Unhandled promise rejection', err);
+  });
+
+  main();
+}
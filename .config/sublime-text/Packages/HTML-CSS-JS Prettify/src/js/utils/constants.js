@@ -8,7 +8,9 @@ export const PRETTIFIED_CODE_MARKER_BEGIN = '### HTMLPrettify prettified code be
 export const PRETTIFIED_CODE_MARKER_END = '### HTMLPrettify prettified code end ###';
 
 // The source file to be prettified, original source's path and some options.
+// The editor text is passed in a temp file ('True'), as argument ('False') or through stdin ('Stdin').
 export const USING_EDITOR_TEXT_TEMP_FILE = process.argv[2];
+export const USING_EDITOR_TEXT_STDIN = USING_EDITOR_TEXT_TEMP_FILE === 'Stdin';
 
 export const GLOBAL_FILE_RULES_JSON = process.argv[3];
 export const RESPECT_EDITORCONFIG_FILES = process.argv[4];
@@ -20,6 +20,14 @@ export const endPrettifiedCode = () => {
   console.log(constants.PRETTIFIED_CODE_MARKER_END);
 };
 
+// Reads all of stdin as utf8 text.
+export const readIn = () => new Promise((resolve, reject) => {
+  const chunks = [];
+  process.stdin.on('data', chunk => chunks.push(chunk));
+  process.stdin.on('end', () => resolve(Buffer.concat(chunks).toString('utf8')));
+  process.stdin.on('error', reject);
+});
+
 export const info = (...args) => console.log('[HTMLPrettify]', ...args);
 export const out = console.log;
 export const err = console.error;
@@ -0,0 +1,108 @@
+/* This Source Code Form is subject to the terms of the Mozilla Public
+ * License, v. 2.0. If a copy of the MPL was not distributed with this
+ * file, You can obtain one at http://mozilla.org/MPL/2.0/. */
+
+// A long-lived process running the prettifier for requests of the plugin.
+//
+// Requests and responses are JSON objects sent over stdin and stdout, each
+// prefixed by its length in bytes as 32 bit big endian unsigned integer:
+//
+//   request:  { "id": 1, "args": [...arguments of main.js], "stdin": "editor text" }
+//   response: { "id": 1, "stdout": "...", "stderr": "..." }
+//
+// The process exits once stdin is closed.
+
+import path from 'path';
+import util from 'util';
+
+const MAIN_JS_FILE = path.join(__dirname, 'main.js');
+const NODE_MODULES_DIR = path.join(__dirname, 'node_modules');
+
+// Output captured for the request being handled.
+let capturedStdout = null;
+let capturedStderr = null;
+
+process.on('uncaughtException', (err) => {
+  console.error('Uncaught exception', err);
+});
+
+process.on('unhandledRejection', (err) => {
+  console.error('Unhandled promise rejection', err);
+});
+
+// Drops this plugin's modules from the require cache, as they read the options
+// of a request from `process.argv` when loaded. Dependencies stay loaded.
+const unloadPluginModules = () => {
+  for (const file of Object.keys(require.cache)) {
+    if (file.startsWith(__dirname) && !file.startsWith(NODE_MODULES_DIR) && file !== __filename) {
+      delete require.cache[file];
+    }
+  }
+};
+
+const captureConsole = () => {
+  const { log, error } = console;
+  capturedStdout = [];
+  capturedStderr = [];
+  console.log = (...args) => capturedStdout.push(`${util.format(...args)}\n`);
+  console.error = (...args) => capturedStderr.push(`${util.format(...args)}\n`);
+
+  return () => {
+    const output = { stdout: capturedStdout.join(''), stderr: capturedStderr.join('') };
+    console.log = log;
+    console.error = error;
+    capturedStdout = null;
+    capturedStderr = null;
+    return output;
+  };
+};
+
+// Runs main.js with the given arguments and resolves with its output.
+const prettify = (args, stdinContents) => {
+  const release = captureConsole();
+
+  return Promise.resolve()
+    .then(() => {
+      process.argv = [process.argv[0], MAIN_JS_FILE, ...args];
+      unloadPluginModules();
+      // eslint-disable-next-line global-require, import/no-dynamic-require
+      return require(MAIN_JS_FILE).default(stdinContents);
+    })
+    .catch((err) => {
+      console.error('Uncaught exception', err);
+    })
+    .then(release);
+};
+
+const send = (message) => {
+  const body = Buffer.from(JSON.stringify(message), 'utf8');
+  const header = Buffer.alloc(4);
+  header.writeUInt32BE(body.length, 0);
+  process.stdout.write(Buffer.concat([header, body]));
+};
+
+// Requests are handled one after another, as the console is captured per request.
+let pending = Promise.resolve();
+let received = Buffer.alloc(0);
+
+process.stdin.on('data', (chunk) => {
+  received = Buffer.concat([received, chunk]);
+
+  while (received.length >= 4) {
+    const length = received.readUInt32BE(0);
+    if (received.length < 4 + length) {
+      break;
+    }
+
+    const request = JSON.parse(received.slice(4, 4 + length).toString('utf8'));
+    received = received.slice(4 + length);
+
+    pending = pending
+      .then(() => prettify(request.args, request.stdin))
+      .then(({ stdout, stderr }) => send({ id: request.id, stdout, stderr }));
+  }
+});
+
+process.stdin.on('end', () => {
+  pending.then(() => process.exit(0));
+});
@@ -39,23 +39,25 @@ def main(view, edit):
     else:
         text_to_prettify, formatting_region = get_entire_buffer_text(view)
 
+    # Unless asked to use a temporary file, the text is streamed to node.js through stdin.
     if save_to_temp_file:
         editor_text_temp_file_path = save_text_to_temp_file(text_to_prettify)
 
-    prettified_text = prettify_verbose(view.window(), [
-        str(save_to_temp_file),
-        json.dumps(global_file_rules),
-        str(respect_editorconfig_files),
-        str(editor_file_syntax),
-        str(editor_indent_size),
-        str(editor_indent_with_tabs),
-        editor_text_temp_file_path
-        if save_to_temp_file else text_to_prettify,
-        original_file_path
-    ])
-
-    if save_to_temp_file:
-        os.remove(editor_text_temp_file_path)
+    try:
+        prettified_text = prettify_verbose(view.window(), [
+            "True" if save_to_temp_file else "Stdin",
+            json.dumps(global_file_rules),
+            str(respect_editorconfig_files),
+            str(editor_file_syntax),
+            str(editor_indent_size),
+            str(editor_indent_with_tabs),
+            editor_text_temp_file_path
+            if save_to_temp_file else "?",
+            original_file_path
+        ], None if save_to_temp_file else text_to_prettify)
+    finally:
+        if save_to_temp_file:
+            os.remove(editor_text_temp_file_path)
 
     if prettified_text is None:
         return
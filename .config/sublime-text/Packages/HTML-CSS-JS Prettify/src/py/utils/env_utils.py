@@ -40,8 +40,8 @@ def get_node_path():
     return expanduser(node)
 
 
-def run_command(args):
-    """Runs a command in a shell and returns the output"""
+def get_popen_args():
+    """Gets the arguments used for spawning node.js processes"""
     popen_args = {
         "stdout": subprocess.PIPE,
         "stderr": subprocess.PIPE,
@@ -54,7 +54,11 @@ def run_command(args):
         popen_args["startupinfo"] = startupinfo
         popen_args["stdin"] = open(devnull, 'wb')
 
-    stdout, stderr = subprocess.Popen(args, **popen_args).communicate()
+    return popen_args
+
+
+def check_node_output(stdout, stderr):
+    """Raises an error if node.js wrote any to stderr, returns stdout otherwise"""
     if stderr:
         if b"ExperimentalWarning" in stderr:
             # Don't treat node experimental warnings as actual errors.
@@ -69,12 +73,25 @@ def run_command(args):
     return stdout
 
 
-def run_node_command(args):
+def run_command(args, stdin_text=None):
+    """Runs a command in a shell, optionally writing some text to its stdin, and returns the output"""
+    popen_args = get_popen_args()
+    stdin = None
+
+    if stdin_text is not None:
+        popen_args["stdin"] = subprocess.PIPE
+        stdin = stdin_text.encode("utf-8")
+
+    stdout, stderr = subprocess.Popen(args, **popen_args).communicate(stdin)
+    return check_node_output(stdout, stderr)
+
+
+def run_node_command(args, stdin_text=None):
     """Runs a node command in a shell and returns the output"""
 
     node_path = get_node_path()
     try:
-        stdout = run_command([node_path] + args)
+        stdout = run_command([node_path] + args, stdin_text)
     except OSError as err:
         if node_path in err.strerror or \
             "No such file or directory" in err.strerror or \
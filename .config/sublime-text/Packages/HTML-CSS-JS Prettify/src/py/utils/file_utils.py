@@ -6,14 +6,13 @@
 from codecs import open as fopen
 from os import makedirs
 from os.path import isfile, isdir, dirname, join
+from tempfile import gettempdir
 from uuid import uuid4
 
-from .paths import get_root_dir
-
 
 def get_temp_file_path():
-    """Gets the path to a constant temporary file"""
-    return join(get_root_dir(), str(uuid4()))
+    """Gets the path to a unique file in the system's temporary directory"""
+    return join(gettempdir(), "HTMLPrettify-" + str(uuid4()))
 
 
 def save_text_to_file(text, file_path):
@@ -21,3 +21,7 @@ def get_user_dir():
 
 def get_main_js_file():
     return join(get_root_dir(), 'build', 'js-transpiled', 'main.js')
+
+
+def get_worker_js_file():
+    return join(get_root_dir(), 'build', 'js-transpiled', 'worker.js')
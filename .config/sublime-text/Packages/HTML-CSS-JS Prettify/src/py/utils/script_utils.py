@@ -12,12 +12,22 @@ from .constants import PRETTIFIED_CODE_MARKER_BEGIN, PRETTIFIED_CODE_MARKER_END
 from .paths import get_root_dir, get_user_dir, get_main_js_file
 from .env_utils import NodeNotFoundError, NodeRuntimeError, NodeSyntaxError, run_node_command
 from .window_utils import get_pref, open_sublime_settings
+from .worker_utils import NodeWorkerError, run_in_worker, stop_worker
 from .web_utils import file_bug
 
 
-def run_main_js(args):
+def run_main_js(args, stdin_text=None):
     """Runs the main node.js script and returns the generated output"""
-    return run_node_command([get_main_js_file()] + args)
+    if not get_pref("use_persistent_worker"):
+        stop_worker()
+        return run_node_command([get_main_js_file()] + args, stdin_text)
+
+    try:
+        return run_in_worker(args, stdin_text)
+    except (OSError, NodeWorkerError) as err:
+        # Fall back to running the script in a new node.js process.
+        print(err)
+        return run_node_command([get_main_js_file()] + args, stdin_text)
 
 
 def get_output_between(output, first, second):
@@ -46,15 +56,15 @@ def get_diagnostics_parse_fail(output):
     return re.search('\[HTMLPrettify\] Failed to parse file: (.+?)\n', output)
 
 
-def prettify(args):
-    """Prettifies the code at the given file path"""
-    stdout = run_main_js(args + [get_user_dir(), get_root_dir()])
+def prettify(args, stdin_text=None):
+    """Prettifies the code at the given file path, or the text written to stdin"""
+    stdout = run_main_js(args + [get_user_dir(), get_root_dir()], stdin_text)
     prettified_code = get_prettified_code(stdout)
     output_diagnostics = get_diagnostics(stdout)
     return prettified_code, output_diagnostics
 
 
-def prettify_verbose(window, args):
+def prettify_verbose(window, args, stdin_text=None):
     """Prettifies the code at the given file path and handles errors and exceptions"""
 
     def handle_node_error(err):
@@ -110,7 +120,7 @@ def prettify_verbose(window, args):
 
 
     try:
-        prettified_code, output_diagnostics = prettify(args)
+        prettified_code, output_diagnostics = prettify(args, stdin_text)
     except NodeNotFoundError as err:
         return handle_node_error(err)
     except OSError as err:
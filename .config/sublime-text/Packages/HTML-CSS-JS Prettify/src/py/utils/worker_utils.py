@@ -0,0 +1,180 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+"""Persistent node.js worker used by this plugin"""
+
+import json
+import struct
+import subprocess
+from collections import deque
+from queue import Queue, Empty
+from threading import Lock, Thread, Timer
+
+from .paths import get_worker_js_file
+from .env_utils import get_node_path, get_popen_args, check_node_output
+from .window_utils import get_pref
+
+# Seconds to wait for the worker to answer a request before giving up on it.
+REQUEST_TIMEOUT = 60
+
+# Seconds the worker may stay idle before it is shut down, if not set in the settings file.
+DEFAULT_IDLE_TIMEOUT = 300
+
+
+class NodeWorkerError(RuntimeError):
+    def __init__(self, reason, stderr=""):
+        msg = "The persistent Node.js worker failed"
+        RuntimeError.__init__(self, msg + (": %s\n%s" % (reason, stderr)))
+        self.stderr = stderr
+
+
+def read_exactly(stream, size):
+    """Reads the given number of bytes from a stream, or None if it ended before"""
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def write_message(stream, message):
+    """Writes a length prefixed json message to a stream"""
+    body = json.dumps(message).encode("utf-8")
+    stream.write(struct.pack(">I", len(body)) + body)
+    stream.flush()
+
+
+def read_messages(stream, messages):
+    """Puts all length prefixed json messages read from a stream into a queue, then None"""
+    while True:
+        header = read_exactly(stream, 4)
+        body = header and read_exactly(stream, struct.unpack(">I", header)[0])
+        if body is None:
+            messages.put(None)
+            return
+        messages.put(json.loads(body.decode("utf-8")))
+
+
+def read_lines(stream, lines):
+    """Appends all lines read from a stream to a deque"""
+    for line in iter(stream.readline, b""):
+        lines.append(line.decode("utf-8", "replace"))
+
+
+def start_daemon(target, *args):
+    """Runs a function on a daemon thread"""
+    thread = Thread(target=target, args=args)
+    thread.daemon = True
+    thread.start()
+
+
+class NodeWorker(object):
+    """A node.js process kept running to prettify code without starting node.js every time"""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.process = None
+        self.node_path = None
+        self.responses = None
+        self.stderr = deque(maxlen=50)
+        self.next_id = 0
+        self.idle_timer = None
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self, node_path):
+        popen_args = get_popen_args()
+        popen_args["stdin"] = subprocess.PIPE
+        self.process = subprocess.Popen([node_path, get_worker_js_file()], **popen_args)
+        self.node_path = node_path
+        self.responses = Queue()
+        self.stderr.clear()
+        start_daemon(read_messages, self.process.stdout, self.responses)
+        start_daemon(read_lines, self.process.stderr, self.stderr)
+
+    def stop(self):
+        if self.idle_timer:
+            self.idle_timer.cancel()
+            self.idle_timer = None
+
+        if self.process is None:
+            return
+
+        process, self.process = self.process, None
+        try:
+            process.stdin.close()
+            process.terminate()
+        except OSError:
+            pass
+
+    def stop_if_idle(self, timer):
+        with self.lock:
+            # A request may have been started while the timer fired.
+            if self.idle_timer is timer:
+                self.stop()
+
+    def schedule_idle_stop(self):
+        timeout = get_pref("persistent_worker_idle_timeout")
+        if timeout is None:
+            timeout = DEFAULT_IDLE_TIMEOUT
+
+        timer = Timer(timeout, lambda: self.stop_if_idle(timer))
+        timer.daemon = True
+        timer.start()
+        self.idle_timer = timer
+
+    def fail(self, reason):
+        self.stop()
+        raise NodeWorkerError(reason, "".join(self.stderr))
+
+    def request(self, args, stdin_text=None):
+        """Runs main.js in the worker and returns its stdout and stderr"""
+        with self.lock:
+            if self.idle_timer:
+                self.idle_timer.cancel()
+                self.idle_timer = None
+
+            # Restart a crashed worker, or one started with a different node.js.
+            node_path = get_node_path()
+            if not self.is_running() or node_path != self.node_path:
+                self.stop()
+                self.start(node_path)
+
+            self.next_id += 1
+            try:
+                write_message(self.process.stdin, {
+                    "id": self.next_id,
+                    "args": args,
+                    "stdin": stdin_text,
+                })
+                response = self.responses.get(timeout=REQUEST_TIMEOUT)
+            except OSError as err:
+                self.fail("could not send the request: %s" % err)
+            except Empty:
+                self.fail("no response within %d seconds" % REQUEST_TIMEOUT)
+
+            if response is None:
+                self.fail("the process exited unexpectedly")
+            if response.get("id") != self.next_id:
+                self.fail("received a response to an unknown request")
+
+            self.schedule_idle_stop()
+            return response["stdout"].encode("utf-8"), response["stderr"].encode("utf-8")
+
+
+WORKER = NodeWorker()
+
+
+def run_in_worker(args, stdin_text=None):
+    """Runs the main node.js script in the persistent worker and returns the generated output"""
+    stdout, stderr = WORKER.request(args, stdin_text)
+    return check_node_output(stdout, stderr)
+
+
+def stop_worker():
+    """Shuts down the persistent worker, if running"""
+    with WORKER.lock:
+        WORKER.stop()